@@ -0,0 +1,54 @@
+"""
+Download controls for exporting a table
+"""
+import pandas as pd
+import streamlit as st
+from scholarship_app.managers.export import (
+    FORMAT_LABELS,
+    MIME_TYPES,
+    ExportFormat,
+    frame_version,
+    get_export_cache,
+)
+
+
+def export_download(frame: pd.DataFrame, name: str, file_name: str, container=st):
+    """
+    Renders a format select and a button which writes frame in that format, followed by a
+    download button for the written file. Nothing is written until the button is pressed, and
+    the written file is served from the session's export cache while frame is unchanged.
+
+    Parameters
+    ----------
+    frame : pd.DataFrame
+        Table to export, without its index
+    name : str
+        Name of the table, which keys the widgets and the cached exports
+    file_name : str
+        Name of the downloaded file, without its extension
+    container : optional
+        Streamlit container to render the controls in
+    """
+    cache = get_export_cache(st.session_state)
+    export_format = container.selectbox(
+        "Export Format",
+        list(ExportFormat),
+        format_func=FORMAT_LABELS.get,
+        key=f"{name}-export-format",
+    )
+
+    # Only hashed once something was exported, reruns before that cost nothing
+    version = frame_version(frame) if cache.has_exports(name) else None
+    data = None if version is None else cache.get(name, version, export_format)
+    if data is None and container.button("Prepare Export", key=f"{name}-export"):
+        with st.spinner("Writing export..."):
+            data = cache.export(name, frame, export_format, version)
+
+    if data is not None:
+        container.download_button(
+            label=f"Download {FORMAT_LABELS[export_format]}",
+            data=data,
+            file_name=f"{file_name}.{export_format.value}",
+            mime=MIME_TYPES[export_format],
+            key=f"{name}-download",
+        )
@@ -0,0 +1,118 @@
+"""
+Column projection for the homepage table
+
+Each user chooses which columns the table shows, saved in the config so the choice is kept
+between sessions. Long free text answers are sent to the grid as short previews, and the full
+text is only looked up for the one student chosen in the full text viewer below the table.
+"""
+import pandas as pd
+import streamlit as st
+
+from scholarship_app.managers.config import ConfigManager
+
+COLUMNS_CONFIG_KEY = "home_columns"
+# Text longer than this is sent to the grid as a preview of this many characters
+PREVIEW_LENGTH = 80
+PREVIEW_SUFFIX = "…"
+# Columns the grid always needs, for selection, row styling and identifying students
+REQUIRED_COLUMNS = ("Select All", "UID", "Review")
+
+
+def saved_columns(hawk_id: str) -> list[str] | None:
+    """
+    Columns the user saved for the table, None if they never saved any
+    """
+    return ConfigManager().data.get(COLUMNS_CONFIG_KEY, {}).get(hawk_id)
+
+
+def save_columns(hawk_id: str, columns: list[str]):
+    """
+    Saves the columns the user chose for the table
+    """
+    config = ConfigManager()
+    users_columns = config.data.get(COLUMNS_CONFIG_KEY, {})
+    users_columns[hawk_id] = list(columns)
+    config.set_value(COLUMNS_CONFIG_KEY, users_columns)
+
+
+def project_columns(data: pd.DataFrame, columns: list[str]) -> pd.DataFrame:
+    """
+    The chosen columns of data which it has, after the required columns
+    """
+    required = [column for column in REQUIRED_COLUMNS if column in data.columns]
+    chosen = [
+        column
+        for column in columns
+        if column in data.columns and column not in REQUIRED_COLUMNS
+    ]
+    return data[required + chosen]
+
+
+def preview_long_text(data: pd.DataFrame) -> tuple[pd.DataFrame, list[str]]:
+    """
+    Shortens text longer than PREVIEW_LENGTH to a preview
+
+    Returns
+    -------
+    Copy of data with previews, and the columns which had text shortened
+    """
+    previews = data.copy()
+    shortened = []
+    for column in data.columns:
+        if data[column].dtype != object:
+            continue
+
+        values = data[column]
+        long_text = values.map(
+            lambda value: isinstance(value, str) and len(value) > PREVIEW_LENGTH
+        ).astype(bool)
+        if long_text.any():
+            previews.loc[long_text, column] = (
+                values[long_text].str.slice(0, PREVIEW_LENGTH) + PREVIEW_SUFFIX
+            )
+            shortened.append(column)
+
+    return previews, shortened
+
+
+def column_controls(hawk_id: str, columns: list[str]) -> list[str]:
+    """
+    Renders the choice of table columns and returns the chosen columns, all of them until the
+    user saves a choice
+    """
+    options = [column for column in columns if column not in REQUIRED_COLUMNS]
+    saved = saved_columns(hawk_id)
+    default = options if saved is None else [c for c in saved if c in options]
+
+    with st.expander("Table Columns"):
+        chosen = st.multiselect("Columns shown in the table", options, default=default)
+        if st.button("Save Columns"):
+            save_columns(hawk_id, chosen)
+            st.success("Saved your table columns")
+
+    return chosen
+
+
+def full_text_viewer(page: pd.DataFrame, shortened: list[str], selected_uids: set):
+    """
+    Renders the full text of the shortened columns for one student on the page, the first
+    selected one by default
+    """
+    if not shortened or page.empty:
+        return
+
+    uids = page["UID"].tolist()
+    selected = [position for position, uid in enumerate(uids) if uid in selected_uids]
+    names = dict(zip(uids, page["Name"] if "Name" in page.columns else uids))
+
+    with st.expander("Full Answers"):
+        uid = st.selectbox(
+            "Student",
+            uids,
+            index=selected[0] if selected else 0,
+            format_func=lambda uid: f"{names[uid]} ({uid})",
+        )
+        student = page.loc[page["UID"] == uid].iloc[0]
+        for column in shortened:
+            st.markdown(f"**{column}**")
+            st.write(student[column])
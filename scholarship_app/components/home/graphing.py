@@ -1,62 +1,242 @@
 """
-Graphing utility for homepage
+Graphing utility for homepage. Graphs are drawn by scholarship_app.components.home.plotting,
+which imports matplotlib, only when they are not already in the session's figure cache.
 """
-import matplotlib.pyplot as plt
-from matplotlib import cm
+from collections import OrderedDict
+from typing import Optional
 import numpy as np
+import pandas as pd
 import streamlit as st
+from scholarship_app.managers.export import frame_version
 
+# Largest marker weight, a marker is drawn with an area of MARKER_AREA per weight
+MAX_WEIGHT = 10
+MARKER_AREA = 32
 
-def dynamic_fig(var_df, x_axis, y_axis, options=None, highlights=None):
-    """
-    Function to generate dynamic graph of student data
-    """
-    fig, _ = plt.subplots()
-    var_xs = var_df[x_axis][var_df[x_axis] != 0][var_df[y_axis] != 0]
-    var_ys = var_df[y_axis][var_df[x_axis] != 0][var_df[y_axis] != 0]
-    weighted_bins = np.zeros((len(var_xs), 3))
-    for i in var_xs.index:
-        found = False
-        for j in range(weighted_bins.shape[0]):
-            if found:
-                continue
-            if weighted_bins[j][0] == 0 or (
-                weighted_bins[j][0] == var_xs[i] and weighted_bins[j][1] == var_ys[i]
-            ):
-                weighted_bins[j][0] = var_xs[i]
-                weighted_bins[j][1] = var_ys[i]
-                weighted_bins[j][2] += 1
-                found = True
-    weighted_bins = weighted_bins[~np.all(weighted_bins == 0, axis=1)]
-    for wbin in weighted_bins:
-        if options[1]:
-            wbin[-1] = wbin[-1] - (np.min(weighted_bins[:, 2]) - 1)
-        else:
-            wbin[-1] = 1
-        if wbin[-1] > 10:
-            wbin[-1] = 10
-    plt.scatter(weighted_bins[:, 0], weighted_bins[:, 1], s=32 * weighted_bins[:, 2])
+# Plot types of the distribution graph, automatic switches from a scatter to a hexbin once
+# there are more than MAX_SCATTER_POINTS points
+AUTOMATIC = "Automatic"
+SCATTER = "Scatter"
+HEXBIN = "Hexbin"
+HISTOGRAM = "2D Histogram"
+PLOT_TYPES = (AUTOMATIC, SCATTER, HEXBIN, HISTOGRAM)
+# Points drawn by a scatter at most, larger distributions are sampled down to this many
+MAX_SCATTER_POINTS = 5000
+# Bins along each axis of the hexbin and 2D histogram
+GRID_SIZE = 30
+DENSITY_COLORMAP = "Blues"
+
+FIGURE_CACHE_KEY = "distribution_figures"
+# Rendered graphs kept per session, the least recently shown is dropped first
+FIGURE_CACHE_SIZE = 16
+
+
+def bin_points(var_xs: pd.Series, var_ys: pd.Series) -> np.ndarray:
+    """
+    Counts the points at each distinct (x, y), in order of first appearance. A point with a
+    missing coordinate is never equal to another point, so it is a bin of its own.
+
+    Returns
+    -------
+    Array with a row of x, y and number of points for each bin
+    """
+    points = pd.DataFrame({"x": var_xs.to_numpy(), "y": var_ys.to_numpy()})
+    # Unique for points with a missing coordinate, so they are not grouped together
+    points["missing"] = np.where(
+        points[["x", "y"]].isna().any(axis=1), np.arange(len(points)), -1
+    )
+
+    sizes = points.groupby(["x", "y", "missing"], sort=False, dropna=False).size()
+    bins = np.zeros((len(sizes), 3))
+    bins[:, 0] = sizes.index.get_level_values("x")
+    bins[:, 1] = sizes.index.get_level_values("y")
+    bins[:, 2] = sizes.to_numpy()
+
+    return bins
+
+
+def bin_weights(counts: np.ndarray, weighted: bool) -> np.ndarray:
+    """
+    Marker weight of each bin, capped at MAX_WEIGHT. Unweighted bins all weigh 1. Weighted
+    bins are rescaled in order, each shifted down by the smallest weight at the time (counts of
+    the bins not yet rescaled included) less one, so the smallest bin weighs 1.
+    """
+    if not weighted:
+        return np.ones(len(counts))
+
+    weights = counts.astype(float)
+    # Smallest count from each bin on, the smallest weight is 1 once it reaches 1
+    remaining_minimum = np.minimum.accumulate(weights[::-1])[::-1]
+    rescaled_minimum = np.inf
+    for index, count in enumerate(counts):
+        minimum = min(rescaled_minimum, remaining_minimum[index])
+        if minimum == 1:
+            # Nothing is shifted from here on, the smallest weight stays 1
+            weights[index:] = np.minimum(weights[index:], MAX_WEIGHT)
+            break
+        weights[index] = min(count - (minimum - 1), MAX_WEIGHT)
+        rescaled_minimum = min(rescaled_minimum, weights[index])
+
+    return weights
+
+
+def plot_type(selected: str, point_count: int) -> str:
+    """
+    Plot type drawn for the selected type, automatic is a scatter for up to MAX_SCATTER_POINTS
+    points and a hexbin beyond that
+    """
+    if selected != AUTOMATIC:
+        return selected
+    return SCATTER if point_count <= MAX_SCATTER_POINTS else HEXBIN
+
+
+def sample_positions(count: int, limit: int, seed: int = 0) -> np.ndarray:
+    """
+    Positions of at most limit of count points, in order. The sample is the same for the same
+    count, so the graph does not change between reruns.
+    """
+    if count <= limit:
+        return np.arange(count)
+    rng = np.random.default_rng(seed)
+    return np.sort(rng.choice(count, size=limit, replace=False))
+
+
+def finite_points(
+    var_xs: pd.Series, var_ys: pd.Series
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Coordinates of the points with both an x and y, as floats for binning
+    """
+    var_xs = pd.to_numeric(var_xs, errors="coerce").to_numpy(dtype=float)
+    var_ys = pd.to_numeric(var_ys, errors="coerce").to_numpy(dtype=float)
+    finite = np.isfinite(var_xs) & np.isfinite(var_ys)
+    return var_xs[finite], var_ys[finite]
+
+
+def histogram_bins(
+    var_xs: np.ndarray, var_ys: np.ndarray, grid_size: int = GRID_SIZE
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Counts the points in a grid_size x grid_size grid over their range
+
+    Returns
+    -------
+    Counts with a row per y bin and column per x bin, empty bins masked, and the x and y bin
+    edges
+    """
+    if len(var_xs) == 0:
+        edges = np.zeros(grid_size + 1)
+        return np.ma.masked_all((grid_size, grid_size)), edges, edges
+    counts, x_edges, y_edges = np.histogram2d(var_xs, var_ys, bins=grid_size)
+    return np.ma.masked_equal(counts.T, 0), x_edges, y_edges
+
+
+def data_version(var_df: pd.DataFrame, columns: list[str]) -> str:
+    """
+    Digest of the values in columns of var_df, which changes when any student's value or the
+    students themselves change
+    """
+    return frame_version(var_df[columns])
+
+
+def figure_key(var_df, x_axis, y_axis, options, highlights) -> tuple:
+    """
+    Key of the graph dynamic_fig draws for the same arguments, the highlighted students are
+    keyed by UID and name as they are shown in the legend
+    """
+    highlighted = ()
     if highlights is not None and options[2] == "Selected Students":
-        highlights = [h for h in highlights if h is not None]
-        hxs = var_df.iloc[highlights][x_axis]
-        hys = var_df.iloc[highlights][y_axis]
-        colors = iter(cm.rainbow(np.linspace(0, 1, len(hys) + 1)))
-        next(colors)
-        for var_x, var_y in zip(hxs, hys):
-            plt.scatter(var_x, var_y, color=next(colors))
-        legend_names = ["Other Students"]
-        legend_names.extend(var_df.iloc[highlights]["Name"].values)
-        if options[0]:
-            plt.legend(legend_names)
-    plt.xlabel(x_axis)
-    plt.ylabel(y_axis)
-    st.pyplot(fig)
-    return fig
-
-
-def distribution_graph_expander(current_data, grid_table):
-    """
-    Renders the expander for the graphing distribution
+        rows = var_df.iloc[[h for h in highlights if h is not None]]
+        highlighted = tuple(zip(rows["UID"], rows["Name"]))
+    return (
+        data_version(var_df, [x_axis, y_axis]),
+        x_axis,
+        y_axis,
+        tuple(options),
+        highlighted,
+    )
+
+
+class FigureCache:
+    """
+    Least recently used cache of rendered distribution graphs
+
+    Attributes
+    ----------
+    max_size : int
+        Graphs kept at most
+    hits : int
+        Lookups answered from the cache
+    misses : int
+        Lookups which drew the graph
+    """
+
+    def __init__(self, max_size: int = FIGURE_CACHE_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._figures: OrderedDict[tuple, tuple[bytes, Optional[str]]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._figures)
+
+    def get(self, key: tuple, render) -> tuple[bytes, Optional[str]]:
+        """
+        Cached PNG and caption of the graph for key, calling render to draw it when missing
+
+        Returns
+        -------
+        PNG of the graph and its caption, if any
+        """
+        if key in self._figures:
+            self.hits += 1
+            self._figures.move_to_end(key)
+            return self._figures[key]
+
+        self.misses += 1
+        figure = render()
+        self._figures[key] = figure
+        if len(self._figures) > self.max_size:
+            self._figures.popitem(last=False)
+        return figure
+
+
+def get_figure_cache(session) -> FigureCache:
+    """
+    Figure cache of the session, created the first time it is needed
+    """
+    if FIGURE_CACHE_KEY not in session:
+        session[FIGURE_CACHE_KEY] = FigureCache()
+    return session[FIGURE_CACHE_KEY]
+
+
+def render_fig(var_df, x_axis, y_axis, options=None, highlights=None):
+    """
+    Draws the graph with dynamic_fig
+    """
+    # pylint: disable-next=import-outside-toplevel
+    from scholarship_app.components.home.plotting import dynamic_fig
+
+    return dynamic_fig(var_df, x_axis, y_axis, options, highlights)
+
+
+def cached_fig(var_df, x_axis, y_axis, options=None, highlights=None):
+    """
+    Shows the graph of student data, drawing it only if it is not in the figure cache
+    """
+    png, caption = get_figure_cache(st.session_state).get(
+        figure_key(var_df, x_axis, y_axis, options, highlights),
+        lambda: render_fig(var_df, x_axis, y_axis, options, highlights),
+    )
+    if caption is not None:
+        st.caption(caption)
+    st.image(png, use_column_width=True)
+
+
+def distribution_graph_expander(current_data, selected_positions):
+    """
+    Renders the expander for the graphing distribution, selected_positions are the positions
+    (iloc) of the selected students in current_data
     """
     with st.expander("See Distribution of Students"):
         with st.container():
@@ -67,16 +247,16 @@ def distribution_graph_expander(current_data, grid_table):
             fig_select1c = st.selectbox(
                 "Highlight Scheme", ["None", "Selected Students"]
             )  # , 'Scholarship Status'
+            plot_kind = st.selectbox("Plot Type", PLOT_TYPES)
             show_legend = st.checkbox("Show Legend", True)
-            weight_bins = st.checkbox("Weight Plot", True)
+            weight_bins = st.checkbox(
+                "Weight Plot", True, disabled=plot_kind in (HEXBIN, HISTOGRAM)
+            )
             sel_row_indices = None
             if fig_select1c == "Selected Students":
-                sel_rows = grid_table["selected_rows"]
-                sel_row_indices = [
-                    rows["_selectedRowNodeInfo"]["nodeRowIndex"] for rows in sel_rows
-                ]
-            option_select = [show_legend, weight_bins, fig_select1c]
-            dynamic_fig(
+                sel_row_indices = selected_positions
+            option_select = [show_legend, weight_bins, fig_select1c, plot_kind]
+            cached_fig(
                 current_data,
                 fig_select1a,
                 fig_select1b,
@@ -0,0 +1,91 @@
+"""
+AgGrid options of the homepage table
+
+The options only depend on the columns sent to the grid, their types and the scholarship being
+reviewed, so they are built once per schema. AgGrid changes the options it is given, encoding
+their JsCode in place, so every rerun gets its own copy with the rows to pre select set.
+"""
+import copy
+from functools import lru_cache
+
+import pandas as pd
+from st_aggrid import GridOptionsBuilder, JsCode
+
+# Schemas kept, a schema is the columns the user chose, their types and the scholarship
+CACHE_SIZE = 32
+
+ROW_STYLE = JsCode(
+    """
+            function(params) {
+                if (params.data.Review === 'Yes') {
+                    return {
+                        'color': 'white',
+                        'backgroundColor': '#017252'
+                    }
+                }
+                if (params.data.Review === 'No') {
+                    return {
+                        'color': 'white',
+                        'backgroundColor': '#8E0303'
+                    }
+                }
+                if (params.data.Review === 'Maybe') {
+                    return {
+                        'color': 'white',
+                        'backgroundColor': '#A2A200'
+                    }
+                }
+            };
+            """
+)
+
+
+def grid_schema(rows: pd.DataFrame, scholarship: str) -> tuple[tuple, tuple, str]:
+    """
+    Names and dtypes of the columns of rows, and the scholarship being reviewed, the key options
+    are cached by. The dtypes are kept as they are, hashing them is cheaper than naming them.
+    """
+    return tuple(rows.columns), tuple(rows.dtypes.tolist()), scholarship
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def build_grid_options(schema: tuple[tuple, tuple, str]) -> dict:
+    """
+    Builds the grid options for rows with schema (see grid_schema), without any rows selected.
+    The scholarship only keys the cache, each scholarship's grid gets its own options. The
+    returned options are shared, grid_options copies them.
+    """
+    columns, dtypes, _ = schema
+    empty = pd.DataFrame(
+        {column: pd.Series(dtype=dtype) for column, dtype in zip(columns, dtypes)},
+        columns=list(columns),
+    )
+
+    graph_data = GridOptionsBuilder.from_dataframe(empty)
+    graph_data.configure_side_bar()  # Add a sidebar
+    graph_data.configure_default_column(
+        editable=False, groupable=True, sortable=False, filter=False
+    )
+    graph_data.configure_selection(
+        selection_mode="multiple", use_checkbox=True
+    )  # Enable multi-row selection
+    graph_data.configure_column("Select All", headerCheckboxSelection=True)
+
+    options = graph_data.build()
+    options["getRowStyle"] = ROW_STYLE
+
+    return options
+
+
+def grid_options(
+    rows: pd.DataFrame, pre_selected_rows: list[int], scholarship: str
+) -> dict:
+    """
+    Grid options for rows shown while reviewing scholarship, with the rows at positions
+    pre_selected_rows (iloc) selected. The options are a copy the caller may change.
+    """
+    options = copy.deepcopy(build_grid_options(grid_schema(rows, scholarship)))
+    if pre_selected_rows:
+        options["preSelectedRows"] = pre_selected_rows
+
+    return options
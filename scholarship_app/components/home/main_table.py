@@ -0,0 +1,216 @@
+"""
+Server side paging for the homepage table
+
+The table is searched, sorted and paged here, and only the visible page is sent to the grid, so
+each interaction serializes one page of students rather than the whole applicant pool. Selected
+students are tracked by UID in the session, so a selection is kept while paging, searching and
+sorting.
+"""
+import math
+from dataclasses import dataclass, replace
+
+import pandas as pd
+import streamlit as st
+
+from scholarship_app.sessions.session_manager import SessionManager
+
+PAGE_SIZES = (25, 50, 100, 250)
+DEFAULT_PAGE_SIZE = 50
+# Sort option for keeping the order of the master sheet
+NO_SORT = "None"
+
+
+@dataclass(frozen=True)
+class TableWindow:
+    """
+    Rows of the table shown in the grid
+
+    Attributes
+    ----------
+    search : str
+        Text a row must contain (case insensitive) in one of its text columns or its UID
+    sort_by : str
+        Column rows are sorted by, NO_SORT to keep their order
+    ascending : bool
+        Whether rows are sorted in ascending order
+    page : int
+        Index of the shown page
+    page_size : int
+        Number of rows on a page
+    """
+
+    search: str = ""
+    sort_by: str = NO_SORT
+    ascending: bool = True
+    page: int = 0
+    page_size: int = DEFAULT_PAGE_SIZE
+
+
+def matching_rows(data: pd.DataFrame, window: TableWindow) -> pd.DataFrame:
+    """
+    Rows of data matching the window's search, in the window's sort order
+    """
+    if window.search:
+        matches = pd.Series(False, index=data.index)
+        for column in data.columns:
+            if column == "UID" or data[column].dtype == object:
+                matches |= (
+                    data[column]
+                    .astype(str)
+                    .str.contains(window.search, case=False, regex=False)
+                )
+        data = data.loc[matches]
+
+    if window.sort_by != NO_SORT and window.sort_by in data.columns:
+        data = data.sort_values(
+            window.sort_by, ascending=window.ascending, kind="stable"
+        )
+
+    return data
+
+
+def page_count(row_count: int, page_size: int) -> int:
+    """
+    Number of pages of page_size rows needed for row_count rows, at least one
+    """
+    return max(1, math.ceil(row_count / page_size))
+
+
+def page_rows(matching: pd.DataFrame, window: TableWindow) -> pd.DataFrame:
+    """
+    Copy of the rows on the window's page of the matching rows. A page past the end shows the
+    last page.
+    """
+    page = min(window.page, page_count(len(matching), window.page_size) - 1)
+    start = page * window.page_size
+    return matching.iloc[start : start + window.page_size].copy()
+
+
+class TableSelection:
+    """
+    Students selected in the table, by UID
+
+    Attributes
+    ----------
+    uids : set
+        UIDs of the selected students, including those on pages not shown
+    version : int
+        Incremented when the selection is changed outside of the grid, so the grid is recreated
+        with the new selection
+    _session : SessionManager
+        Session the selection is kept in
+    """
+
+    def __init__(self, session: SessionManager):
+        if not session.has("selected_uids"):
+            session.set("selected_uids", set())
+            session.set("selection_version", 0)
+        self.uids = session.retrieve("selected_uids")
+        self.version = session.retrieve("selection_version")
+        self._session = session
+
+    def update(self, page_uids: pd.Series, selected_uids: list):
+        """
+        Replaces the selection among the students of a page with those selected in the grid,
+        leaving the selection on other pages as is
+        """
+        self.uids.difference_update(page_uids)
+        self.uids.update(selected_uids)
+
+    def select(self, uids: pd.Series):
+        """
+        Adds students to the selection
+        """
+        self.uids.update(uids)
+        self._changed()
+
+    def clear(self):
+        """
+        Deselects every student
+        """
+        self.uids.clear()
+        self._changed()
+
+    def mask(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Which rows of data are selected
+        """
+        return data["UID"].isin(self.uids)
+
+    def rows(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Selected rows of data
+        """
+        return data.loc[self.mask(data)]
+
+    def positions(self, data: pd.DataFrame) -> list[int]:
+        """
+        Positions (iloc) of the selected rows of data
+        """
+        return self.mask(data).to_numpy().nonzero()[0].tolist()
+
+    def _changed(self):
+        """
+        Records a change of the selection made outside of the grid
+        """
+        self.version += 1
+        self._session.set("selection_version", self.version)
+
+
+def table_window_controls(session: SessionManager, columns: list) -> TableWindow:
+    """
+    Renders the search, sort and page size controls above the table and returns the window they
+    describe. Changing any of them goes back to the first page.
+    """
+    window = (
+        session.retrieve("table_window")
+        if session.has("table_window")
+        else TableWindow()
+    )
+    sort_options = [NO_SORT] + [column for column in columns if column != "Select All"]
+
+    search_column, sort_column, order_column, size_column = st.columns([3, 3, 1, 1])
+    search = search_column.text_input("Search students", value=window.search)
+    sort_by = sort_column.selectbox(
+        "Sort by",
+        sort_options,
+        index=sort_options.index(window.sort_by)
+        if window.sort_by in sort_options
+        else 0,
+    )
+    ascending = order_column.selectbox(
+        "Order", ["Ascending", "Descending"], index=0 if window.ascending else 1
+    )
+    page_size = size_column.selectbox(
+        "Rows per page", PAGE_SIZES, index=PAGE_SIZES.index(window.page_size)
+    )
+
+    updated = replace(
+        window,
+        search=search,
+        sort_by=sort_by,
+        ascending=ascending == "Ascending",
+        page_size=page_size,
+    )
+    if updated != window:
+        updated = replace(updated, page=0)
+
+    session.set("table_window", updated)
+    return updated
+
+
+def page_controls(session: SessionManager, window: TableWindow, row_count: int):
+    """
+    Renders the page navigation below the table
+    """
+    pages = page_count(row_count, window.page_size)
+    page = min(window.page, pages - 1)
+
+    previous_column, location_column, next_column = st.columns([1, 6, 1])
+    location_column.write(f"Page {page + 1} of {pages} ({row_count} students)")
+    if page > 0 and previous_column.button("Previous"):
+        session.set("table_window", replace(window, page=page - 1))
+        st.experimental_rerun()
+    if page < pages - 1 and next_column.button("Next"):
+        session.set("table_window", replace(window, page=page + 1))
+        st.experimental_rerun()
@@ -0,0 +1,105 @@
+"""
+Drawing of the homepage distribution graph with matplotlib, imported by
+scholarship_app.components.home.graphing only when a graph is not in its figure cache
+"""
+from io import BytesIO
+from typing import Optional
+import matplotlib.pyplot as plt
+from matplotlib import cm
+import numpy as np
+import pandas as pd
+from scholarship_app.components.home.graphing import (
+    DENSITY_COLORMAP,
+    GRID_SIZE,
+    HEXBIN,
+    MARKER_AREA,
+    MAX_SCATTER_POINTS,
+    SCATTER,
+    bin_points,
+    bin_weights,
+    finite_points,
+    histogram_bins,
+    plot_type,
+    sample_positions,
+)
+
+# Image options st.pyplot renders figures with
+PNG_OPTIONS = {"bbox_inches": "tight", "dpi": 200, "format": "png"}
+
+
+def draw_scatter(var_xs: pd.Series, var_ys: pd.Series, weighted: bool) -> int:
+    """
+    Draws the distinct points weighted by how many share them, sampling large distributions
+    down to MAX_SCATTER_POINTS
+
+    Returns
+    -------
+    Number of points drawn
+    """
+    positions = sample_positions(len(var_xs), MAX_SCATTER_POINTS)
+    weighted_bins = bin_points(var_xs.iloc[positions], var_ys.iloc[positions])
+    weighted_bins[:, 2] = bin_weights(weighted_bins[:, 2], weighted)
+    plt.scatter(
+        weighted_bins[:, 0],
+        weighted_bins[:, 1],
+        s=MARKER_AREA * weighted_bins[:, 2],
+    )
+    return len(positions)
+
+
+def draw_density(var_xs: pd.Series, var_ys: pd.Series, kind: str):
+    """
+    Draws the number of points in each hexagon or grid square, the cost of drawing depends on
+    GRID_SIZE only
+    """
+    var_xs, var_ys = finite_points(var_xs, var_ys)
+    if kind == HEXBIN:
+        plt.hexbin(var_xs, var_ys, gridsize=GRID_SIZE, mincnt=1, cmap=DENSITY_COLORMAP)
+    else:
+        counts, x_edges, y_edges = histogram_bins(var_xs, var_ys)
+        plt.pcolormesh(x_edges, y_edges, counts, cmap=DENSITY_COLORMAP)
+    plt.colorbar(label="Students")
+
+
+def dynamic_fig(
+    var_df, x_axis, y_axis, options=None, highlights=None
+) -> tuple[bytes, Optional[str]]:
+    """
+    Function to generate dynamic graph of student data, options are whether to show the
+    legend, whether to weight the scatter, the highlight scheme and one of PLOT_TYPES
+
+    Returns
+    -------
+    PNG of the graph and a caption for it when the scatter was sampled
+    """
+    fig, _ = plt.subplots()
+    caption = None
+    nonzero = (var_df[x_axis] != 0) & (var_df[y_axis] != 0)
+    var_xs = var_df[x_axis][nonzero]
+    var_ys = var_df[y_axis][nonzero]
+    kind = plot_type(options[3], len(var_xs))
+    if kind == SCATTER:
+        drawn = draw_scatter(var_xs, var_ys, options[1])
+        if drawn < len(var_xs):
+            caption = f"Showing a sample of {drawn} of {len(var_xs)} students"
+    else:
+        draw_density(var_xs, var_ys, kind)
+    if highlights is not None and options[2] == "Selected Students":
+        highlights = [h for h in highlights if h is not None]
+        hxs = var_df.iloc[highlights][x_axis]
+        hys = var_df.iloc[highlights][y_axis]
+        colors = iter(cm.rainbow(np.linspace(0, 1, len(hys) + 1)))
+        next(colors)
+        for var_x, var_y in zip(hxs, hys):
+            plt.scatter(var_x, var_y, color=next(colors), edgecolors="black", zorder=3)
+        legend_names = ["Other Students"]
+        legend_names.extend(var_df.iloc[highlights]["Name"].values)
+        if options[0]:
+            plt.legend(legend_names)
+    plt.xlabel(x_axis)
+    plt.ylabel(y_axis)
+
+    image = BytesIO()
+    fig.savefig(image, **PNG_OPTIONS)
+    plt.close(fig)
+    return image.getvalue(), caption
@@ -1,69 +1,50 @@
 import streamlit as st
 import pandas as pd
-from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.managers.review_log import ReviewLog
 
 
 def submit_recommendations(
-    user_recommendations_input,
+    review_log: ReviewLog,
     recommended_scholarship,
     rating_input,
     additional_feedback_input,
-    grid_table,
-    sharepoint,
+    sel_uids,
+    storage,
 ):
     """
     Helper function used for processing the scholarship reviews
-    Method used to complete the review process by updating local and sharepoint data
+    Method used to complete the review process by appending the reviews to the user's review
+    log, which uploads only the new reviews
     """
-    if len(grid_table["selected_rows"]) == 0:
+    if len(sel_uids) == 0:
         return False, "Must select students to recommend"
-    sel_uids = [key["UID"] for key in grid_table["selected_rows"]]
+    reviewed = review_log.reviewed(sel_uids, recommended_scholarship)
+    if reviewed is not None:
+        return False, str(
+            "Already reviewed student " + str(reviewed) + " for this scholarship"
+        )
+    # Check here if students meets requirements of scholarship (Need to wait to merge Austin's PR before these)
     new_recommendations = pd.DataFrame(
-        columns=["UID", "Scholarship", "Rating", "Additional Feedback"]
-    )
-    for uid in sel_uids:
-        new_recommendation = {
-            "UID": uid,
+        {
+            "UID": list(sel_uids),
             "Scholarship": recommended_scholarship,
             "Rating": rating_input,
             "Additional Feedback": additional_feedback_input,
         }
-        if (
-            len(
-                user_recommendations_input.loc[
-                    (user_recommendations_input["UID"] == uid)
-                    & (
-                        user_recommendations_input["Scholarship"]
-                        == recommended_scholarship
-                    )
-                ]
-            )
-            > 0
-        ):
-            return False, str(
-                "Already reviewed student " + str(uid) + " for this scholarship"
-            )
-        # Check here if students meets requirements of scholarship (Need to wait to merge Austin's PR before these)
-        new_recommendations = new_recommendations.append(
-            new_recommendation, ignore_index=True
-        )
-    # Check here for it too many recommendations for that scholarship, should be none if unlimited
-    user_recommendations_input = user_recommendations_input.append(new_recommendations)
-    user_recommendations_input.to_excel(
-        get_appdata_path(f"/data/{sharepoint.get_hawk_id()}_Reviews.xlsx"),
-        index=False,
     )
+    # Check here for it too many recommendations for that scholarship, should be none if unlimited
+    try:
+        review_log.append(storage, new_recommendations)
+    except IOError as error:
+        return False, str(error)
 
-    sharepoint.upload(f"/data/{sharepoint.get_hawk_id()}_Reviews.xlsx", "/data/")
-
-    return True, user_recommendations_input
+    return True, review_log.reviews
 
 
-def submit_review_expander(
-    current_scholarship, user_recommendations, grid_table, sharepoint
-):
+def submit_review_expander(current_scholarship, review_log, selected_uids, storage):
     """
-    Expander and form for submitting reviews
+    Expander and form for submitting reviews of the students with selected_uids, added to
+    the user's review_log
     """
     with st.expander("Review Selected Students"):
         if current_scholarship == "None":
@@ -71,6 +52,10 @@ def submit_review_expander(
         else:
             with st.form("recommendation_form"):
                 st.write(f"Review for Scholarship: {current_scholarship}")
+                st.caption(
+                    f"You have reviewed {review_log.index.count(current_scholarship)} "
+                    "students for this scholarship"
+                )
                 rating = st.selectbox(
                     "Would you recommend these students for this scholarship?",
                     ["Yes", "No", "Maybe"],
@@ -88,15 +73,14 @@ def submit_review_expander(
                         st.session_state["review_success"] = None
                 if submit_recommendation:
                     success, result = submit_recommendations(
-                        user_recommendations,
+                        review_log,
                         current_scholarship,
                         rating,
                         additional_feedback,
-                        grid_table,
-                        sharepoint,
+                        selected_uids,
+                        storage,
                     )
                     if success is True:
-                        st.session_state.user_recommendations = result
                         st.session_state.review_success = "success"
                         st.experimental_rerun()
                     else:
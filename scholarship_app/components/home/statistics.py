@@ -1,23 +1,17 @@
 import streamlit as st
-import pandas as pd
-import streamlit.components.v1 as components
-from st_aggrid import AgGrid
-
-CLEARJS = """<script>
-     ((e) => {
-        const iframe = window.parent.document.querySelectorAll('[title="st_aggrid.agGrid"]')[0] || null;
-        if(!iframe) return;
-        iframe.contentWindow.dispatchEvent( new Event('clear.rows'));
-     })()
-    </script>
-    """
+from scholarship_app.components.home.main_table import TableSelection
 
 
 def main_data_statistics(
-    current_data: pd.DataFrame, students: pd.DataFrame, grid_table: AgGrid
+    eligible_count: int,
+    student_count: int,
+    selected_count: int,
+    selection: TableSelection,
 ):
     """
-    Renders the table statistics found below the main homepage table.
+    Renders the table statistics found below the main homepage table. eligible_count is the
+    number of the student_count students which are eligible for the selected scholarship, and
+    selected_count the number of those which are selected.
     """
     with st.container():
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -31,16 +25,17 @@ def main_data_statistics(
         with col2:
             st.write(
                 "Number of Students: &nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp;&nbsp; Selected: ",
-                len([student["Name"] for student in grid_table["selected_rows"]]),
+                selected_count,
                 unsafe_allow_html=True,
             )
         with col3:
-            st.write("Eligible for Selected Scholarship: ", len(current_data))
+            st.write("Eligible for Selected Scholarship: ", eligible_count)
         with col4:
             st.write(
                 "Ineligible for Selected Scholarship: ",
-                len(students) - len(current_data),
+                student_count - eligible_count,
             )
         with col5:
             if st.button("Clear Selection"):
-                components.html(CLEARJS)
+                selection.clear()
+                st.experimental_rerun()
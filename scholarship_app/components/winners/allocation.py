@@ -0,0 +1,60 @@
+"""
+Allocating the awards of every scholarship at once on the winners page
+"""
+import pandas as pd
+import streamlit as st
+from scholarship_app.components.export import export_download
+from scholarship_app.utils.allocation import ALLOCATION_METHODS, allocate_awards
+
+# Session key the last allocation is kept under
+ALLOCATION_KEY = "award_allocation"
+
+
+def allocation_expander(
+    students: pd.DataFrame,
+    scholarships: pd.DataFrame,
+    scores: pd.Series,
+    eligibility: pd.DataFrame,
+):
+    """
+    Expander which allocates the awards of every scholarship to the students with the highest
+    total vote score, showing and exporting the awards
+
+    Parameters
+    ----------
+    students : pd.DataFrame
+        Master sheet of student data
+    scholarships : pd.DataFrame
+        Scholarships sheet
+    scores : pd.Series
+        Vote scores indexed by (UID, Scholarship)
+    eligibility : pd.DataFrame
+        Eligibility of each student for each scholarship
+    """
+    with st.expander("Allocate Awards Across All Scholarships"):
+        st.caption(
+            "Awards each scholarship's Total Amount to eligible students with a vote score of "
+            "at least 0, maximizing the total vote score of every award"
+        )
+        col1, col2 = st.columns(2)
+        with col1:
+            limit = st.number_input(
+                "Scholarships per student", min_value=1, value=1, step=1
+            )
+        with col2:
+            method = st.selectbox("Allocation Method", ALLOCATION_METHODS)
+
+        if st.button("Allocate Awards"):
+            with st.spinner("Allocating awards..."):
+                st.session_state[ALLOCATION_KEY] = allocate_awards(
+                    students, scholarships, scores, eligibility, int(limit), method
+                )
+
+        awards = st.session_state.get(ALLOCATION_KEY)
+        if awards is not None:
+            st.write(
+                f"{len(awards)} awards to {awards['UID'].nunique()} students, with a total "
+                f"vote score of {awards['Vote Score'].sum()}"
+            )
+            st.write(awards)
+            export_download(awards, "award_allocation", "Scholarship_Awards")
@@ -0,0 +1,198 @@
+"""
+Export of tables for download.
+
+Exports are written in memory only when the user asks for them and kept per session, keyed by
+the version of the table and the format, so a download button can serve them again on later
+reruns without writing anything. Excel exports are streamed through openpyxl's write only
+workbook a chunk of rows at a time, so writing does not copy the whole table.
+"""
+from collections import OrderedDict
+from enum import Enum
+from hashlib import blake2b
+from io import BytesIO
+from typing import Optional
+import pandas as pd
+from openpyxl import Workbook
+
+EXPORT_CACHE_KEY = "exports"
+# Exports kept per session, the least recently used is dropped first
+EXPORT_CACHE_SIZE = 4
+# Rows converted at a time when streaming an xlsx
+CHUNK_ROWS = 5000
+
+
+class ExportFormat(Enum):
+    """
+    Formats a table can be exported as, the value is the file extension
+    """
+
+    XLSX = "xlsx"
+    CSV = "csv"
+    PARQUET = "parquet"
+    XLS = "xls"
+
+
+FORMAT_LABELS = {
+    ExportFormat.XLSX: "Excel (.xlsx)",
+    ExportFormat.CSV: "CSV (.csv)",
+    ExportFormat.PARQUET: "Parquet (.parquet)",
+    ExportFormat.XLS: "Excel 97-2003 (.xls)",
+}
+
+MIME_TYPES = {
+    ExportFormat.XLSX: "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    ExportFormat.CSV: "text/csv",
+    ExportFormat.PARQUET: "application/vnd.apache.parquet",
+    ExportFormat.XLS: "application/vnd.ms-excel",
+}
+
+
+def frame_version(frame: pd.DataFrame) -> str:
+    """
+    Digest of the columns and values of frame, which changes when any of them or the order of
+    the rows change. The index is left out as it is not exported.
+    """
+    digest = blake2b(digest_size=16)
+    digest.update(repr(frame.columns.tolist()).encode())
+    digest.update(pd.util.hash_pandas_object(frame, index=False).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def cell_value(value):
+    """
+    Value as openpyxl can write it, values it has no cell type for are written as text
+    """
+    if value is None or isinstance(value, (str, int, float, pd.Timestamp)):
+        return value
+    return str(value)
+
+
+def cell_rows(frame: pd.DataFrame):
+    """
+    Rows of frame as lists of cell values, missing values are left as empty cells. Rows are
+    converted CHUNK_ROWS at a time.
+    """
+    for start in range(0, len(frame), CHUNK_ROWS):
+        chunk = frame.iloc[start : start + CHUNK_ROWS].astype(object)
+        chunk = chunk.where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            yield [cell_value(value) for value in row]
+
+
+def write_xlsx(frame: pd.DataFrame, stream):
+    """
+    Writes frame to stream as an xlsx with a header row, without its index
+    """
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet()
+    sheet.append([str(column) for column in frame.columns])
+    for row in cell_rows(frame):
+        sheet.append(row)
+    workbook.save(stream)
+
+
+def parquet_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """
+    Frame with its columns of mixed types written as text, which Parquet has no type for
+    """
+    mixed = [
+        column
+        for column in frame.columns[frame.dtypes == object]
+        if pd.api.types.infer_dtype(frame[column], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return frame
+    frame = frame.copy()
+    for column in mixed:
+        frame[column] = frame[column].where(
+            frame[column].isna(), frame[column].astype(str)
+        )
+    return frame
+
+
+def write_export(frame: pd.DataFrame, export_format: ExportFormat) -> bytes:
+    """
+    Writes frame, without its index, in export_format
+
+    Returns
+    -------
+    Contents of the exported file
+    """
+    stream = BytesIO()
+    if export_format == ExportFormat.XLSX:
+        write_xlsx(frame, stream)
+    elif export_format == ExportFormat.CSV:
+        frame.to_csv(stream, index=False)
+    elif export_format == ExportFormat.PARQUET:
+        parquet_frame(frame).to_parquet(stream, index=False)
+    else:
+        frame.to_excel(stream, index=False, engine="xlwt")
+    return stream.getvalue()
+
+
+class ExportCache:
+    """
+    Least recently used cache of the exports written in a session
+
+    Attributes
+    ----------
+    max_size : int
+        Exports kept at most
+    """
+
+    def __init__(self, max_size: int = EXPORT_CACHE_SIZE):
+        self.max_size = max_size
+        self._exports: OrderedDict[tuple, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._exports)
+
+    def has_exports(self, name: str) -> bool:
+        """
+        Whether any export of the table called name is cached, before its version is computed
+        """
+        return any(key[0] == name for key in self._exports)
+
+    def get(
+        self, name: str, version: str, export_format: ExportFormat
+    ) -> Optional[bytes]:
+        """
+        Cached export of version of the table called name, None if it was not written
+        """
+        key = (name, version, export_format)
+        if key not in self._exports:
+            return None
+        self._exports.move_to_end(key)
+        return self._exports[key]
+
+    def export(
+        self,
+        name: str,
+        frame: pd.DataFrame,
+        export_format: ExportFormat,
+        version: Optional[str] = None,
+    ) -> bytes:
+        """
+        Export of frame as the table called name, written unless it is already cached
+
+        Returns
+        -------
+        Contents of the exported file
+        """
+        version = frame_version(frame) if version is None else version
+        data = self.get(name, version, export_format)
+        if data is None:
+            data = write_export(frame, export_format)
+            self._exports[(name, version, export_format)] = data
+            if len(self._exports) > self.max_size:
+                self._exports.popitem(last=False)
+        return data
+
+
+def get_export_cache(session) -> ExportCache:
+    """
+    Export cache of the session, created the first time it is needed
+    """
+    if EXPORT_CACHE_KEY not in session:
+        session[EXPORT_CACHE_KEY] = ExportCache()
+    return session[EXPORT_CACHE_KEY]
@@ -0,0 +1,293 @@
+"""
+Loading the reviews of several reviewers at once, as one typed frame.
+
+Reviewers are taken from the current listing of snapshots in the storage, so review sheets left
+in appdata by an earlier cycle, or by a reviewer since removed, are never read. Each reviewer's
+snapshot and segments are downloaded and then parsed in a pool of processes, as parsing
+spreadsheets is bound by the CPU. Parsed files are cached by a hash of their content, shared by
+every session of the server process, so a file which has not changed is never parsed twice.
+"""
+import hashlib
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
+from dataclasses import dataclass, field
+import numpy as np
+import pandas as pd
+from scholarship_app.managers.review_log import (
+    REVIEW_COLUMNS,
+    list_reviewers,
+    list_segments,
+    local_path,
+    read_snapshot,
+    segment_folder,
+    snapshot_path,
+)
+from scholarship_app.managers.storage.storage_backend import StorageBackend
+
+# Type of each column of the loaded reviews
+REVIEW_DTYPES = {
+    "Reviewer": "category",
+    "UID": "Int64",
+    "Scholarship": "string",
+    "Rating": "category",
+    "Additional Feedback": "string",
+}
+# Processes files are parsed in
+PARSE_WORKERS = max(1, min(4, os.cpu_count() or 1))
+# Parsed files kept in the cache
+PARSED_CACHE_SIZE = 256
+# Bytes read at a time when hashing a file
+HASH_CHUNK_SIZE = 1 << 20
+
+# A parsed review file: its typed reviews, the generation of the snapshot (0 for segments) and
+# the number of reviews whose UID is not a whole number
+ParsedFile = tuple[pd.DataFrame, int, int]
+
+
+def typed_reviews(reviews: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    The review columns of reviews with the types of REVIEW_DTYPES, and the number of reviews
+    with a UID which is not a whole number. Those reviews are kept with a missing UID.
+    """
+    reviews = reviews.reindex(columns=REVIEW_COLUMNS)
+    uids = pd.to_numeric(reviews["UID"], errors="coerce")
+    uids = uids.where(uids == uids.round())
+    invalid = int((uids.isna() & reviews["UID"].notna()).sum())
+    typed = pd.DataFrame(
+        {
+            "UID": uids.astype(REVIEW_DTYPES["UID"]),
+            **{
+                column: reviews[column].astype(REVIEW_DTYPES[column])
+                for column in REVIEW_COLUMNS[1:]
+            },
+        }
+    )
+    return typed, invalid
+
+
+def parse_review_file(path: str) -> ParsedFile:
+    """
+    Typed reviews of a snapshot or segment at path in appdata, see ParsedFile
+    """
+    if path.endswith(".csv"):
+        reviews, generation = pd.read_csv(path), 0
+    else:
+        reviews, generation = read_snapshot(path)
+
+    typed, invalid = typed_reviews(reviews)
+    return typed, generation, invalid
+
+
+def content_hash(path: str) -> str:
+    """
+    Hash of the content of the file at path
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ParsedFileCache:
+    """
+    Least recently used parsed review files, keyed by the hash of their content
+
+    Attributes
+    ----------
+    size : int
+        Most parsed files kept
+    hits : int
+        Files found in the cache
+    misses : int
+        Files which were not in the cache
+    """
+
+    def __init__(self, size: int = PARSED_CACHE_SIZE):
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._files: OrderedDict[str, ParsedFile] = OrderedDict()
+
+    def get(self, key: str) -> ParsedFile | None:
+        """
+        Parsed file with the content hash key, None if it is not cached
+        """
+        with self._lock:
+            parsed = self._files.get(key)
+            if parsed is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._files.move_to_end(key)
+            return parsed
+
+    def clear(self):
+        """
+        Drops every cached file
+        """
+        with self._lock:
+            self._files.clear()
+
+    def put(self, key: str, parsed: ParsedFile):
+        """
+        Caches the parsed file with the content hash key, dropping the least recently used file
+        once full
+        """
+        with self._lock:
+            self._files[key] = parsed
+            self._files.move_to_end(key)
+            while len(self._files) > self.size:
+                self._files.popitem(last=False)
+
+
+_PARSED_CACHE: ParsedFileCache | None = None
+_PARSE_POOL: ProcessPoolExecutor | None = None
+_CORPUS_LOCK = threading.Lock()
+
+
+def get_parsed_cache() -> ParsedFileCache:
+    """
+    Returns the parsed file cache shared by every session of the server process
+    """
+    global _PARSED_CACHE  # pylint: disable=global-statement
+    with _CORPUS_LOCK:
+        if _PARSED_CACHE is None:
+            _PARSED_CACHE = ParsedFileCache()
+        return _PARSED_CACHE
+
+
+def get_parse_pool() -> ProcessPoolExecutor:
+    """
+    Returns the pool of processes files are parsed in, shared by every session of the server
+    process. Workers are spawned rather than forked, as the server process runs threads.
+    """
+    global _PARSE_POOL  # pylint: disable=global-statement
+    with _CORPUS_LOCK:
+        if _PARSE_POOL is None:
+            _PARSE_POOL = ProcessPoolExecutor(
+                PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _PARSE_POOL
+
+
+def parse_files(paths: list[str], executor: Executor | None = None) -> list[ParsedFile]:
+    """
+    Parses the review files at paths in appdata, see parse_review_file. Files which are not in
+    the parsed file cache are parsed in executor, the shared pool of processes by default, or
+    directly when there is only one.
+    """
+    cache = get_parsed_cache()
+    keys = [content_hash(path) for path in paths]
+    parsed = {key: cache.get(key) for key in keys}
+    missing = {key: path for key, path in zip(keys, paths) if parsed[key] is None}
+
+    if len(missing) > 1:
+        executor = get_parse_pool() if executor is None else executor
+        results = executor.map(parse_review_file, missing.values())
+    else:
+        results = map(parse_review_file, missing.values())
+    for key, result in zip(missing, results):
+        cache.put(key, result)
+        parsed[key] = result
+
+    return [parsed[key] for key in keys]
+
+
+@dataclass
+class ReviewCorpus:
+    """
+    Reviews of several reviewers
+
+    Attributes
+    ----------
+    reviews : pd.DataFrame
+        Every review, with the Reviewer who left it, typed as REVIEW_DTYPES. Each reviewer's
+        reviews are in the order they were left.
+    generations : dict[str, int]
+        Generation of each reviewer's snapshot
+    segments : dict[str, list[str]]
+        Paths in the storage of the segments read for each reviewer
+    invalid_uids : dict[str, int]
+        Reviews of each reviewer whose UID is not a whole number, kept with a missing UID
+    """
+
+    reviews: pd.DataFrame
+    generations: dict[str, int] = field(default_factory=dict)
+    segments: dict[str, list[str]] = field(default_factory=dict)
+    invalid_uids: dict[str, int] = field(default_factory=dict)
+
+    def reviewer_reviews(self) -> dict[str, pd.DataFrame]:
+        """
+        Reviews of each reviewer, without the Reviewer column
+        """
+        grouped = self.reviews.drop(columns="Reviewer").groupby(
+            self.reviews["Reviewer"], observed=True, sort=False
+        )
+        frames = {hawk_id: frame for hawk_id, frame in grouped}
+        empty = self.reviews.iloc[:0].drop(columns="Reviewer")
+        return {hawk_id: frames.get(hawk_id, empty) for hawk_id in self.generations}
+
+
+def load_review_corpus(
+    storage: StorageBackend,
+    hawk_ids: list[str] | None = None,
+    executor: Executor | None = None,
+) -> ReviewCorpus:
+    """
+    Downloads and parses the snapshot and segments of each reviewer listed in storage
+
+    Parameters
+    ----------
+    storage : StorageBackend
+        Storage the review logs are kept in
+    hawk_ids : list[str], optional
+        Reviewers to load, every listed reviewer by default. Reviewers who are not listed are
+        left out.
+    executor : Executor, optional
+        Executor files are parsed in, see parse_files
+    """
+    listed = list_reviewers(storage)
+    if hawk_ids is not None:
+        listed = [hawk_id for hawk_id in listed if hawk_id in set(hawk_ids)]
+    downloaded = storage.download_many(
+        [snapshot_path(hawk_id) for hawk_id in listed], "/data/"
+    )
+    hawk_ids = [hawk_id for hawk_id in listed if downloaded[snapshot_path(hawk_id)]]
+    snapshots = parse_files(
+        [local_path(snapshot_path(hawk_id)) for hawk_id in hawk_ids], executor
+    )
+
+    corpus = ReviewCorpus(pd.DataFrame())
+    for hawk_id, (_, generation, _) in zip(hawk_ids, snapshots):
+        folder = segment_folder(hawk_id, generation)
+        segments = list_segments(storage, folder)
+        downloaded = storage.download_many(segments, folder)
+        corpus.generations[hawk_id] = generation
+        corpus.segments[hawk_id] = [s for s in segments if downloaded[s]]
+
+    parsed_segments = iter(
+        parse_files(
+            [
+                local_path(segment)
+                for hawk_id in hawk_ids
+                for segment in corpus.segments[hawk_id]
+            ],
+            executor,
+        )
+    )
+    frames, reviewers = [typed_reviews(pd.DataFrame())[0]], []
+    for hawk_id, snapshot in zip(hawk_ids, snapshots):
+        parsed = [snapshot] + [next(parsed_segments) for _ in corpus.segments[hawk_id]]
+        frames.extend(frame for frame, _, _ in parsed)
+        reviewers.append(sum(len(frame) for frame, _, _ in parsed))
+        corpus.invalid_uids[hawk_id] = sum(invalid for _, _, invalid in parsed)
+
+    reviews = pd.concat(frames, ignore_index=True)
+    reviews.insert(0, "Reviewer", np.repeat(hawk_ids, reviewers))
+    corpus.reviews = reviews.astype(REVIEW_DTYPES)
+    return corpus
@@ -0,0 +1,325 @@
+"""
+Append only log of the reviews left by a reviewer.
+
+A reviewer's reviews are their snapshot, /data/<hawk id>_Reviews.xlsx, followed by the segments
+written since it. Each submit uploads its new reviews as a small CSV segment in the folder of the
+snapshot's generation, so submitting costs the same however many reviews the reviewer has left.
+Once a generation has COMPACT_SEGMENTS segments they are compacted into a new snapshot of the
+next generation, whose segments go in a new folder, so the old segments are never read again.
+The snapshot's first sheet holds the reviews, so it can still be read as a plain review sheet.
+
+Segments another of the reviewer's sessions uploads to the old generation while it is compacted
+are read again once the new snapshot is uploaded, and carried into the new generation, before
+the folders of the old generations are removed.
+"""
+import os
+import time
+import uuid
+import pandas as pd
+from scholarship_app.managers.storage.storage_backend import StorageBackend
+from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.utils.reviews import ReviewIndex
+
+REVIEW_COLUMNS = ["UID", "Scholarship", "Rating", "Additional Feedback"]
+SNAPSHOT_SUFFIX = "_Reviews.xlsx"
+# Sheet of the snapshot holding the generation its segments are written under
+GENERATION_SHEET = "Log"
+LOG_FOLDER = "/data/review_log"
+# Segments written under a generation before they are compacted into a new snapshot
+COMPACT_SEGMENTS = 20
+
+
+def snapshot_path(hawk_id: str) -> str:
+    """
+    Path in the storage of the reviewer's snapshot
+    """
+    return f"/data/{hawk_id}{SNAPSHOT_SUFFIX}"
+
+
+def segment_folder(hawk_id: str, generation: int) -> str:
+    """
+    Folder in the storage of the reviewer's segments written under generation
+    """
+    return f"{LOG_FOLDER}/{hawk_id}/{generation}"
+
+
+def local_path(path: str) -> str:
+    """
+    Path in appdata of the local copy of the file at path in the storage
+    """
+    return os.path.join(get_appdata_path(os.path.dirname(path)), os.path.basename(path))
+
+
+def read_snapshot(path: str) -> tuple[pd.DataFrame, int]:
+    """
+    Reviews and generation of the snapshot at path in appdata. Review sheets written before the
+    log have no generation sheet and are generation 0.
+    """
+    sheets = pd.read_excel(path, sheet_name=None)
+    generation = 0
+    if GENERATION_SHEET in sheets and len(sheets[GENERATION_SHEET]) > 0:
+        generation = int(sheets[GENERATION_SHEET]["Generation"].iloc[0])
+    return next(iter(sheets.values())), generation
+
+
+def list_segments(storage: StorageBackend, folder: str) -> list[str]:
+    """
+    Paths of the segments in folder, oldest first
+
+    Returns
+    -------
+    No segments when the folder does not exist yet
+    """
+    segments, page = [], 0
+    try:
+        while True:
+            listing = storage.list_folder(folder, page=page)
+            segments.extend(file for file in listing.files if file.endswith(".csv"))
+            if not listing.has_more:
+                return sorted(segments)
+            page += 1
+    except FileNotFoundError:
+        return []
+
+
+def list_reviewers(storage: StorageBackend) -> list[str]:
+    """
+    ID of each reviewer with a snapshot in the storage
+    """
+    reviewers, page = [], 0
+    while True:
+        listing = storage.list_folder("/data", SNAPSHOT_SUFFIX, page=page)
+        reviewers.extend(
+            os.path.basename(file)[: -len(SNAPSHOT_SUFFIX)]
+            for file in listing.files
+            if file.endswith(SNAPSHOT_SUFFIX)
+        )
+        if not listing.has_more:
+            return reviewers
+        page += 1
+
+
+class ReviewLog:
+    """
+    Reviews of a reviewer, as their snapshot followed by the segments written since
+
+    Attributes
+    ----------
+    hawk_id : str
+        ID of the reviewer
+    reviews : pd.DataFrame
+        Every review of the reviewer, with a row per review in the order they were left
+    index : ReviewIndex
+        Ratings of the reviews keyed by (UID, Scholarship)
+    generation : int
+        Generation of the snapshot, the folder new segments are written in
+    segments : list[str]
+        Paths in the storage of the segments written since the snapshot
+    """
+
+    def __init__(
+        self,
+        hawk_id: str,
+        reviews: pd.DataFrame,
+        generation: int = 0,
+        segments: list[str] | None = None,
+    ):
+        self.hawk_id = hawk_id
+        self.reviews = reviews
+        self.index = ReviewIndex(reviews)
+        self.generation = generation
+        self.segments = [] if segments is None else segments
+
+    @classmethod
+    def load(
+        cls,
+        storage: StorageBackend,
+        hawk_id: str | None = None,
+        downloaded: bool = False,
+    ) -> "ReviewLog":
+        """
+        Reads the reviewer's snapshot and the segments written since it
+
+        Parameters
+        ----------
+        storage : StorageBackend
+            Storage the log is kept in
+        hawk_id : str, optional
+            ID of the reviewer, the user of storage by default
+        downloaded : bool, optional
+            Whether the snapshot was already downloaded into appdata
+
+        Raises
+        ------
+        FileNotFoundError
+            The reviewer has no snapshot yet
+        """
+        hawk_id = storage.get_hawk_id() if hawk_id is None else hawk_id
+        if not downloaded:
+            storage.download(snapshot_path(hawk_id), "/data/")
+        reviews, generation = read_snapshot(local_path(snapshot_path(hawk_id)))
+
+        folder = segment_folder(hawk_id, generation)
+        segments = list_segments(storage, folder)
+        downloaded_segments = storage.download_many(segments, folder)
+        segments = [segment for segment in segments if downloaded_segments[segment]]
+        if segments:
+            reviews = pd.concat(
+                [reviews] + [pd.read_csv(local_path(segment)) for segment in segments],
+                ignore_index=True,
+            )
+
+        return cls(hawk_id, reviews, generation, segments)
+
+    @classmethod
+    def create(cls, storage: StorageBackend) -> "ReviewLog":
+        """
+        Starts an empty log for the user of storage, uploading their snapshot
+        """
+        review_log = cls(storage.get_hawk_id(), pd.DataFrame(columns=REVIEW_COLUMNS))
+        if not review_log.write_snapshot(storage):
+            raise IOError(f"Unable to upload {snapshot_path(review_log.hawk_id)}")
+        return review_log
+
+    def reviewed(self, uids: list, scholarship: str):
+        """
+        First of uids already reviewed for scholarship
+
+        Returns
+        -------
+        UID of the student, None if none of them were reviewed
+        """
+        return self.index.reviewed(uids, scholarship)
+
+    def append(self, storage: StorageBackend, new_reviews: pd.DataFrame):
+        """
+        Uploads new_reviews as a segment and adds them to the reviews, compacting the log once
+        the generation has COMPACT_SEGMENTS segments. A compaction which fails leaves the log
+        as it was, and is tried again on the next append.
+
+        Raises
+        ------
+        IOError
+            The segment could not be uploaded, the reviews are not added
+        """
+        self._upload_segment(storage, new_reviews)
+        self._add(new_reviews)
+        if len(self.segments) >= COMPACT_SEGMENTS:
+            self.compact(storage)
+
+    def compact(self, storage: StorageBackend) -> bool:
+        """
+        Uploads every review as the snapshot of the next generation, which has no segments, and
+        removes the segment folders of the older generations
+
+        Returns
+        -------
+        Whether the log was compacted, False if the snapshot could not be uploaded, the log then
+        stays on its generation
+
+        Raises
+        ------
+        IOError
+            Segments uploaded to the old generation while compacting could not be carried into
+            the new generation
+        """
+        folder = segment_folder(self.hawk_id, self.generation)
+        self._read_unread_segments(storage, folder)
+        if not self.write_snapshot(storage, self.generation + 1):
+            return False
+
+        # Submits of other sessions which uploaded to the old generation after it was read
+        late = self._read_unread_segments(storage, folder)
+        self.generation += 1
+        self.segments = []
+        if late is not None:
+            self._upload_segment(storage, late)
+
+        self._prune(storage)
+        return True
+
+    def write_snapshot(
+        self, storage: StorageBackend, generation: int | None = None
+    ) -> bool:
+        """
+        Uploads the reviews as the reviewer's snapshot of generation, the log's generation by
+        default
+
+        Returns
+        -------
+        Whether the snapshot was uploaded
+        """
+        generation = self.generation if generation is None else generation
+        path = snapshot_path(self.hawk_id)
+        # pylint: disable-next=abstract-class-instantiated
+        with pd.ExcelWriter(local_path(path)) as writer:
+            self.reviews.to_excel(writer, index=False)
+            pd.DataFrame({"Generation": [generation]}).to_excel(
+                writer, sheet_name=GENERATION_SHEET, index=False
+            )
+        return storage.upload(path, "/data/")
+
+    def _add(self, new_reviews: pd.DataFrame):
+        """
+        Adds new_reviews after the reviews
+        """
+        self.reviews = pd.concat([self.reviews, new_reviews], ignore_index=True)
+        self.index.add(new_reviews)
+
+    def _upload_segment(self, storage: StorageBackend, new_reviews: pd.DataFrame):
+        """
+        Uploads new_reviews as a segment of the log's generation
+
+        Raises
+        ------
+        IOError
+            The segment could not be uploaded
+        """
+        folder = segment_folder(self.hawk_id, self.generation)
+        segment = f"{folder}/{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.csv"
+        new_reviews[REVIEW_COLUMNS].to_csv(local_path(segment), index=False)
+        if not storage.upload(segment, f"{folder}/"):
+            raise IOError(f"Unable to upload the reviews to {segment}")
+
+        self.segments.append(segment)
+
+    def _read_unread_segments(
+        self, storage: StorageBackend, folder: str
+    ) -> pd.DataFrame | None:
+        """
+        Adds the reviews of the segments in folder the log has not read, uploaded by the
+        reviewer's other sessions
+
+        Returns
+        -------
+        The reviews added, None if every segment was already read
+        """
+        read = set(self.segments)
+        segments = [
+            segment for segment in list_segments(storage, folder) if segment not in read
+        ]
+        downloaded = storage.download_many(segments, folder)
+        segments = [segment for segment in segments if downloaded[segment]]
+        if not segments:
+            return None
+
+        unread = pd.concat(
+            [pd.read_csv(local_path(segment)) for segment in segments],
+            ignore_index=True,
+        )
+        self.segments.extend(segments)
+        self._add(unread)
+        return unread
+
+    def _prune(self, storage: StorageBackend):
+        """
+        Removes the segment folders of the generations before the log's
+        """
+        try:
+            folders = storage.list_folder(f"{LOG_FOLDER}/{self.hawk_id}").folders
+        except FileNotFoundError:
+            return
+
+        for folder in folders:
+            if folder.isdigit() and int(folder) < self.generation:
+                storage.delete_folder(segment_folder(self.hawk_id, int(folder)))
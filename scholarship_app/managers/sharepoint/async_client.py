@@ -0,0 +1,417 @@
+"""
+Asyncio client for the sharepoint REST endpoints the app fans out over.
+
+The office365 client sends one request at a time, so listing a folder tree and downloading every
+file in it takes a full round trip per file. AsyncSharepointClient sends these requests
+concurrently over a pooled HTTP session, with at most max_concurrency requests in flight. HTTP is
+done with requests in worker threads, so the client shares authentication with the office365
+client the session signed in with and needs no additional dependencies.
+
+Streamlit pages are synchronous, run_sync() runs a coroutine of the client from them.
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Awaitable, Callable, TypeVar
+from urllib.parse import quote
+import requests
+from requests.adapters import HTTPAdapter
+from office365.runtime.http.request_options import RequestOptions
+from office365.sharepoint.client_context import ClientContext
+from scholarship_app.managers.sharepoint.resilience import (
+    ErrorKind,
+    ResilientExecutor,
+    classify_error,
+)
+
+T = TypeVar("T")
+
+DEFAULT_CONCURRENCY = 8
+# Files larger than this are uploaded in chunks of this size, as SharepointSession.upload does
+UPLOAD_CHUNK_SIZE = 1000000
+DOWNLOAD_BLOCK_SIZE = 65536
+JSON_HEADERS = {"Accept": "application/json;odata=verbose"}
+
+
+def odata_string(value: str) -> str:
+    """
+    Quoted OData string literal of value, for use in a request url
+    """
+    return "'" + quote(value.replace("'", "''"), safe="/'") + "'"
+
+
+def run_sync(coroutine: Awaitable[T]) -> T:
+    """
+    Runs a coroutine to completion from synchronous code and returns its result
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        in_event_loop = False
+    else:
+        in_event_loop = True
+
+    if not in_event_loop:
+        return asyncio.run(coroutine)
+
+    # Already inside an event loop, which can't be blocked on, so use a loop on another thread
+    with ThreadPoolExecutor(1) as pool:
+        return pool.submit(asyncio.run, coroutine).result()
+
+
+# pylint: disable-next=too-many-instance-attributes
+class AsyncSharepointClient:
+    """
+    Concurrent access to the files of a sharepoint site. A client belongs to the event loop it is
+    first used in, close() it (or use it as an async context manager) when done.
+
+    Attributes
+    ----------
+    site_url : str
+        Url of the sharepoint site (with no trailing /)
+    max_concurrency : int
+        Upper bound on requests in flight at once
+    _context : ClientContext
+        Signed in office365 client whose authentication is reused
+    _executor : ResilientExecutor | None
+        Retries requests which fail for a transient reason, None to not retry
+    """
+
+    def __init__(
+        self,
+        context: ClientContext,
+        site_url: str,
+        max_concurrency: int = DEFAULT_CONCURRENCY,
+        executor: ResilientExecutor | None = None,
+    ):
+        self.site_url = site_url.rstrip("/")
+        self.max_concurrency = max_concurrency
+        self._context = context
+        self._executor = executor
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        # Own workers, the default executor is sized by cpu count rather than concurrency
+        self._workers = ThreadPoolExecutor(
+            max_concurrency, thread_name_prefix="sharepoint"
+        )
+        self._lock = threading.Lock()
+        self._authentication = None
+        self._form_digest = None
+
+        self._http = requests.Session()
+        adapter = HTTPAdapter(
+            pool_connections=1, pool_maxsize=max_concurrency, pool_block=True
+        )
+        self._http.mount("https://", adapter)
+        self._http.mount("http://", adapter)
+
+    async def __aenter__(self) -> "AsyncSharepointClient":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the pooled connections
+        """
+        self._workers.shutdown(wait=False)
+        self._http.close()
+
+    async def list_files(self, folder: str, recursive: bool = True) -> list[dict]:
+        """
+        Properties of the files in folder (server relative path). Subfolders are listed
+        concurrently when recursive.
+        """
+        data = await self._json(
+            "GET",
+            f"Web/getFolderByServerRelativePath(decodedurl={odata_string(folder)})"
+            "?$expand=Files,Folders",
+        )
+
+        files = list(data["Files"]["results"])
+        if recursive:
+            nested = await asyncio.gather(
+                *(
+                    self.list_files(subfolder["ServerRelativeUrl"], True)
+                    for subfolder in data["Folders"]["results"]
+                )
+            )
+            for subfolder_files in nested:
+                files.extend(subfolder_files)
+
+        return files
+
+    # pylint: disable-next=too-many-arguments
+    async def list_folder_page(
+        self,
+        folder: str,
+        name_filter: str = "",
+        skip: int = 0,
+        top: int = 100,
+        include_folders: bool = True,
+    ) -> tuple[list[dict], list[dict], bool]:
+        """
+        One page of the files directly inside folder (server relative path), sorted by name and
+        filtered by the server to names containing name_filter. The subfolders are requested
+        alongside when include_folders, they are not paged.
+
+        Returns
+        -------
+        Subfolder properties, file properties and whether there are more files after this page
+        """
+        endpoint = (
+            f"Web/getFolderByServerRelativePath(decodedurl={odata_string(folder)})"
+        )
+        query = "$select=Name,ServerRelativeUrl&$orderby=Name"
+        if name_filter:
+            query += f"&$filter=substringof({odata_string(name_filter)},Name)"
+
+        # One extra file tells whether there is another page
+        requests_sent = [
+            self._json("GET", f"{endpoint}/Files?{query}&$skip={skip}&$top={top + 1}")
+        ]
+        if include_folders:
+            requests_sent.append(self._json("GET", f"{endpoint}/Folders?{query}"))
+
+        results = await asyncio.gather(*requests_sent)
+        files = results[0]["results"]
+        folders = results[1]["results"] if include_folders else []
+
+        return folders, files[:top], len(files) > top
+
+    async def file_exists(self, path: str) -> bool:
+        """
+        Whether a file exists at path (server relative)
+        """
+        try:
+            await self._json("GET", self._file_endpoint(path))
+        except requests.HTTPError as error:
+            if classify_error(error) is ErrorKind.NOT_FOUND:
+                return False
+            raise
+
+        return True
+
+    async def files_exist(self, paths: list[str]) -> dict[str, bool]:
+        """
+        Checks whether each of the paths (server relative) exists
+        """
+        results = await asyncio.gather(*(self.file_exists(path) for path in paths))
+        return dict(zip(paths, results))
+
+    async def file_version(self, path: str) -> str | None:
+        """
+        ETag of the file at path (server relative), None if it does not exist
+        """
+        try:
+            data = await self._json("GET", f"{self._file_endpoint(path)}?$select=ETag")
+        except requests.HTTPError as error:
+            if classify_error(error) is ErrorKind.NOT_FOUND:
+                return None
+            raise
+
+        return data["ETag"]
+
+    async def file_versions(self, paths: list[str]) -> dict[str, str | None]:
+        """
+        ETag of each of the paths (server relative), requested concurrently
+        """
+        results = await asyncio.gather(*(self.file_version(path) for path in paths))
+        return dict(zip(paths, results))
+
+    async def download(self, path: str, local_path: str) -> int:
+        """
+        Downloads the file at path (server relative) to local_path. The file is written next to
+        local_path and moved into place once complete.
+
+        Returns
+        -------
+        Number of bytes downloaded
+
+        Raises
+        ------
+        FileNotFoundError
+            The file does not exist in sharepoint
+        """
+        url = self._url(f"{self._file_endpoint(path)}/$value")
+
+        def download_file() -> int:
+            file_descriptor, partial_path = tempfile.mkstemp(
+                dir=os.path.dirname(local_path) or ".",
+                prefix=f"{os.path.basename(local_path)}.",
+                suffix=".partial",
+            )
+            try:
+                size = 0
+                with os.fdopen(file_descriptor, "wb") as partial_file:
+                    with self._send("GET", url, stream=True) as response:
+                        for block in response.iter_content(DOWNLOAD_BLOCK_SIZE):
+                            partial_file.write(block)
+                            size += len(block)
+                os.replace(partial_path, local_path)
+                return size
+            finally:
+                if os.path.exists(partial_path):
+                    os.remove(partial_path)
+
+        try:
+            return await self._run(download_file)
+        except requests.HTTPError as error:
+            if classify_error(error) is ErrorKind.NOT_FOUND:
+                raise FileNotFoundError(
+                    f"{path} does not exist in sharepoint"
+                ) from error
+            raise
+
+    async def download_many(
+        self, files: list[tuple[str, str]]
+    ) -> list[int | Exception]:
+        """
+        Downloads each (server relative path, local path) pair concurrently
+
+        Returns
+        -------
+        Bytes downloaded for each pair, or the exception its download failed with
+        """
+        return await asyncio.gather(
+            *(self.download(path, local_path) for path, local_path in files),
+            return_exceptions=True,
+        )
+
+    async def upload(self, local_path: str, folder: str) -> str:
+        """
+        Uploads local_path into folder (server relative), replacing any existing file
+
+        Returns
+        -------
+        Server relative url of the uploaded file
+        """
+        name = os.path.basename(local_path)
+        file_path = f"{folder.rstrip('/')}/{name}"
+        add_url = self._url(
+            f"Web/getFolderByServerRelativePath(decodedurl={odata_string(folder)})"
+            f"/Files/add(url={odata_string(name)},overwrite=true)"
+        )
+
+        def upload_file() -> str:
+            size = os.path.getsize(local_path)
+            with open(local_path, "rb") as local_file:
+                if size <= UPLOAD_CHUNK_SIZE:
+                    response = self._send("POST", add_url, data=local_file.read())
+                    return response.json()["d"]["ServerRelativeUrl"]
+
+                # Larger files are created empty and then written with an upload session
+                self._send("POST", add_url, data=b"")
+                file_url = self._url(self._file_endpoint(file_path))
+                upload_id = f"uploadId=guid'{uuid.uuid4()}'"
+                offset = 0
+                while offset < size:
+                    chunk = local_file.read(UPLOAD_CHUNK_SIZE)
+                    if offset == 0:
+                        operation = f"startUpload({upload_id})"
+                    elif offset + len(chunk) < size:
+                        operation = f"continueUpload({upload_id},fileOffset={offset})"
+                    else:
+                        operation = f"finishUpload({upload_id},fileOffset={offset})"
+                    self._send("POST", f"{file_url}/{operation}", data=chunk)
+                    offset += len(chunk)
+
+                return file_path
+
+        return await self._run(upload_file)
+
+    async def upload_many(self, files: list[tuple[str, str]]) -> list[str | Exception]:
+        """
+        Uploads each (local path, server relative folder) pair concurrently
+
+        Returns
+        -------
+        Server relative url of each uploaded file, or the exception its upload failed with
+        """
+        return await asyncio.gather(
+            *(self.upload(local_path, folder) for local_path, folder in files),
+            return_exceptions=True,
+        )
+
+    async def _json(self, method: str, endpoint: str) -> dict:
+        """
+        Sends a request to an endpoint (relative to the site api) and returns its "d" payload
+        """
+        url = self._url(endpoint)
+        response = await self._run(lambda: self._send(method, url))
+        return response.json()["d"]
+
+    async def _run(self, operation: Callable[[], T]) -> T:
+        """
+        Runs a blocking operation on a worker thread once a concurrency slot is free, retrying it
+        when it fails for a transient reason
+        """
+        blocking = operation
+        if self._executor is not None:
+            blocking = partial(self._executor.call, operation)
+
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._workers, blocking
+            )
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Sends an authenticated request, raising for error responses
+        """
+        headers = dict(JSON_HEADERS)
+        headers.update(self._authenticate())
+        if method == "POST":
+            headers["X-RequestDigest"] = self._request_digest()
+
+        response = self._http.request(method, url, headers=headers, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def _authenticate(self) -> dict:
+        """
+        Authentication headers of the office365 client, signing in the first time
+        """
+        with self._lock:
+            if self._authentication is None:
+                options = RequestOptions(self.site_url)
+                self._context.authentication_context.authenticate_request(options)
+                if options.auth is not None:
+                    self._http.auth = options.auth
+                self._authentication = dict(options.headers)
+
+            return self._authentication
+
+    def _request_digest(self) -> str:
+        """
+        Form digest which POST requests need, requested the first time
+        """
+        with self._lock:
+            digest = self._form_digest
+
+        if digest is None:
+            headers = dict(JSON_HEADERS)
+            headers.update(self._authenticate())
+            response = self._http.post(self._url("contextinfo"), headers=headers)
+            response.raise_for_status()
+            digest = response.json()["d"]["GetContextWebInformation"]["FormDigestValue"]
+            with self._lock:
+                self._form_digest = digest
+
+        return digest
+
+    def _file_endpoint(self, path: str) -> str:
+        """
+        Endpoint of the file at path (server relative)
+        """
+        return f"Web/getFileByServerRelativePath(decodedurl={odata_string(path)})"
+
+    def _url(self, endpoint: str) -> str:
+        """
+        Full url of an endpoint relative to the site api
+        """
+        return f"{self.site_url}/_api/{endpoint}"
@@ -1,5 +1,5 @@
 """
-File management with sharepoint utilities
+File management with storage backend utilities
 
 General file structure is as follows
 /sharepoint_root/data_type_path/master
@@ -10,7 +10,7 @@ Then all user unique files are stored in:
 from enum import Enum
 import os
 import pandas as pd
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.managers.storage.storage_backend import StorageBackend
 from scholarship_app.sessions.session_manager import SessionManager
 from streamlit.runtime.state import SessionStateProxy
 from scholarship_app.utils.output import get_appdata_path
@@ -20,7 +20,7 @@ SHAREPOINT_ROOT = "scholarship_application"
 
 class DataType(Enum):
     """
-    list of potential files we save in sharepoint
+    list of potential files we save in storage
     """
 
     MAIN = "main"
@@ -46,8 +46,8 @@ class DataManager(SessionManager):
     ----------
     data_type : DataType
         Data type this data manager is storing
-    sharepoint : SharepointSession
-        Reference to the active sharepoint session
+    storage : StorageBackend
+        Reference to the active storage backend
 
     """
 
@@ -55,23 +55,23 @@ class DataManager(SessionManager):
         self,
         session: SessionStateProxy,
         data_type: DataType,
-        sharepoint: SharepointSession,
+        storage: StorageBackend,
     ):
         super().__init__(session, f"data_{data_type.name}", "default")
 
         self.data_type = data_type
-        self.sharepoint = sharepoint
+        self.storage = storage
         self.relative_path = os.path.join(SHAREPOINT_ROOT, data_type.value)
         # makes the directory
         get_appdata_path(self.relative_path)
 
         self.master_path = os.path.join(self.relative_path, "master.xlsx")
-        self.user_path = os.path.join(self.relative_path, self.sharepoint.get_hawk_id())
+        self.user_path = os.path.join(self.relative_path, self.storage.get_hawk_id())
         # makes the directory
         get_appdata_path(self.user_path)
 
         self.user_copy_path = os.path.join(
-            self.user_path, f"{self.sharepoint.get_hawk_id()}/copy.xlsx"
+            self.user_path, f"{self.storage.get_hawk_id()}/copy.xlsx"
         )
 
     def retrieve_master(self) -> pd.DataFrame | None:
@@ -87,8 +87,8 @@ class DataManager(SessionManager):
 
             return data
 
-        if self.__in_sharepoint(self.master_path):
-            self.sharepoint.download(self.master_path, self.relative_path)
+        if self.__in_storage(self.master_path):
+            self.storage.download(self.master_path, self.relative_path)
 
             data = self.retrieve_appdata_file(self.master_path)
             self.set(Session.MASTER, data)
@@ -99,13 +99,13 @@ class DataManager(SessionManager):
 
     def set_master(self, data: pd.DataFrame):
         """
-        Updates the master data in appdata, sharepoint and session. Will overwrite previous version
+        Updates the master data in appdata, storage and session. Will overwrite previous version
         if it exists.
         """
         app_data_dir = os.path.join(get_appdata_path(), self.master_path)
         data.to_excel(app_data_dir, index=False)
 
-        self.sharepoint.upload(self.master_path, self.relative_path)
+        self.storage.upload(self.master_path, self.relative_path)
         self.set(Session.MASTER, data)
 
     def retrieve_appdata_file(self, path: str) -> pd.DataFrame:
@@ -125,8 +125,8 @@ class DataManager(SessionManager):
         appdata_relative_path = os.path.join(get_appdata_path(), path)
         return os.path.exists(appdata_relative_path)
 
-    def __in_sharepoint(self, path: str) -> bool:
+    def __in_storage(self, path: str) -> bool:
         """
-        Checks if path is in sharepoint
+        Checks if path is in storage
         """
-        return self.sharepoint.has_file(path)
+        return self.storage.has_file(path)
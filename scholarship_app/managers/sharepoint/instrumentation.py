@@ -0,0 +1,308 @@
+"""
+Timing of sharepoint operations.
+
+Every SharepointSession operation that talks to sharepoint is measured: how long it took, how
+many bytes were transferred (downloads and uploads) and how it ended. Measurements are kept
+in-process as per-operation latency histograms, shown on the diagnostics page, and each one is
+appended as a line of JSON to a file under .app_data/metrics for offline analysis.
+"""
+import json
+import math
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from typing import Iterator
+from scholarship_app.managers.sharepoint.resilience import (
+    ErrorKind,
+    SharepointUnavailableError,
+    classify_error,
+)
+from scholarship_app.utils.output import get_appdata_path
+
+METRICS_DIRECTORY = "metrics"
+# Upper bounds (milliseconds) of the latency histogram buckets, the last bucket is unbounded
+LATENCY_BUCKETS_MS = (
+    10,
+    25,
+    50,
+    100,
+    250,
+    500,
+    1000,
+    2500,
+    5000,
+    10000,
+    30000,
+    math.inf,
+)
+
+
+class Outcome(Enum):
+    """
+    How a measured operation ended
+    """
+
+    OK = "ok"
+    # The operation completed but reported failure (e.g. verification rejected)
+    FAILED = "failed"
+    NOT_FOUND = "not_found"
+    AUTH = "auth"
+    UNAVAILABLE = "unavailable"
+    ERROR = "error"
+
+
+def outcome_of(error: Exception) -> Outcome:
+    """
+    Outcome of an operation which raised error
+    """
+    if isinstance(error, SharepointUnavailableError):
+        return Outcome.UNAVAILABLE
+    if isinstance(error, FileNotFoundError):
+        return Outcome.NOT_FOUND
+
+    kind = classify_error(error)
+    if kind is ErrorKind.NOT_FOUND:
+        return Outcome.NOT_FOUND
+    if kind is ErrorKind.AUTH:
+        return Outcome.AUTH
+    if kind is ErrorKind.TRANSIENT:
+        return Outcome.UNAVAILABLE
+
+    return Outcome.ERROR
+
+
+@dataclass
+class Measurement:
+    """
+    A single measured operation
+
+    Attributes
+    ----------
+    operation : str
+        Name of the operation (download, upload, ...)
+    started_at : float
+        Unix time the operation started
+    duration_ms : float
+        Wall clock duration in milliseconds
+    outcome : Outcome
+        How the operation ended
+    bytes : int
+        Bytes downloaded or uploaded, 0 for metadata operations
+    items : int
+        Number of items the operation handled (files listed, paths checked, ...)
+    """
+
+    operation: str
+    started_at: float = 0.0
+    duration_ms: float = 0.0
+    outcome: Outcome = Outcome.OK
+    bytes: int = 0
+    items: int = 0
+
+
+@dataclass
+class LatencyHistogram:
+    """
+    Aggregated measurements of one operation
+
+    Attributes
+    ----------
+    buckets : list[int]
+        Count of measurements per LATENCY_BUCKETS_MS bucket
+    outcomes : dict[str, int]
+        Count of measurements per outcome
+    """
+
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    bytes: int = 0
+    items: int = 0
+    buckets: list[int] = field(default_factory=lambda: [0] * len(LATENCY_BUCKETS_MS))
+    outcomes: dict[str, int] = field(default_factory=dict)
+
+    def add(self, measurement: Measurement):
+        """
+        Adds a measurement to the histogram
+        """
+        self.count += 1
+        self.total_ms += measurement.duration_ms
+        self.max_ms = max(self.max_ms, measurement.duration_ms)
+        self.bytes += measurement.bytes
+        self.items += measurement.items
+        outcome = measurement.outcome.value
+        self.outcomes[outcome] = self.outcomes.get(outcome, 0) + 1
+
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            if measurement.duration_ms <= bound:
+                self.buckets[index] += 1
+                break
+
+    def percentile(self, percent: float) -> float:
+        """
+        Estimated latency (ms) percent of measurements completed within. Reported as the upper
+        bound of the bucket the percentile falls in, or the maximum seen for the last bucket.
+        """
+        if self.count == 0:
+            return 0.0
+
+        rank = math.ceil(self.count * percent / 100)
+        seen = 0
+        for index, bound in enumerate(LATENCY_BUCKETS_MS):
+            seen += self.buckets[index]
+            if seen >= rank:
+                return min(bound, self.max_ms)
+
+        return self.max_ms
+
+    def summary(self) -> dict:
+        """
+        Summary statistics of the histogram
+        """
+        return {
+            "count": self.count,
+            "mean_ms": self.total_ms / self.count if self.count else 0.0,
+            "p50_ms": self.percentile(50),
+            "p90_ms": self.percentile(90),
+            "p99_ms": self.percentile(99),
+            "max_ms": self.max_ms,
+            "bytes": self.bytes,
+            "items": self.items,
+            "outcomes": dict(self.outcomes),
+        }
+
+
+class MetricsRegistry:
+    """
+    Collects measurements from every session of the server process.
+
+    Attributes
+    ----------
+    metrics_path : str | None
+        JSONL file each measurement is appended to, None to only aggregate in memory
+    """
+
+    def __init__(self, metrics_path: str | None = None):
+        self.metrics_path = metrics_path
+        self._lock = threading.Lock()
+        self._histograms: dict[str, LatencyHistogram] = {}
+
+    @contextmanager
+    def measure(self, operation: str) -> Iterator[Measurement]:
+        """
+        Measures the operation run inside the with block. The yielded measurement can be given
+        the bytes and items handled, and its outcome when the operation fails without raising.
+        """
+        measurement = Measurement(operation, time.time())
+        start = time.perf_counter()
+        try:
+            yield measurement
+        except Exception as error:
+            measurement.outcome = outcome_of(error)
+            raise
+        finally:
+            measurement.duration_ms = (time.perf_counter() - start) * 1000
+            self.record(measurement)
+
+    def record(self, measurement: Measurement):
+        """
+        Adds a measurement to its operation's histogram and the metrics file
+        """
+        with self._lock:
+            if measurement.operation not in self._histograms:
+                self._histograms[measurement.operation] = LatencyHistogram()
+            self._histograms[measurement.operation].add(measurement)
+
+            self._write(
+                {
+                    "type": "measurement",
+                    **asdict(measurement),
+                    "outcome": measurement.outcome.value,
+                }
+            )
+
+    def histograms(self) -> dict[str, LatencyHistogram]:
+        """
+        Copy of the histogram of each operation measured so far
+        """
+        with self._lock:
+            return {
+                operation: LatencyHistogram(**asdict(histogram))
+                for operation, histogram in self._histograms.items()
+            }
+
+    def summaries(self) -> dict[str, dict]:
+        """
+        Summary statistics of each operation measured so far
+        """
+        return {
+            operation: histogram.summary()
+            for operation, histogram in self.histograms().items()
+        }
+
+    def dump(self):
+        """
+        Appends the current histograms to the metrics file
+        """
+        histograms = self.histograms()
+        with self._lock:
+            self._write(
+                {
+                    "type": "histograms",
+                    "at": time.time(),
+                    "bucket_bounds_ms": [str(b) for b in LATENCY_BUCKETS_MS],
+                    "operations": {
+                        operation: {
+                            **histogram.summary(),
+                            "buckets": histogram.buckets,
+                        }
+                        for operation, histogram in histograms.items()
+                    },
+                }
+            )
+
+    def reset(self):
+        """
+        Discards all measurements aggregated so far (the metrics file is left as is)
+        """
+        with self._lock:
+            self._histograms = {}
+
+    def _write(self, line: dict):
+        """
+        Appends a line to the metrics file. Must hold the lock.
+        """
+        if self.metrics_path is None:
+            return
+
+        try:
+            with open(self.metrics_path, "a", encoding="utf-8") as metrics_file:
+                metrics_file.write(json.dumps(line) + "\n")
+        except OSError:
+            # Metrics are best effort, they must never fail the operation being measured
+            pass
+
+
+def default_metrics_path() -> str:
+    """
+    Metrics file in appdata
+    """
+    return os.path.join(get_appdata_path(METRICS_DIRECTORY), "sharepoint.jsonl")
+
+
+_METRICS: MetricsRegistry | None = None
+_METRICS_LOCK = threading.Lock()
+
+
+def get_metrics() -> MetricsRegistry:
+    """
+    Returns the metrics registry shared by every session of the server process
+    """
+    global _METRICS  # pylint: disable=global-statement
+    with _METRICS_LOCK:
+        if _METRICS is None:
+            _METRICS = MetricsRegistry(default_metrics_path())
+        return _METRICS
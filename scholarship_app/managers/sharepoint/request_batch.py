@@ -0,0 +1,195 @@
+"""
+Batching of sharepoint metadata requests.
+
+Every execute_query() call on the office365 client is its own HTTP round trip. Metadata operations
+(verifying the web, probing for files, ensuring folders exist) don't depend on each other so they can
+be queued up and submitted together as a single OData $batch request.
+"""
+from dataclasses import dataclass
+from typing import Callable
+from office365.runtime.client_request_exception import ClientRequestException
+from office365.runtime.odata.request import ODataRequest
+from office365.runtime.odata.v3.batch_request import ODataBatchV3Request
+from office365.runtime.odata.v3.json_light_format import JsonLightFormat
+from office365.sharepoint.client_context import ClientContext
+from office365.sharepoint.webs.web import Web
+from scholarship_app.managers.sharepoint.resilience import ResilientExecutor
+
+# Upper bound on the number of queries submitted in a single $batch request
+MAX_BATCH_SIZE = 100
+# Status codes which mean a probed file is missing rather than the request failing
+MISSING_STATUS_CODES = (404,)
+
+
+def supports_batching(client: ClientContext) -> bool:
+    """
+    Whether the installed office365 client is able to submit $batch requests
+    """
+    return callable(getattr(client, "execute_batch", None))
+
+
+def is_missing_error(error: ClientRequestException) -> bool:
+    """
+    Whether a failed request failed because the resource it referenced does not exist
+    """
+    response = getattr(error, "response", None)
+    return response is not None and response.status_code in MISSING_STATUS_CODES
+
+
+@dataclass
+class FileProbe:
+    """
+    Result of a queued file existence check. Only valid once the owning batch has executed.
+
+    Attributes
+    ----------
+    path : str
+        Server relative path that was probed
+    exists : bool | None
+        Whether the file exists, None until the batch has executed
+    """
+
+    path: str
+    exists: bool | None = None
+
+
+class _ProbeBatchRequest(ODataBatchV3Request):
+    """
+    Batch request which does not abort the remaining sub responses when a file probe comes back
+    as missing. Any other failed sub response raises as it would with ClientContext.execute_batch()
+    """
+
+    def __init__(self, probes: dict[int, FileProbe]):
+        super().__init__(JsonLightFormat())
+        self._probes = probes
+
+    def process_response(self, response, query):
+        for sub_qry, sub_resp in self._extract_response(response, query):
+            probe = self._probes.get(id(sub_qry.return_type))
+            if probe is not None:
+                probe.exists = sub_resp.status_code not in MISSING_STATUS_CODES
+                if not probe.exists:
+                    continue
+
+            sub_resp.raise_for_status()
+            ODataRequest.process_response(self, sub_resp, sub_qry)
+
+
+class RequestBatch:
+    """
+    Queues metadata operations against a sharepoint client and submits them together.
+
+    Operations are queued with load_web(), probe_file() and ensure_folder_path(). Nothing is sent
+    until execute() is called, at which point every queued operation goes out in one $batch request
+    when the client supports it, otherwise one request at a time in the order they were queued.
+
+    Attributes
+    ----------
+    _client : ClientContext
+        Client the operations are queued against
+    _executor : ResilientExecutor | None
+        Retries the whole batch when it fails for a transient reason, None to not retry
+    _operations : list[tuple[Callable[[], any], FileProbe | None]]
+        Callables which add an operation's queries to the client, paired with the probe the
+        operation resolves (if any).
+    """
+
+    def __init__(self, client: ClientContext, executor: ResilientExecutor = None):
+        self._client = client
+        self._executor = executor
+        self._operations = []
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def load_web(self) -> Web:
+        """
+        Queues a request for the client web. The returned web is loaded once the batch executes.
+        """
+        web = self._client.web
+        self._operations.append((web.get, None))
+        return web
+
+    def probe_file(self, server_relative_path: str) -> FileProbe:
+        """
+        Queues an existence check for the file at server_relative_path
+        """
+        file = self._client.web.get_file_by_server_relative_path(server_relative_path)
+        probe = FileProbe(server_relative_path)
+        self._operations.append((file.get, probe))
+        return probe
+
+    def ensure_folder_path(self, path: str):
+        """
+        Queues the creation of each folder along path (relative to the web root folder) which
+        doesn't already exist.
+        """
+        self._operations.append(
+            (lambda: self._client.web.ensure_folder_path(path), None)
+        )
+
+    def execute(self):
+        """
+        Submits all queued operations and clears the queue.
+        """
+        operations, self._operations = self._operations, []
+        if len(operations) == 0:
+            return
+
+        # A batch is sent as a POST which needs a form digest request the first time, so a lone
+        # operation is cheaper to send on its own
+        if len(operations) > 1 and supports_batching(self._client):
+            submit = lambda: self._execute_batched(operations)
+        else:
+            submit = lambda: self._execute_serial(operations)
+
+        if self._executor is None:
+            submit()
+        else:
+            # Every operation is queued again on each attempt
+            self._executor.call(submit, self._client.clear)
+
+    def _execute_batched(self, operations: list[tuple[Callable, FileProbe | None]]):
+        """
+        Submits the operations as $batch requests of at most MAX_BATCH_SIZE queries
+        """
+        probes = {}
+        for queue_operation, probe in operations:
+            return_type = queue_operation()
+            if probe is not None:
+                probes[id(return_type)] = probe
+
+        request = _ProbeBatchRequest(probes)
+        # Same request pipeline the client uses for its own execute_batch()
+        # pylint: disable=protected-access
+        request.beforeExecute += self._client._authenticate_request
+        request.beforeExecute += self._client._ensure_form_digest
+        try:
+            while self._client.has_pending_request:
+                request.execute_query(self._client._get_next_query(MAX_BATCH_SIZE))
+        finally:
+            self._client.clear()
+        # pylint: enable=protected-access
+
+    def _execute_serial(self, operations: list[tuple[Callable, FileProbe | None]]):
+        """
+        Submits each operation as its own request
+        """
+        for queue_operation, probe in operations:
+            queue_operation()
+            try:
+                self._client.execute_query()
+            except Exception as error:
+                self._client.clear()
+                if (
+                    probe is None
+                    or not isinstance(error, ClientRequestException)
+                    or not is_missing_error(error)
+                ):
+                    raise
+
+                probe.exists = False
+                continue
+
+            if probe is not None:
+                probe.exists = True
@@ -0,0 +1,320 @@
+"""
+Retries and circuit breaking for sharepoint requests.
+
+Sharepoint throttles heavy use (429) and has the occasional outage (503). Requests which fail
+for a transient reason are retried with exponential backoff, waiting at least as long as the
+server asks through Retry-After. When a site keeps failing the circuit breaker opens and
+requests fail immediately until it has had time to recover, rather than every page load
+waiting through the full backoff.
+"""
+import random
+import threading
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from enum import Enum
+from typing import Callable, TypeVar
+from requests import RequestException
+from requests.exceptions import ConnectionError as RequestsConnectionError, Timeout
+
+T = TypeVar("T")
+
+TRANSIENT_STATUS_CODES = (408, 429, 500, 502, 503, 504)
+NOT_FOUND_STATUS_CODES = (404,)
+AUTH_STATUS_CODES = (401, 403)
+
+
+class ErrorKind(Enum):
+    """
+    Classification of a failed sharepoint request
+    """
+
+    TRANSIENT = "transient"
+    NOT_FOUND = "not_found"
+    AUTH = "auth"
+    PERMANENT = "permanent"
+
+
+class SharepointUnavailableError(RuntimeError):
+    """
+    Sharepoint could not be reached after retrying, or the circuit breaker is open
+    """
+
+
+def status_code(error: Exception) -> int | None:
+    """
+    Status code of the response a request failed with, None if there was no response
+    """
+    response = getattr(error, "response", None)
+    if response is None:
+        return None
+
+    return response.status_code
+
+
+def classify_error(error: Exception) -> ErrorKind:
+    """
+    Classifies why a sharepoint request failed
+    """
+    if isinstance(error, (RequestsConnectionError, Timeout)):
+        return ErrorKind.TRANSIENT
+
+    code = status_code(error)
+    if not isinstance(error, RequestException) or code is None:
+        return ErrorKind.PERMANENT
+    if code in TRANSIENT_STATUS_CODES:
+        return ErrorKind.TRANSIENT
+    if code in NOT_FOUND_STATUS_CODES:
+        return ErrorKind.NOT_FOUND
+    if code in AUTH_STATUS_CODES:
+        return ErrorKind.AUTH
+
+    return ErrorKind.PERMANENT
+
+
+def retry_after_seconds(error: Exception) -> float | None:
+    """
+    Seconds the server asked to wait before retrying (Retry-After header), if any
+    """
+    response = getattr(error, "response", None)
+    if response is None or response.headers is None:
+        return None
+
+    value = response.headers.get("Retry-After")
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+@dataclass
+class RetryPolicy:
+    """
+    How failed requests are retried
+
+    Attributes
+    ----------
+    max_attempts : int
+        Attempts made before giving up, including the first
+    base_delay : float
+        Seconds waited before the first retry, doubled for each following retry
+    max_delay : float
+        Upper bound on the backoff delay in seconds
+    max_retry_after : float
+        Longest Retry-After (seconds) that is waited out, longer waits give up instead
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 0.5
+    max_delay: float = 16.0
+    max_retry_after: float = 60.0
+
+    def delay(self, attempt: int, error: Exception, rng: random.Random) -> float | None:
+        """
+        Seconds to wait before retrying after the attempt (starting at 1) failed with error.
+        None if the request should not be retried.
+        """
+        if attempt >= self.max_attempts:
+            return None
+
+        # Full jitter spreads out retries from sessions which were throttled together
+        backoff = rng.uniform(
+            0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1))
+        )
+
+        retry_after = retry_after_seconds(error)
+        if retry_after is None:
+            return backoff
+        if retry_after > self.max_retry_after:
+            return None
+
+        return max(retry_after, backoff)
+
+
+class CircuitState(Enum):
+    """
+    States of the circuit breaker
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a site which keeps failing. After failure_threshold consecutive
+    transient failures the circuit opens and requests fail immediately. Once reset_timeout has
+    passed a single trial request is let through, closing the circuit again if it succeeds.
+
+    Attributes
+    ----------
+    failure_threshold : int
+        Consecutive transient failures which open the circuit
+    reset_timeout : float
+        Seconds the circuit stays open before a trial request is allowed
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._state = CircuitState.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+
+    @property
+    def state(self) -> CircuitState:
+        """
+        Current state of the circuit
+        """
+        with self._lock:
+            return self._state
+
+    def allow(self) -> bool:
+        """
+        Whether a request may be sent now
+        """
+        with self._lock:
+            if self._state is CircuitState.CLOSED:
+                return True
+            if self._state is CircuitState.HALF_OPEN:
+                # A trial request is already in flight
+                return False
+            if self._clock() - self._opened_at < self.reset_timeout:
+                return False
+
+            self._state = CircuitState.HALF_OPEN
+            return True
+
+    def record_success(self):
+        """
+        Records a request which reached the site, closing the circuit
+        """
+        with self._lock:
+            self._state = CircuitState.CLOSED
+            self._failures = 0
+
+    def release(self):
+        """
+        Gives back a trial request which never reached the site, without counting it as a
+        success or failure. The next request is let through as the trial instead.
+        """
+        with self._lock:
+            if self._state is CircuitState.HALF_OPEN:
+                self._state = CircuitState.OPEN
+
+    def record_failure(self):
+        """
+        Records a transient failure, opening the circuit once the threshold is reached
+        """
+        with self._lock:
+            self._failures += 1
+            if (
+                self._state is CircuitState.HALF_OPEN
+                or self._failures >= self.failure_threshold
+            ):
+                self._state = CircuitState.OPEN
+                self._opened_at = self._clock()
+
+
+_BREAKERS: dict[str, CircuitBreaker] = {}
+_BREAKERS_LOCK = threading.Lock()
+
+
+def get_circuit_breaker(site_url: str) -> CircuitBreaker:
+    """
+    Returns the circuit breaker for a site, shared by every session of the server process
+    """
+    with _BREAKERS_LOCK:
+        if site_url not in _BREAKERS:
+            _BREAKERS[site_url] = CircuitBreaker()
+        return _BREAKERS[site_url]
+
+
+class ResilientExecutor:
+    """
+    Runs sharepoint operations with retries and circuit breaking.
+
+    Attributes
+    ----------
+    policy : RetryPolicy
+        How failed requests are retried
+    breaker : CircuitBreaker
+        Circuit breaker of the site the requests are sent to
+    """
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        breaker: CircuitBreaker,
+        sleep: Callable[[float], None] = time.sleep,
+        rng: random.Random | None = None,
+    ):
+        self.policy = policy
+        self.breaker = breaker
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+    def call(self, operation: Callable[[], T], reset: Callable[[], any] = None) -> T:
+        """
+        Runs operation, retrying it while it fails for a transient reason. operation must queue
+        and execute its own queries since a failed query is not resent, reset is called after
+        every failure to discard anything left queued.
+
+        Raises
+        ------
+        SharepointUnavailableError
+            The circuit is open, or the operation still failed after retrying
+        """
+        attempt = 0
+        while True:
+            attempt += 1
+            if not self.breaker.allow():
+                raise SharepointUnavailableError(
+                    "Sharepoint is unavailable, requests are paused after repeated failures"
+                )
+
+            try:
+                result = operation()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if reset is not None:
+                    reset()
+
+                if classify_error(error) is not ErrorKind.TRANSIENT:
+                    if isinstance(error, RequestException) and status_code(error):
+                        # The site answered, it just didn't like the request
+                        self.breaker.record_success()
+                    else:
+                        # Failed before reaching the site, says nothing about its health
+                        self.breaker.release()
+                    raise
+
+                self.breaker.record_failure()
+                delay = self.policy.delay(attempt, error, self._rng)
+                if delay is None:
+                    raise SharepointUnavailableError(
+                        f"Sharepoint request failed after {attempt} attempt(s)"
+                    ) from error
+
+                self._sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            return result
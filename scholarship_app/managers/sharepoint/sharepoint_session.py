@@ -2,29 +2,142 @@
 Objects for importing the sharepoint user session and interfacing with sharepoint.
 """
 from enum import Enum
+import base64
+import copy
 import json
 import os
-import time
+import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlparse
 import extra_streamlit_components as stx
+import streamlit as st
+from extra_streamlit_components.CookieManager import (
+    _component_func as cookie_component,
+)
 from streamlit.runtime.state import SessionStateProxy
+from requests import RequestException
+from office365.runtime.auth.token_response import TokenResponse
 from office365.runtime.auth.user_credential import UserCredential
 from office365.sharepoint.client_context import ClientContext
 from scholarship_app.managers.config import ConfigManager
+from scholarship_app.managers.sharepoint.async_client import (
+    AsyncSharepointClient,
+    run_sync,
+)
+from scholarship_app.managers.sharepoint.instrumentation import Outcome, get_metrics
+from scholarship_app.managers.sharepoint.request_batch import RequestBatch
+from scholarship_app.managers.sharepoint.resilience import (
+    ErrorKind,
+    ResilientExecutor,
+    RetryPolicy,
+    SharepointUnavailableError,
+    classify_error,
+    get_circuit_breaker,
+)
+from scholarship_app.managers.storage.storage_backend import (
+    FolderListing,
+    LISTING_PAGE_SIZE,
+    StorageBackend,
+    VALID_EXTENSIONS,
+)
 from scholarship_app.utils.html import redirect
 from scholarship_app.sessions.session_manager import SessionManager
 from scholarship_app.utils.output import get_appdata_path
 
 COOKIE_CREDENTIALS_KEY = "sharepoint-auth"
-VALID_EXTENSIONS = (".xls", ".xlsx", ".csv")
+COOKIE_LIFETIME = timedelta(days=1)
 SHAREPOINT_CONFIG_KEY = "sharepoint_url"
+# Folder sharepoint keeps document library forms in, hidden from folder listings
+FORMS_FOLDER = "Forms"
+# When true the sharepoint url points at the local stand-in server (tests/stand_in)
+STAND_IN_CONFIG_KEY = "sharepoint_stand_in"
+RETRY_POLICY = RetryPolicy()
+
+
+class CookieManager(stx.CookieManager):
+    """
+    Cookie manager which reports whether the browser has answered yet. The component renders
+    with a default value until the browser sends its reply, which then reruns the script. Using
+    None as the default tells "no cookies" apart from "cookies not received yet", so nothing has
+    to sleep waiting for them.
+    """
+
+    # pylint: disable-next=super-init-not-called
+    def __init__(self, key: str):
+        self.cookie_manager = cookie_component
+        self.cookies = self.cookie_manager(method="getAll", key=key, default=None)
+
+    def loaded(self) -> bool:
+        """
+        Whether the browser has sent its cookies
+        """
+        return self.cookies is not None
+
+    def get(self, cookie: str):
+        return self.cookies.get(cookie) if self.loaded() else None
+
+    def save(self, cookie: str, val, expires_at: datetime) -> bool:
+        """
+        Sets a cookie in the browser
+
+        Returns
+        -------
+        Whether the browser has confirmed the cookie was set, the confirmation reruns the script
+        """
+        saved = self.cookie_manager(
+            method="set",
+            cookie=cookie,
+            value=val,
+            expires_at=expires_at.isoformat(),
+            key="set",
+            default=False,
+        )
+        if saved and self.loaded():
+            self.cookies[cookie] = val
+
+        return bool(saved)
+
+    def delete(self, cookie, key="delete"):
+        deleted = self.cookie_manager(
+            method="delete", cookie=cookie, key=key, default=False
+        )
+        if deleted and self.loaded():
+            self.cookies.pop(cookie, None)
 
 
 def get_cookie_manager():
     """
     Returns (and attempts to cache) cookie manage object
     """
-    return stx.CookieManager("sharepoint-cookies")
+    return CookieManager("sharepoint-cookies")
+
+
+def stand_in_token(hawk_id: str, password: str) -> str:
+    """
+    Access token the local sharepoint stand-in accepts in place of sharepoint's SAML sign in
+    """
+    return base64.b64encode(f"{hawk_id}:{password}".encode("utf-8")).decode("ascii")
+
+
+def create_client(
+    sharepoint_url: str, hawk_id: str, password: str, stand_in: bool = False
+) -> ClientContext:
+    """
+    Creates the sharepoint client for the user credentials. No request is sent until the client
+    is used.
+
+    Parameters
+    ----------
+    stand_in : bool
+        Whether sharepoint_url is a local stand-in server rather than the real sharepoint site
+    """
+    client = ClientContext(sharepoint_url.strip("/"))
+    if stand_in:
+        token = stand_in_token(hawk_id, password)
+        return client.with_access_token(lambda: TokenResponse(token, "Bearer"))
+
+    return client.with_credentials(UserCredential(hawk_id, password))
 
 
 class Session(Enum):
@@ -35,11 +148,16 @@ class Session(Enum):
     CREDENTIALS = "creds"
     REDIRECT_AFTER_SYNC = "redirect"
     SHAREPOINT_URL = "sharepoint_url"
+    STAND_IN = "stand_in"
+    RESTORED = "restored"
+    COOKIE_SAVED = "cookie_saved"
+    COOKIE_EXPIRES = "cookie_expires"
 
 
-class SharepointSession(SessionManager):
+class SharepointSession(SessionManager, StorageBackend):
     """
     This class handles statefullness of the streamlit session. If a user is signed in, etc.
+    Files are stored in the document library of the configured sharepoint site.
 
     Attributes
     ----------
@@ -50,7 +168,8 @@ class SharepointSession(SessionManager):
     verified : bool
         Whether the client has already been verified with sharepoint
     sync_complete : bool
-        Whether the session/cookie sync has been completed
+        Whether the session/cookie sync has been completed. False only until the browser has sent
+        its cookies on the first run of a browser session.
     _cookie_manager : CookieManager
         Returns cookie manager object from streamlit extras
     """
@@ -64,10 +183,14 @@ class SharepointSession(SessionManager):
             self.sharepoint_url = self.retrieve_sharepoint_url()
             self.set(Session.SHAREPOINT_URL, self.sharepoint_url)
 
+        if not self.has(Session.STAND_IN):
+            self.set(Session.STAND_IN, self.retrieve_stand_in())
+
         self._cookie_manager = get_cookie_manager()
         self.verified = False
         self.hawk_id = None
         self._root_folder = "Shared Documents"
+        self.sync_complete = False
 
         # This manages saving session date to cookie and cookie to session date
         # Cookie manipulation can only be done at streamlit session start which is why it is
@@ -89,12 +212,28 @@ class SharepointSession(SessionManager):
 
         return None
 
+    def retrieve_stand_in(self) -> bool:
+        """
+        Gets whether the configured sharepoint URL is the local stand-in server
+        """
+        config = ConfigManager()
+        if config.has_key(STAND_IN_CONFIG_KEY):
+            return bool(config.data[STAND_IN_CONFIG_KEY])
+
+        return False
+
     def get_hawk_id(self) -> str | None:
         """
         Returns hawk ID if one is defined
         """
         return self.hawk_id
 
+    def get_location(self) -> str:
+        """
+        Returns the configured sharepoint site URL
+        """
+        return self.sharepoint_url
+
     def is_signed_in(self) -> bool:
         """
         Returns if user is signed in
@@ -103,16 +242,25 @@ class SharepointSession(SessionManager):
         -------
             True if user signed in to sharepoint
         """
-        self._wait_for_sync_complete()
+        if not self.sync_complete:
+            # Unknown until the browser sends its cookies. Receiving them reruns the script, so
+            # stop here rather than redirecting a user who is actually signed in.
+            st.stop()
+
         return self._client is not None
 
     def logout(self):
         """
-        Log the user out of the current session and remove cookie
+        Log the user out of the current session and remove cookie. The browser confirming the
+        cookie was removed reruns the script.
         """
         self._unset(Session.CREDENTIALS)
+        self._unset(Session.COOKIE_SAVED)
+        self._unset(Session.COOKIE_EXPIRES)
+        self._client = None
+        self.hawk_id = None
+        self.verified = False
         self._cookie_manager.delete(COOKIE_CREDENTIALS_KEY)
-        time.sleep(0.5)
 
     def login(self, hawk_id: str, password: str) -> bool:
         """
@@ -121,15 +269,24 @@ class SharepointSession(SessionManager):
         Returns
         -------
             True for success, false for failure.
+
+        Raises
+        ------
+        SharepointUnavailableError
+            Sharepoint could not be reached, the credentials were not checked
         """
-        self._client = ClientContext(self.sharepoint_url.strip("/")).with_credentials(
-            UserCredential(hawk_id, password)
+        self._client = create_client(
+            self.sharepoint_url, hawk_id, password, self.retrieve(Session.STAND_IN)
         )
 
         # Verify the client was properly configured with test request
         try:
             result = self._verify()
-        except:
+        except SharepointUnavailableError:
+            self._client = None
+            raise
+        except (RequestException, ValueError, IndexError):
+            # Sign in rejected the credentials, or the site url is wrong
             self._client = None
             return False
 
@@ -155,7 +312,7 @@ class SharepointSession(SessionManager):
 
         return self._client.web
 
-    def get_files(self, target_directory: str = "Shared Documents") -> list[str]:
+    def get_files(self, target_directory: str = "") -> list[str]:
         """
         Gets a list of files on the sharepoint site
 
@@ -163,21 +320,83 @@ class SharepointSession(SessionManager):
         -------
         List of files stored in sharepoint
         """
+        target_directory = os.path.join(
+            self._root_folder, target_directory.strip("/")
+        ).rstrip("/")
 
         root_folder = self.get_client_web().get_folder_by_server_relative_path(
             target_directory
         )
 
-        files = root_folder.get_files(True).execute_query()
+        with get_metrics().measure("get_files") as measurement:
+            files = self._execute(lambda: root_folder.get_files(True).execute_query())
+            measurement.items = len(files)
 
         data = ["Select File"] + [
-            str(f.properties["ServerRelativeUrl"]).split(target_directory)[1]
+            str(f.properties["ServerRelativeUrl"]).split(target_directory, 1)[1]
             for f in files
             if str(f.properties["ServerRelativeUrl"]).endswith(VALID_EXTENSIONS)
         ]
 
         return data
 
+    def list_folder(
+        self,
+        folder: str = "",
+        name_filter: str = "",
+        page: int = 0,
+        page_size: int = LISTING_PAGE_SIZE,
+    ) -> FolderListing:
+        """
+        Lists one page of a single folder of the document library. Sorting, filtering and paging
+        are done by sharepoint, so only the page is transferred.
+
+        Raises
+        ------
+        FileNotFoundError
+            The folder does not exist in sharepoint
+        """
+        self.get_client_web()
+        folder = folder.strip("/")
+        library = f"{self._site_path()}{self._root_folder}"
+        server_folder = f"{library}/{folder}".rstrip("/")
+
+        async def list_page():
+            async with self.async_client() as client:
+                return await client.list_folder_page(
+                    server_folder,
+                    name_filter,
+                    page * page_size,
+                    page_size,
+                    include_folders=page == 0,
+                )
+
+        with get_metrics().measure("list_folder") as measurement:
+            try:
+                folders, files, has_more = run_sync(list_page())
+            except RequestException as error:
+                if classify_error(error) is ErrorKind.NOT_FOUND:
+                    raise FileNotFoundError(
+                        f"{folder} does not exist in sharepoint"
+                    ) from error
+                raise
+            measurement.items = len(folders) + len(files)
+
+        return FolderListing(
+            folder,
+            [
+                subfolder["Name"]
+                for subfolder in folders
+                if folder != "" or subfolder["Name"] != FORMS_FOLDER
+            ],
+            [
+                str(file["ServerRelativeUrl"]).split(library, 1)[1]
+                for file in files
+                if str(file["Name"]).endswith(VALID_EXTENSIONS)
+            ],
+            has_more,
+        )
+
     def upload(self, appdata_path: str, upload_location: str):
         """
         Uploads a file to sharepoint
@@ -198,45 +417,94 @@ class SharepointSession(SessionManager):
         if not os.path.exists(local_file_path):
             return False
 
-        client_web = self.get_client_web()
-
-        full_site_url: str = f"{client_web.url}/"
-        site_url = full_site_url.split(".com")[1]
         root_folder = "Shared Documents/"
-        upload_url = f"{site_url}{root_folder}{upload_location}"
+        upload_url = f"{self._site_path()}{root_folder}{upload_location}"
+
+        with get_metrics().measure("upload") as measurement:
+            # Verification and folder creation are independent, send them as one batch
+            batch = self.batch()
+            web = self._queue_verify(batch)
+            batch.ensure_folder_path(f"{root_folder}{upload_location}")
+            batch.execute()
+            self._complete_verify(web)
+
+            client_web = self.get_client_web()
+            folder = client_web.get_folder_by_server_relative_url(upload_url)
+
+            def upload_file():
+                # Reopened on every attempt so a retry starts from the beginning of the file
+                with open(local_file_path, "rb") as local_file:
+                    return folder.files.create_upload_session(
+                        local_file, 1000000
+                    ).execute_query()
+
+            file = self._execute(upload_file)
+            measurement.bytes = os.path.getsize(local_file_path)
+            measurement.items = 1
+
+            uploaded = (
+                f"{upload_url}/{os.path.basename(local_file_path)}"
+                == file.serverRelativeUrl
+            )
+            if not uploaded:
+                measurement.outcome = Outcome.FAILED
 
-        client_web.ensure_folder_path(f"{root_folder}{upload_location}").execute_query()
-        folder = client_web.get_folder_by_server_relative_url(upload_url)
+        return uploaded
 
-        with open(local_file_path, "rb") as file:
-            file = folder.files.create_upload_session(file, 1000000).execute_query()
+    def has_files(self, sharepoint_file_paths: list[str]) -> dict[str, bool]:
+        """
+        Checks whether sharepoint has each of the provided paths. All of the checks are sent
+        together in a single batch request.
 
-        return (
-            f"{upload_url}/{os.path.basename(local_file_path)}"
-            == file.serverRelativeUrl
-        )
+        Returns
+        -------
+        Dictionary of each path mapped to whether it exists
+        """
+        if self._client is None:
+            raise RuntimeError(
+                "No client defined in sharepoint session. Have you signed in?"
+            )
 
-    def has_file(self, sharepoint_file_path: str) -> bool:
+        with get_metrics().measure("has_files") as measurement:
+            batch = self.batch()
+            web = self._queue_verify(batch)
+            probes = {
+                path: batch.probe_file(
+                    os.path.join(self._site_path(), self._root_folder, path.lstrip("/"))
+                )
+                for path in sharepoint_file_paths
+            }
+            batch.execute()
+            measurement.items = len(probes)
+
+            if not self._complete_verify(web):
+                raise RuntimeError("Unable to verify sharepoint client")
+
+        return {path: probe.exists for path, probe in probes.items()}
+
+    def file_versions(self, file_paths: list[str]) -> dict[str, str | None]:
         """
-        Checks whether sharepoint has the provided path
+        Gets the ETag of each of the provided paths, requested concurrently
+
+        Returns
+        -------
+        Dictionary of each path mapped to its ETag, None if it does not exist
         """
-        client_web = self.get_client_web()
+        self.get_client_web()
+        paths = {
+            path: os.path.join(self._site_path(), self._root_folder, path.strip("/"))
+            for path in file_paths
+        }
 
-        full_site_url: str = f"{client_web.url}/"
-        site_path = full_site_url.split(".com")[1]
+        async def request_versions():
+            async with self.async_client() as client:
+                return await client.file_versions(list(paths.values()))
 
-        try:
-            result = (
-                client_web.get_file_by_server_relative_path(
-                    os.path.join(site_path, self._root_folder, sharepoint_file_path)
-                )
-                .get()
-                .execute_query()
-            )
+        with get_metrics().measure("file_versions") as measurement:
+            versions = run_sync(request_versions())
+            measurement.items = len(paths)
 
-            return True
-        except:
-            return False
+        return {path: versions[server_path] for path, server_path in paths.items()}
 
     def download(self, sharepoint_path: str, appdata_path: str) -> bool:
         """
@@ -252,6 +520,11 @@ class SharepointSession(SessionManager):
         Returns
         -------
             True if file downloaded successfully, False otherwise
+
+        Raises
+        ------
+        FileNotFoundError
+            The file does not exist in sharepoint
         """
         appdata_path = appdata_path.strip("/")
         sharepoint_path = sharepoint_path.strip("/")
@@ -260,23 +533,164 @@ class SharepointSession(SessionManager):
 
         client_web = self.get_client_web()
 
-        full_site_url: str = f"{client_web.url}/"
-        site_path = full_site_url.split(".com")[1]
-
         file_name = os.path.basename(sharepoint_path)
         appdata_file_path = os.path.join(full_appdata_path, file_name)
 
         full_sharepoint_file_path = os.path.join(
-            site_path, self._root_folder, sharepoint_path
+            self._site_path(), self._root_folder, sharepoint_path
         )
 
-        with open(appdata_file_path, "wb") as sharepoint_file:
-            client_web.get_file_by_server_relative_path(
-                full_sharepoint_file_path
-            ).download(sharepoint_file).execute_query()
+        # Downloaded next to the destination and moved into place once complete, a failed
+        # download leaves any previous copy untouched. Unique so concurrent downloads of the
+        # same file don't write into each other.
+        file_descriptor, partial_file_path = tempfile.mkstemp(
+            dir=full_appdata_path, prefix=f"{file_name}.", suffix=".partial"
+        )
+        os.close(file_descriptor)
+
+        def download_file():
+            with open(partial_file_path, "wb") as sharepoint_file:
+                client_web.get_file_by_server_relative_path(
+                    full_sharepoint_file_path
+                ).download(sharepoint_file).execute_query()
+
+        with get_metrics().measure("download") as measurement:
+            try:
+                self._execute(download_file)
+                measurement.bytes = os.path.getsize(partial_file_path)
+                measurement.items = 1
+                os.replace(partial_file_path, appdata_file_path)
+            except RequestException as error:
+                if classify_error(error) is ErrorKind.NOT_FOUND:
+                    raise FileNotFoundError(
+                        f"{sharepoint_path} does not exist in sharepoint"
+                    ) from error
+                raise
+            finally:
+                if os.path.exists(partial_file_path):
+                    os.remove(partial_file_path)
 
         return os.path.exists(appdata_file_path)
 
+    def delete_folder(self, folder: str) -> bool:
+        """
+        Moves a folder and every file in it to the site's recycle bin, so it can still be
+        restored
+
+        Returns
+        -------
+            True if the folder was removed, False if it does not exist in sharepoint
+        """
+        full_sharepoint_folder_path = os.path.join(
+            self._site_path(), self._root_folder, folder.strip("/")
+        )
+        client_web = self.get_client_web()
+
+        def recycle_folder():
+            client_web.get_folder_by_server_relative_path(
+                full_sharepoint_folder_path
+            ).recycle().execute_query()
+
+        with get_metrics().measure("delete_folder") as measurement:
+            try:
+                self._execute(recycle_folder)
+                measurement.items = 1
+            except RequestException as error:
+                if classify_error(error) is ErrorKind.NOT_FOUND:
+                    measurement.outcome = Outcome.NOT_FOUND
+                    return False
+                raise
+
+        return True
+
+    def download_many(
+        self, file_paths: list[str], appdata_path: str
+    ) -> dict[str, bool]:
+        """
+        Downloads several files from Sharepoint concurrently into a directory in appdata
+
+        Inputs
+        ------
+        file_paths
+            Locations of the files in sharepoint
+        appdata_path
+            Location, on disk, to download the files (relative to appdata directory)
+
+        Returns
+        -------
+        Dictionary of each path mapped to whether it was downloaded, False if it does not exist
+        """
+        full_appdata_path = get_appdata_path(appdata_path.strip("/"))
+        self.get_client_web()
+
+        files = [
+            (
+                os.path.join(self._site_path(), self._root_folder, path.strip("/")),
+                os.path.join(full_appdata_path, os.path.basename(path.strip("/"))),
+            )
+            for path in file_paths
+        ]
+
+        async def download_all():
+            async with self.async_client() as client:
+                return await client.download_many(files)
+
+        with get_metrics().measure("download_many") as measurement:
+            results = run_sync(download_all())
+            measurement.items = len(files)
+            measurement.bytes = sum(r for r in results if isinstance(r, int))
+
+            for result in results:
+                if isinstance(result, Exception) and not isinstance(
+                    result, FileNotFoundError
+                ):
+                    raise result
+
+        return {
+            path: isinstance(result, int) for path, result in zip(file_paths, results)
+        }
+
+    def async_client(self) -> AsyncSharepointClient:
+        """
+        Returns an asyncio client sharing this session's sign in, for sending many requests
+        concurrently. Must be used within a single event loop and closed when done.
+        """
+        if self._client is None:
+            raise RuntimeError(
+                "No client defined in sharepoint session. Have you signed in?"
+            )
+
+        return AsyncSharepointClient(
+            self._client, self.sharepoint_url, executor=self._executor()
+        )
+
+    def detached(self) -> "SharepointSession":
+        """
+        Returns a copy of the signed in session with its own client, which is not bound to the
+        streamlit session state or cookies. The office365 client is not thread safe, so every
+        background task needs its own copy.
+        """
+        if self._client is None:
+            raise RuntimeError(
+                "No client defined in sharepoint session. Have you signed in?"
+            )
+
+        hawk_id, password = self._retrieve_credentials()
+
+        # pylint: disable=protected-access, unnecessary-dunder-call
+        detached = copy.copy(self)
+        # Rebound to a plain copy of the session values
+        SessionManager.__init__(
+            detached, {"auth": dict(self._session_page)}, "auth", "default"
+        )
+        detached._cookie_manager = None
+        detached.sync_complete = True
+        detached._client = create_client(
+            self.sharepoint_url, hawk_id, password, self.retrieve(Session.STAND_IN)
+        )
+
+        return detached
+
     def set_redirect(self, url: str):
         """
         Redirecting before cookie sync will cause cookie to not be saved. When using sharepoint session
@@ -293,6 +707,35 @@ class SharepointSession(SessionManager):
             self._unset(Session.REDIRECT_AFTER_SYNC)
             redirect(redirect_to)
 
+    def batch(self) -> RequestBatch:
+        """
+        Returns a new request batch for queueing metadata requests against the client
+        """
+        if self._client is None:
+            raise RuntimeError(
+                "No client defined in sharepoint session. Have you signed in?"
+            )
+
+        return RequestBatch(self._client, self._executor())
+
+    def _executor(self) -> ResilientExecutor:
+        """
+        Returns the executor used to retry requests to the configured site
+        """
+        return ResilientExecutor(RETRY_POLICY, get_circuit_breaker(self.sharepoint_url))
+
+    def _execute(self, operation):
+        """
+        Runs an operation which queues and executes client queries, retrying transient failures
+        """
+        return self._executor().call(operation, self._client.clear)
+
+    def _site_path(self) -> str:
+        """
+        Returns the server relative path of the configured sharepoint site (with trailing /)
+        """
+        return f"{urlparse(self.sharepoint_url).path.rstrip('/')}/"
+
     def _verify(self) -> bool:
         """
         Verifies client and retrieves data. This must be called before any upload/download
@@ -309,7 +752,39 @@ class SharepointSession(SessionManager):
         if self._client is None:
             return False
 
-        web = self._client.web.get().execute_query()
+        with get_metrics().measure("verify") as measurement:
+            batch = self.batch()
+            web = self._queue_verify(batch)
+            batch.execute()
+
+            verified = self._complete_verify(web)
+            if not verified:
+                measurement.outcome = Outcome.FAILED
+
+        return verified
+
+    def _queue_verify(self, batch: RequestBatch):
+        """
+        Queues the verification request onto batch if the client has not been verified yet.
+
+        Returns
+        -------
+        The web which needs to be passed to _complete_verify() after the batch is executed
+        """
+        if self.verified:
+            return None
+
+        return batch.load_web()
+
+    def _complete_verify(self, web) -> bool:
+        """
+        Completes verification using the web loaded by a batch from _queue_verify()
+        """
+        if self.verified:
+            return True
+
+        if web is None:
+            return False
 
         if not f"{web.url}/".strip("/") == self.sharepoint_url.strip("/"):
             return False
@@ -319,34 +794,57 @@ class SharepointSession(SessionManager):
 
     def _sync_session(self):
         """
-        Sync session and cookie
+        Sync session and cookie. The credentials are resolved once per browser session, from
+        then on the session is the known truth.
         """
         if self.has(Session.CREDENTIALS):
-            # Cookie needs to be synced with session, presume session is known truth
-            json_str = json.dumps(self.retrieve(Session.CREDENTIALS), indent=4)
-            self._cookie_manager.set(COOKIE_CREDENTIALS_KEY, json_str)
-
-            self._wait_for_cookie_key(COOKIE_CREDENTIALS_KEY, max_wait=5)
-
-            # If queued redirect waiting, we can now redirect
-            self._handle_redirect()
+            self.set(Session.RESTORED, True)
+            self._save_cookie()
             self.sync_complete = True
             return
 
-        if COOKIE_CREDENTIALS_KEY in self._cookie_manager.get_all():
+        if not self.has(Session.RESTORED):
+            if not self._cookie_manager.loaded():
+                return
+
             cookie_value = self._cookie_manager.get(COOKIE_CREDENTIALS_KEY)
-            self.set(Session.CREDENTIALS, cookie_value)
+            if cookie_value is not None:
+                self.set(Session.CREDENTIALS, cookie_value)
+                # Cookie already holds these credentials
+                self.set(Session.COOKIE_SAVED, True)
+            self.set(Session.RESTORED, True)
 
         self._handle_redirect()
         self.sync_complete = True
 
+    def _save_cookie(self):
+        """
+        Saves the session credentials to the cookie. Redirects are loaded as a new browser
+        session which needs the cookie, so a queued redirect waits for the browser to confirm
+        the cookie was saved. The confirmation reruns the script.
+        """
+        if not self.has(Session.COOKIE_SAVED):
+            if not self.has(Session.COOKIE_EXPIRES):
+                # Fixed for the session so every run renders the same cookie request
+                self.set(Session.COOKIE_EXPIRES, datetime.now() + COOKIE_LIFETIME)
+
+            json_str = json.dumps(self.retrieve(Session.CREDENTIALS), indent=4)
+            saved = self._cookie_manager.save(
+                COOKIE_CREDENTIALS_KEY, json_str, self.retrieve(Session.COOKIE_EXPIRES)
+            )
+            if not saved:
+                return
+            self.set(Session.COOKIE_SAVED, True)
+
+        self._handle_redirect()
+
     def _login_no_verify(self, hawk_id: str, password: str):
         """
         Same behavior as login but assumes hawk_id and password are already valid.
         This also does not modify cookie or session.
         """
-        self._client = ClientContext(self.sharepoint_url).with_credentials(
-            UserCredential(hawk_id, password)
+        self._client = create_client(
+            self.sharepoint_url, hawk_id, password, self.retrieve(Session.STAND_IN)
         )
 
         self.hawk_id = hawk_id
@@ -362,23 +860,3 @@ class SharepointSession(SessionManager):
         """
         creds = self.retrieve(Session.CREDENTIALS)
         return creds["username"], creds["password"]
-
-    def _wait_for_cookie_key(self, key: str, max_wait: float = 1):
-        """
-        Waits until the key is present in the cookie or until max_wait, whichever first.
-        """
-        sleep = 0.1
-        wait_time = 0
-        while key not in self._cookie_manager.get_all() or wait_time > max_wait:
-            time.sleep(sleep)
-            wait_time += sleep
-
-    def _wait_for_sync_complete(self, max_wait=0.5):
-        """
-        Waits until client found or max_wait seconds have passed
-        """
-        sleep = 0.01
-        elapsed = 0
-        while not self._client and elapsed < max_wait:
-            time.sleep(0.01)
-            elapsed += sleep
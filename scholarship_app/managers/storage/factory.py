@@ -0,0 +1,33 @@
+"""
+Selects the storage backend configured for the application.
+"""
+from streamlit.runtime.state import SessionStateProxy
+from scholarship_app.managers.config import ConfigManager
+from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.managers.storage.storage_backend import (
+    STORAGE_CONFIG_KEY,
+    StorageBackend,
+    StorageType,
+)
+
+
+def get_storage_type() -> StorageType:
+    """
+    Returns the configured storage type, sharepoint if none is configured
+    """
+    config = ConfigManager()
+    if config.has_key(STORAGE_CONFIG_KEY):
+        return StorageType(config.data[STORAGE_CONFIG_KEY])
+
+    return StorageType.SHAREPOINT
+
+
+def get_storage_backend(session: SessionStateProxy) -> StorageBackend:
+    """
+    Returns the configured storage backend for the streamlit session
+    """
+    if get_storage_type() is StorageType.LOCAL:
+        return LocalStorage()
+
+    return SharepointSession(session)
@@ -0,0 +1,189 @@
+"""
+Storage backend for data kept in a directory on the local machine or a mounted network share.
+"""
+import getpass
+import os
+import shutil
+import tempfile
+from scholarship_app.managers.config import ConfigManager
+from scholarship_app.managers.storage.storage_backend import (
+    FolderListing,
+    LISTING_PAGE_SIZE,
+    StorageBackend,
+    VALID_EXTENSIONS,
+)
+from scholarship_app.utils.output import get_appdata_path
+
+LOCAL_PATH_CONFIG_KEY = "local_storage_path"
+LOCAL_USER_CONFIG_KEY = "local_storage_user"
+
+
+class LocalStorage(StorageBackend):
+    """
+    Stores the data files in a local directory. No sign in is required, files are copied
+    directly to and from appdata.
+
+    Attributes
+    ----------
+    root : str
+        Absolute path to the directory the files are stored in
+    hawk_id : str
+        ID of the user, used to name the user's files
+    """
+
+    def __init__(self, root: str | None = None, hawk_id: str | None = None):
+        config = ConfigManager() if root is None or hawk_id is None else None
+
+        if root is None:
+            root = config.data.get(LOCAL_PATH_CONFIG_KEY) or get_appdata_path(
+                "local_storage"
+            )
+        if hawk_id is None:
+            hawk_id = config.data.get(LOCAL_USER_CONFIG_KEY) or getpass.getuser()
+
+        self.root = os.path.abspath(root)
+        self.hawk_id = hawk_id
+
+    def is_signed_in(self) -> bool:
+        """
+        Returns if the storage directory is available
+        """
+        return os.path.isdir(self.root)
+
+    def get_hawk_id(self) -> str | None:
+        """
+        Returns the configured user ID
+        """
+        return self.hawk_id
+
+    def get_location(self) -> str:
+        """
+        Returns the storage directory
+        """
+        return self.root
+
+    def get_files(self, target_directory: str = "") -> list[str]:
+        """
+        Gets a list of the data files inside target_directory (recursive)
+
+        Returns
+        -------
+        "Select File" followed by the path of each file relative to target_directory
+        """
+        target = self._path(target_directory)
+        files = []
+        for directory, _, file_names in os.walk(target):
+            for file_name in file_names:
+                if file_name.endswith(VALID_EXTENSIONS):
+                    relative = os.path.relpath(
+                        os.path.join(directory, file_name), target
+                    )
+                    files.append("/" + relative.replace(os.sep, "/"))
+
+        return ["Select File"] + sorted(files)
+
+    def list_folder(
+        self,
+        folder: str = "",
+        name_filter: str = "",
+        page: int = 0,
+        page_size: int = LISTING_PAGE_SIZE,
+    ) -> FolderListing:
+        """
+        Lists one page of a single folder of the storage directory
+        """
+        folder = folder.strip("/")
+        name_filter = name_filter.lower()
+        folders, files = [], []
+        with os.scandir(self._path(folder)) as entries:
+            for entry in entries:
+                if name_filter not in entry.name.lower():
+                    continue
+                if entry.is_dir():
+                    folders.append(entry.name)
+                elif entry.name.endswith(VALID_EXTENSIONS):
+                    files.append(f"/{folder}/{entry.name}".replace("//", "/"))
+
+        files.sort(key=str.lower)
+        start = page * page_size
+
+        return FolderListing(
+            folder,
+            sorted(folders, key=str.lower) if page == 0 else [],
+            files[start : start + page_size],
+            len(files) > start + page_size,
+        )
+
+    def has_files(self, file_paths: list[str]) -> dict[str, bool]:
+        """
+        Checks whether the storage directory has each of the provided paths
+        """
+        return {path: os.path.isfile(self._path(path)) for path in file_paths}
+
+    def file_versions(self, file_paths: list[str]) -> dict[str, str | None]:
+        """
+        Gets the modification time and size of each of the provided paths as its version tag
+        """
+        versions = {}
+        for path in file_paths:
+            try:
+                stat = os.stat(self._path(path))
+                versions[path] = f"{stat.st_mtime_ns}-{stat.st_size}"
+            except FileNotFoundError:
+                versions[path] = None
+
+        return versions
+
+    def download(self, file_path: str, appdata_path: str) -> bool:
+        """
+        Copies a file from the storage directory into a directory in appdata
+        """
+        appdata_file_path = os.path.join(
+            get_appdata_path(appdata_path.strip("/")), os.path.basename(file_path)
+        )
+        shutil.copyfile(self._path(file_path), appdata_file_path)
+
+        return os.path.exists(appdata_file_path)
+
+    def upload(self, appdata_path: str, upload_location: str) -> bool:
+        """
+        Copies a file from appdata into the storage directory. The file is replaced in a single
+        step so others reading the shared directory never see a partially written file.
+        """
+        local_file_path = get_appdata_path(appdata_path)
+
+        if not os.path.isfile(local_file_path):
+            return False
+
+        directory = self._path(upload_location)
+        os.makedirs(directory, exist_ok=True)
+
+        file_descriptor, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        os.close(file_descriptor)
+        try:
+            shutil.copyfile(local_file_path, temp_path)
+            os.replace(
+                temp_path, os.path.join(directory, os.path.basename(local_file_path))
+            )
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return True
+
+    def delete_folder(self, folder: str) -> bool:
+        """
+        Removes a folder of the storage directory and every file in it
+        """
+        path = self._path(folder)
+        if not os.path.isdir(path):
+            return False
+
+        shutil.rmtree(path)
+        return True
+
+    def _path(self, path: str) -> str:
+        """
+        Absolute path of a path relative to the storage directory
+        """
+        return os.path.join(self.root, path.strip("/"))
@@ -0,0 +1,193 @@
+"""
+Background loading of the datasets the home page needs.
+
+Signing in starts downloading the master sheet, the scholarships and the user's reviews (plus the
+vote tally the winners page reads) in background threads. Signing in redirects to Home in a new
+browser session, so the loaded datasets are kept in a cache shared by every session of the server
+process, keyed by storage location and user. Pages take a dataset out of the cache, waiting for it
+if it is still loading, and load it themselves if it was never prefetched.
+"""
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from enum import Enum
+from typing import Callable, TypeVar
+import pandas as pd
+from scholarship_app.managers.review_log import ReviewLog
+from scholarship_app.managers.sharepoint.file_versioning import DataManager, DataType
+from scholarship_app.managers.storage.storage_backend import StorageBackend
+from scholarship_app.managers.vote_tally import VoteTally, synced_tally
+from scholarship_app.utils.output import get_appdata_path
+
+T = TypeVar("T")
+
+# Seconds a page waits for a dataset which is still loading before loading it itself
+PREFETCH_TIMEOUT = 120
+# Seconds a prefetched dataset is kept if no page takes it
+PREFETCH_TTL = 300
+
+
+class Dataset(Enum):
+    """
+    Datasets which are prefetched on sign in
+    """
+
+    MASTER = "master"
+    SCHOLARSHIPS = "scholarships"
+    USER_REVIEWS = "user_reviews"
+    VOTE_TALLY = "vote_tally"
+
+
+def load_master(storage: StorageBackend) -> pd.DataFrame | None:
+    """
+    Master sheet of student data, None if no data has been imported
+    """
+    return DataManager({}, DataType.MAIN, storage).retrieve_master()
+
+
+def load_scholarships(storage: StorageBackend) -> pd.DataFrame:
+    """
+    Scholarships sheet
+    """
+    storage.download("/data/Scholarships.xlsx", "/data/")
+    return pd.read_excel(get_appdata_path("/data/Scholarships.xlsx"))
+
+
+def load_user_reviews(storage: StorageBackend) -> ReviewLog:
+    """
+    Review log of the signed in user
+
+    Raises
+    ------
+    FileNotFoundError
+        The user has no reviews file yet
+    """
+    return ReviewLog.load(storage)
+
+
+def load_vote_tally(storage: StorageBackend) -> VoteTally:
+    """
+    Vote tally of every reviewer's reviews, as read by the winners page
+    """
+    return synced_tally(storage)
+
+
+LOADERS: dict[Dataset, Callable[[StorageBackend], any]] = {
+    Dataset.MASTER: load_master,
+    Dataset.SCHOLARSHIPS: load_scholarships,
+    Dataset.USER_REVIEWS: load_user_reviews,
+    Dataset.VOTE_TALLY: load_vote_tally,
+}
+
+
+class PrefetchCache:
+    """
+    Datasets loading, or loaded, in the background for a user.
+
+    Attributes
+    ----------
+    loaders : dict[Dataset, Callable[[StorageBackend], any]]
+        Function loading each dataset from a storage backend
+    timeout : float
+        Seconds take() waits for a dataset which is still loading
+    ttl : float
+        Seconds a dataset is kept for before it is discarded as stale
+    _entries : dict[tuple, tuple[Future, float]]
+        Future of each dataset keyed by (storage location, hawk id, dataset), with the time it
+        was submitted
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        max_workers: int = 4,
+        loaders: dict[Dataset, Callable[[StorageBackend], any]] = None,
+        timeout: float = PREFETCH_TIMEOUT,
+        ttl: float = PREFETCH_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.loaders = LOADERS if loaders is None else loaders
+        self.timeout = timeout
+        self.ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._entries: dict[tuple, tuple[Future, float]] = {}
+        self._pool = ThreadPoolExecutor(max_workers, thread_name_prefix="prefetch")
+
+    def prefetch(
+        self, storage: StorageBackend, datasets: tuple[Dataset, ...] = tuple(Dataset)
+    ):
+        """
+        Starts loading each dataset in the background, unless it is already loading. storage must
+        be signed in.
+        """
+        with self._lock:
+            self._discard_stale()
+            for dataset in datasets:
+                key = self._key(storage, dataset)
+                if key in self._entries:
+                    continue
+
+                future = self._pool.submit(self.loaders[dataset], storage.detached())
+                self._entries[key] = (future, self._clock())
+
+    def take(
+        self,
+        storage: StorageBackend,
+        dataset: Dataset,
+        load: Callable[[], T] | None = None,
+    ) -> T:
+        """
+        Returns the dataset and removes it from the cache, so the next sign in loads it fresh.
+        When it was not prefetched, or prefetching failed, it is loaded with load (by default its
+        loader). A FileNotFoundError is raised as is since loading again would not find it either.
+        """
+        if load is None:
+
+            def load():
+                return self.loaders[dataset](storage)
+
+        with self._lock:
+            self._discard_stale()
+            entry = self._entries.pop(self._key(storage, dataset), None)
+
+        if entry is None:
+            return load()
+
+        try:
+            return entry[0].result(self.timeout)
+        except FileNotFoundError:
+            raise
+        except Exception:  # pylint: disable=broad-exception-caught
+            return load()
+
+    def _discard_stale(self):
+        """
+        Removes datasets older than the ttl. Must hold the lock.
+        """
+        now = self._clock()
+        for key, (future, submitted_at) in list(self._entries.items()):
+            if now - submitted_at > self.ttl:
+                future.cancel()
+                del self._entries[key]
+
+    def _key(self, storage: StorageBackend, dataset: Dataset) -> tuple:
+        """
+        Cache key of a dataset for the user signed into storage
+        """
+        return (storage.get_location(), storage.get_hawk_id(), dataset)
+
+
+_PREFETCH_CACHE: PrefetchCache | None = None
+_PREFETCH_CACHE_LOCK = threading.Lock()
+
+
+def get_prefetch_cache() -> PrefetchCache:
+    """
+    Returns the prefetch cache shared by every session of the server process
+    """
+    global _PREFETCH_CACHE  # pylint: disable=global-statement
+    with _PREFETCH_CACHE_LOCK:
+        if _PREFETCH_CACHE is None:
+            _PREFETCH_CACHE = PrefetchCache()
+        return _PREFETCH_CACHE
@@ -0,0 +1,205 @@
+"""
+Interface shared by every place the application's data files can be stored.
+"""
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from enum import Enum
+
+STORAGE_CONFIG_KEY = "storage_backend"
+VALID_EXTENSIONS = (".xls", ".xlsx", ".csv")
+# Files returned by a single list_folder() call
+LISTING_PAGE_SIZE = 100
+
+
+class StorageType(Enum):
+    """
+    Storage backends which can be selected in the config
+    """
+
+    SHAREPOINT = "sharepoint"
+    LOCAL = "local"
+
+
+@dataclass
+class FolderListing:
+    """
+    One page of the contents of a folder
+
+    Attributes
+    ----------
+    folder : str
+        Path of the listed folder, relative to the storage root
+    folders : list[str]
+        Names of the subfolders, only listed on the first page
+    files : list[str]
+        Path of each data file on the page, relative to the storage root
+    has_more : bool
+        Whether there is another page of files
+    """
+
+    folder: str
+    folders: list[str] = field(default_factory=list)
+    files: list[str] = field(default_factory=list)
+    has_more: bool = False
+
+
+class StorageBackend(ABC):
+    """
+    Stores the application data files. Paths are relative to the root of the storage and local
+    copies are kept in appdata.
+    """
+
+    @abstractmethod
+    def is_signed_in(self) -> bool:
+        """
+        Returns if the storage is ready to be used
+        """
+
+    @abstractmethod
+    def get_hawk_id(self) -> str | None:
+        """
+        Returns the ID of the user the storage is accessed as
+        """
+
+    @abstractmethod
+    def get_location(self) -> str:
+        """
+        Returns a human readable description of where the files are stored
+        """
+
+    @abstractmethod
+    def get_files(self, target_directory: str = "") -> list[str]:
+        """
+        Gets a list of the data files inside target_directory (recursive)
+
+        Returns
+        -------
+        "Select File" followed by the path of each file relative to target_directory
+        """
+
+    @abstractmethod
+    def list_folder(
+        self,
+        folder: str = "",
+        name_filter: str = "",
+        page: int = 0,
+        page_size: int = LISTING_PAGE_SIZE,
+    ) -> FolderListing:
+        """
+        Lists one page of a single folder (not recursive), sorted by name. Only names containing
+        name_filter (case insensitive) are listed.
+
+        Raises
+        ------
+        FileNotFoundError
+            The folder does not exist in the storage
+        """
+
+    @abstractmethod
+    def has_files(self, file_paths: list[str]) -> dict[str, bool]:
+        """
+        Checks whether the storage has each of the provided paths
+
+        Returns
+        -------
+        Dictionary of each path mapped to whether it exists
+        """
+
+    def has_file(self, file_path: str) -> bool:
+        """
+        Checks whether the storage has the provided path
+        """
+        return self.has_files([file_path])[file_path]
+
+    @abstractmethod
+    def file_versions(self, file_paths: list[str]) -> dict[str, str | None]:
+        """
+        Gets a version tag of each of the provided paths, which changes whenever the file is
+        replaced, so a local copy can be checked without downloading the file again
+
+        Returns
+        -------
+        Dictionary of each path mapped to its version tag, None if it does not exist
+        """
+
+    def detached(self) -> "StorageBackend":
+        """
+        Returns a backend for the same storage and user which can be used from a background
+        thread, outside of the streamlit script run. Backends without per session state can
+        return themselves.
+        """
+        return self
+
+    @abstractmethod
+    def download(self, file_path: str, appdata_path: str) -> bool:
+        """
+        Copies a file from the storage into a directory in appdata
+
+        Inputs
+        ------
+        file_path
+            Location of the file in the storage
+        appdata_path
+            Directory, relative to appdata, to download the file into
+
+        Returns
+        -------
+            True if file downloaded successfully, False otherwise
+
+        Raises
+        ------
+        FileNotFoundError
+            The file does not exist in the storage
+        """
+
+    def download_many(
+        self, file_paths: list[str], appdata_path: str
+    ) -> dict[str, bool]:
+        """
+        Copies several files from the storage into a directory in appdata. Backends which can
+        download concurrently override this, by default files are downloaded one at a time.
+
+        Returns
+        -------
+        Dictionary of each path mapped to whether it was downloaded, False if it does not exist
+        """
+        downloaded = {}
+        for file_path in file_paths:
+            try:
+                downloaded[file_path] = self.download(file_path, appdata_path)
+            except FileNotFoundError:
+                downloaded[file_path] = False
+
+        return downloaded
+
+    @abstractmethod
+    def upload(self, appdata_path: str, upload_location: str) -> bool:
+        """
+        Copies a file from appdata into the storage
+
+        Inputs
+        ------
+        appdata_path
+            Location of the file, relative to appdata
+        upload_location
+            Directory in the storage to place the file in
+
+        Returns
+        -------
+            True if the file is uploaded successfully, False otherwise
+        """
+
+    @abstractmethod
+    def delete_folder(self, folder: str) -> bool:
+        """
+        Removes a folder and every file in it from the storage
+
+        Inputs
+        ------
+        folder
+            Location of the folder in the storage
+
+        Returns
+        -------
+            True if the folder was removed, False if it does not exist
+        """
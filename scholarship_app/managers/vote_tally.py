@@ -0,0 +1,260 @@
+"""
+Vote tallies of every reviewer's reviews, kept up to date a reviewer at a time.
+
+The winners page ranks students by the ratings of every review left for a scholarship. Rather
+than reading every reviewer's reviews each time, the rating counts of each reviewer are kept in
+appdata with the version of their snapshot and the segments counted since it. Syncing then only
+reads what changed in the storage: the new segments of a reviewer whose snapshot is unchanged, or
+the whole log of a reviewer whose snapshot was replaced (compacted or rewritten), whose old counts
+are swapped for the new ones. The logs of every such reviewer are loaded at once as a review
+corpus. Reviewers whose snapshot was removed have their counts taken out.
+"""
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass, field
+import pandas as pd
+from scholarship_app.managers.review_corpus import load_review_corpus, parse_files
+from scholarship_app.managers.review_log import (
+    list_reviewers,
+    list_segments,
+    local_path,
+    segment_folder,
+    snapshot_path,
+)
+from scholarship_app.managers.storage.storage_backend import StorageBackend
+from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.utils.reviews import VOTE_COUNTS, vote_counts, vote_scores
+
+# Folder in appdata the tally of each storage location is kept in
+TALLY_FOLDER = "data/vote_tally"
+
+
+def tally_path(location: str) -> str:
+    """
+    Path in appdata of the saved tally of the storage at location
+    """
+    name = hashlib.blake2b(location.encode("utf-8"), digest_size=16).hexdigest()
+    return os.path.join(get_appdata_path(TALLY_FOLDER), f"{name}.pkl")
+
+
+def empty_counts() -> pd.DataFrame:
+    """
+    Counts of no reviews, as returned by vote_counts
+    """
+    return pd.DataFrame(
+        columns=VOTE_COUNTS,
+        dtype=int,
+        index=pd.MultiIndex.from_arrays([[], []], names=["UID", "Scholarship"]),
+    )
+
+
+def add_counts(
+    counts: pd.DataFrame, added: pd.DataFrame, removed: pd.DataFrame | None = None
+) -> pd.DataFrame:
+    """
+    Sum of counts and added less removed, keeping only students with a review
+    """
+    frames = [counts[VOTE_COUNTS], added[VOTE_COUNTS]]
+    if removed is not None:
+        frames.append(-removed[VOTE_COUNTS])
+
+    total = pd.concat(frames).groupby(level=["UID", "Scholarship"]).sum()
+    return total.loc[total["Reviews"] > 0].astype(int)
+
+
+@dataclass
+class ReviewerTally:
+    """
+    Counts of a reviewer's reviews and the part of their log they were counted from
+
+    Attributes
+    ----------
+    version : str
+        Version tag of the snapshot when it was counted
+    generation : int
+        Generation of the snapshot, the folder of its segments
+    segments : list[str]
+        Paths in the storage of the segments counted since the snapshot
+    counts : pd.DataFrame
+        Rating counts of the reviews, from vote_counts
+    invalid_uids : int
+        Reviews whose UID is not a whole number, which could not be counted
+    """
+
+    version: str
+    generation: int
+    segments: list[str] = field(default_factory=list)
+    counts: pd.DataFrame = field(default_factory=empty_counts)
+    invalid_uids: int = 0
+
+
+class VoteTally:
+    """
+    Rating counts and vote score of each student for each scholarship, summed over every
+    reviewer
+
+    Attributes
+    ----------
+    counts : pd.DataFrame
+        Counts indexed by (UID, Scholarship) with a column for each of VOTE_COUNTS and the vote
+        Score, students without a review are left out
+    reviewers : dict[str, ReviewerTally]
+        Counts of each reviewer, by their ID
+    """
+
+    def __init__(self, reviewers: dict[str, ReviewerTally] | None = None):
+        self.reviewers = {} if reviewers is None else reviewers
+        self.counts = empty_counts()
+        self._apply(
+            pd.concat(
+                [empty_counts()]
+                + [reviewer.counts for reviewer in self.reviewers.values()]
+            )
+        )
+
+    @property
+    def scores(self) -> pd.Series:
+        """
+        Vote score indexed by (UID, Scholarship), students without a review are left out
+        """
+        return self.counts["Score"]
+
+    @property
+    def invalid_uids(self) -> int:
+        """
+        Reviews left out of the counts as their UID is not a whole number, over every reviewer
+        """
+        return sum(reviewer.invalid_uids for reviewer in self.reviewers.values())
+
+    @classmethod
+    def load(cls, location: str) -> "VoteTally":
+        """
+        Reads the saved tally of the storage at location, an empty tally if none was saved
+        """
+        try:
+            return cls(pd.read_pickle(tally_path(location)))
+        except FileNotFoundError:
+            return cls()
+
+    def save(self, location: str):
+        """
+        Saves the tally of the storage at location. The file is replaced in a single step so a
+        tally being read is never partially written.
+        """
+        path = tally_path(location)
+        file_descriptor, temp_path = tempfile.mkstemp(
+            dir=os.path.dirname(path), suffix=".tmp"
+        )
+        os.close(file_descriptor)
+        try:
+            pd.to_pickle(self.reviewers, temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def sync(self, storage: StorageBackend) -> bool:
+        """
+        Counts the reviews added to storage since the tally was last synced, reading only the
+        reviewers whose log changed
+
+        Returns
+        -------
+        Whether any counts changed
+        """
+        snapshots = {
+            hawk_id: snapshot_path(hawk_id) for hawk_id in list_reviewers(storage)
+        }
+        versions = storage.file_versions(list(snapshots.values()))
+        changed = False
+
+        for hawk_id in set(self.reviewers) - set(snapshots):
+            self._apply(empty_counts(), self.reviewers.pop(hawk_id).counts)
+            changed = True
+
+        replaced = {}
+        for hawk_id, path in snapshots.items():
+            version = versions[path]
+            if version is None:
+                continue
+            reviewer = self.reviewers.get(hawk_id)
+            if reviewer is not None and reviewer.version == version:
+                changed |= self._count_segments(storage, reviewer, hawk_id)
+            else:
+                replaced[hawk_id] = version
+
+        if replaced:
+            self._count_logs(storage, replaced)
+            changed = True
+
+        return changed
+
+    def _count_segments(
+        self, storage: StorageBackend, reviewer: ReviewerTally, hawk_id: str
+    ) -> bool:
+        """
+        Counts the segments written under the reviewer's snapshot since it was last synced
+
+        Returns
+        -------
+        Whether there were any new segments
+        """
+        folder = segment_folder(hawk_id, reviewer.generation)
+        counted = set(reviewer.segments)
+        segments = [
+            segment
+            for segment in list_segments(storage, folder)
+            if segment not in counted
+        ]
+        downloaded = storage.download_many(segments, folder)
+        segments = [segment for segment in segments if downloaded[segment]]
+        if not segments:
+            return False
+
+        parsed = parse_files([local_path(segment) for segment in segments])
+        added = vote_counts(
+            pd.concat([frame for frame, _, _ in parsed], ignore_index=True)
+        )
+        reviewer.counts = add_counts(reviewer.counts, added)
+        reviewer.invalid_uids += sum(invalid for _, _, invalid in parsed)
+        reviewer.segments.extend(segments)
+        self._apply(added)
+        return True
+
+    def _count_logs(self, storage: StorageBackend, versions: dict[str, str]):
+        """
+        Counts the whole log of each reviewer in versions, replacing the counts of their
+        previous snapshot
+        """
+        corpus = load_review_corpus(storage, list(versions))
+        for hawk_id, reviews in corpus.reviewer_reviews().items():
+            counts = vote_counts(reviews)
+            previous = self.reviewers.get(hawk_id)
+
+            self.reviewers[hawk_id] = ReviewerTally(
+                versions[hawk_id],
+                corpus.generations[hawk_id],
+                corpus.segments[hawk_id],
+                counts,
+                corpus.invalid_uids[hawk_id],
+            )
+            self._apply(counts, None if previous is None else previous.counts)
+
+    def _apply(self, added: pd.DataFrame, removed: pd.DataFrame | None = None):
+        """
+        Adds and removes counts from the total, updating the scores
+        """
+        counts = add_counts(self.counts, added, removed)
+        counts["Score"] = vote_scores(counts)
+        self.counts = counts
+
+
+def synced_tally(storage: StorageBackend) -> VoteTally:
+    """
+    Tally of every reviewer's reviews in storage, synced from the tally saved for it
+    """
+    vote_tally = VoteTally.load(storage.get_location())
+    if vote_tally.sync(storage):
+        vote_tally.save(storage.get_location())
+    return vote_tally
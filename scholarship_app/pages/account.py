@@ -3,9 +3,12 @@ Signs the user into SharePoint
 """
 import streamlit as st
 
+from scholarship_app.managers.sharepoint.resilience import SharepointUnavailableError
 from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
-
-SHAREPOINT = SharepointSession(st.session_state)
+from scholarship_app.managers.storage.factory import get_storage_type
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.managers.storage.prefetch import get_prefetch_cache
+from scholarship_app.managers.storage.storage_backend import StorageType
 
 
 def login_form_render():
@@ -36,9 +39,15 @@ def login_form_render():
     login_button = login_form.form_submit_button("Log in to Sharepoint Site")
 
     if login_button:
-        result = SHAREPOINT.login(hawk_id, password)
+        try:
+            result = SHAREPOINT.login(hawk_id, password)
+        except SharepointUnavailableError:
+            login_form.error("Sharepoint is temporarily unavailable, try again shortly")
+            return
 
         if result:
+            # Home's data starts downloading while the redirect loads
+            get_prefetch_cache().prefetch(SHAREPOINT)
             SHAREPOINT.set_redirect("/")
             st.experimental_rerun()
 
@@ -60,7 +69,25 @@ def sign_out_form_render():
         SHAREPOINT.logout()
 
 
-if SHAREPOINT.is_signed_in():
-    sign_out_form_render()
+def local_storage_render():
+    """
+    Renders the storage details when data is kept in a local directory, no sign in is needed
+    """
+    st.title("Local Storage")
+
+    storage = LocalStorage()
+    st.write(
+        f"You have configured this application to store data in the directory: {storage.get_location()}"
+    )
+    st.write(f"Reviews are saved as user: {storage.get_hawk_id()}")
+
+
+if get_storage_type() is StorageType.LOCAL:
+    local_storage_render()
 else:
-    login_form_render()
+    SHAREPOINT = SharepointSession(st.session_state)
+
+    if SHAREPOINT.is_signed_in():
+        sign_out_form_render()
+    else:
+        login_form_render()
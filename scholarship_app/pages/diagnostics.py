@@ -0,0 +1,49 @@
+"""
+Diagnostics page, timing of sharepoint operations made by every session of this server.
+Only listed in the navigation when the "show_diagnostics" config value is true.
+"""
+import pandas as pd
+import streamlit as st
+from scholarship_app.managers.sharepoint.instrumentation import (
+    LATENCY_BUCKETS_MS,
+    get_metrics,
+)
+
+METRICS = get_metrics()
+
+st.header("Diagnostics")
+st.write(
+    "Timing of sharepoint requests since the server started. Every measurement is also "
+    f"written to `{METRICS.metrics_path}`."
+)
+
+summaries = METRICS.summaries()
+if len(summaries) == 0:
+    st.info("No sharepoint requests have been made yet")
+    st.stop()
+
+st.subheader("Operations")
+summary_table = pd.DataFrame.from_dict(summaries, orient="index")
+summary_table["outcomes"] = summary_table["outcomes"].map(
+    lambda outcomes: ", ".join(f"{k}: {v}" for k, v in sorted(outcomes.items()))
+)
+st.dataframe(summary_table.round(1))
+
+st.subheader("Latency Histogram")
+operation = st.selectbox("Operation", options=sorted(summaries))
+histogram = METRICS.histograms()[operation]
+st.bar_chart(
+    pd.DataFrame(
+        {"requests": histogram.buckets},
+        index=[f"<= {bound} ms" for bound in LATENCY_BUCKETS_MS],
+    )
+)
+
+dump_column, reset_column = st.columns(2)
+if dump_column.button("Write histograms to metrics file"):
+    METRICS.dump()
+    dump_column.success("Histograms written")
+
+if reset_column.button("Reset"):
+    METRICS.reset()
+    st.experimental_rerun()
@@ -1,5 +1,17 @@
 """
 Download file from sharepoint once signed in
+
+The storage is browsed one folder at a time. Each listed page is cached in the session per
+folder and name filter, so returning to a folder sends no requests until it is refreshed.
+
+State
+-----
+folder : str
+    Path of the folder being browsed, relative to the storage root
+filter : str
+    Name filter applied by the storage when listing
+listings : dict[str, list[FolderListing]]
+    Pages listed so far, keyed by folder and filter
 """
 import os
 
@@ -7,41 +19,114 @@ import streamlit as st
 
 from scholarship_app.utils.html import redirect
 from scholarship_app.sessions.session_manager import SessionManager
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.managers.storage.factory import get_storage_backend
+from scholarship_app.managers.storage.storage_backend import FolderListing
 
-SESSION = SessionManager(st.session_state, "download", "loading")
-SHARE_POINT = SharepointSession(st.session_state)
+SESSION = SessionManager(st.session_state, "download", "main")
+STORAGE = get_storage_backend(st.session_state)
 
-if not SHARE_POINT.is_signed_in():
+if not STORAGE.is_signed_in():
     redirect("/Account")
 
 
-def render_loading_files():
+def current_folder() -> str:
+    """
+    Folder being browsed
+    """
+    return SESSION.retrieve("folder") if SESSION.has("folder") else ""
+
+
+def current_filter() -> str:
+    """
+    Name filter being applied
+    """
+    return SESSION.retrieve("filter") if SESSION.has("filter") else ""
+
+
+def open_folder(folder: str):
+    """
+    Browses to folder, clearing the name filter
+    """
+    SESSION.set("folder", folder.strip("/"))
+    SESSION.set("filter", "")
+    st.experimental_rerun()
+
+
+def retrieve_pages() -> list[FolderListing]:
     """
-    Render the loading files spinner
+    Pages listed so far of the current folder and filter, listing the first page if needed
     """
-    with st.spinner("Loading Sharepoint Files..."):
-        files = SHARE_POINT.get_files()
+    if not SESSION.has("listings"):
+        SESSION.set("listings", {})
 
-    SESSION.set("files", files)
-    SESSION.set_view("main")
+    listings = SESSION.retrieve("listings")
+    key = f"{current_folder()}\n{current_filter()}"
+    if key not in listings:
+        with st.spinner("Loading Files..."):
+            listings[key] = [STORAGE.list_folder(current_folder(), current_filter())]
 
+    return listings[key]
 
-def render_files_dropdown():
+
+def load_next_page(pages: list[FolderListing]):
     """
-    Sets up the file dropdown, makes sure user is signed in
+    Lists the page after the last listed one
     """
-    if not SESSION.has("files"):
-        SESSION.set_view("loading")
+    with st.spinner("Loading Files..."):
+        pages.append(
+            STORAGE.list_folder(current_folder(), current_filter(), len(pages))
+        )
+
+
+def render_navigation():
+    """
+    Renders the current location, and the refresh and name filter controls
+    """
+    folder = current_folder()
+    location_column, up_column, refresh_column = st.columns([6, 1, 1])
+    location_column.markdown(f"**/{folder}**")
+
+    if folder and up_column.button("Up"):
+        open_folder(os.path.dirname(folder))
+
+    if refresh_column.button("Refresh"):
+        SESSION.set("listings", {})
+        st.experimental_rerun()
+
+    name_filter = st.text_input("Filter by name", value=current_filter())
+    if name_filter != current_filter():
+        SESSION.set("filter", name_filter)
+        st.experimental_rerun()
+
+
+def render_folders(listing: FolderListing):
+    """
+    Renders a button for each subfolder
+    """
+    for folder in listing.folders:
+        if st.button(f"📁 {folder}", key=f"folder-{folder}"):
+            open_folder(f"{current_folder()}/{folder}")
+
+
+def render_files_dropdown(pages: list[FolderListing]):
+    """
+    Sets up the file dropdown for the files listed so far, and downloading the selected file
+    """
+    files = [file for page in pages for file in page.files]
+    if len(files) == 0:
+        st.info("No spreadsheets in this folder")
 
-    files = SESSION.retrieve("files")
     file_selector = st.form("sharepoint-file-selector")
 
-    file = file_selector.selectbox("Sharepoint Files", options=files)
+    file = file_selector.selectbox(
+        "Sharepoint Files",
+        options=["Select File"] + files,
+        format_func=os.path.basename,
+    )
 
     if file_selector.form_submit_button("Download File"):
         if file != "Select File":
-            downloaded = SHARE_POINT.download(file, f"{os.getcwd()}/data/")
+            downloaded = STORAGE.download(file, f"{os.getcwd()}/data/")
             if downloaded:
                 file_selector.info(f"Downloaded {file}")
                 return
@@ -53,7 +138,11 @@ def render_files_dropdown():
 
 st.header("Download A File")
 
-if SESSION.view == "loading":
-    render_loading_files()
-else:
-    render_files_dropdown()
+render_navigation()
+listed_pages = retrieve_pages()
+render_folders(listed_pages[0])
+render_files_dropdown(listed_pages)
+
+if listed_pages[-1].has_more and st.button("Load more files"):
+    load_next_page(listed_pages)
+    st.experimental_rerun()
@@ -2,16 +2,16 @@
 Export data page
 """
 import streamlit as st
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
-from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.components.export import export_download
+from scholarship_app.managers.storage.factory import get_storage_backend
 from scholarship_app.managers.sharepoint.file_versioning import DataManager, DataType
 from scholarship_app.utils.html import redirect
 
-SHAREPOINT = SharepointSession(st.session_state)
-if not SHAREPOINT.is_signed_in():
+STORAGE = get_storage_backend(st.session_state)
+if not STORAGE.is_signed_in():
     redirect("/Account")
 
-MAIN_DATA = DataManager(st.session_state, DataType.MAIN, SHAREPOINT)
+MAIN_DATA = DataManager(st.session_state, DataType.MAIN, STORAGE)
 
 st.header("Export Data")
 with st.spinner("Downloading Data..."):
@@ -24,16 +24,4 @@ if main_data is None:
 else:
     st.write("Download your sharepoint master datasheet")
 
-    main_data.to_excel(
-        f"{get_appdata_path('temp/download')}/student_data_export.xls", index=False
-    )
-
-    with open(
-        f"{get_appdata_path('temp/download')}/student_data_export.xls", "rb"
-    ) as file:
-        st.download_button(
-            label="Export",
-            data=file,
-            file_name="student_data_export.xls",
-            mime="image/png",
-        )
+    export_download(main_data, "master", "student_data_export")
@@ -1,73 +1,51 @@
-# pylint: disable=too-many-nested-blocks, too-many-branches
 """
 Home: Primary page for viewing student data, leaving reviews, and exporting selections
 """
 import streamlit as st
-import pandas as pd
 import numpy as np
-from st_aggrid import (
-    JsCode,
-    GridOptionsBuilder,
-    AgGrid,
-    ColumnsAutoSizeMode,
-    GridUpdateMode,
-)
+from st_aggrid import AgGrid, ColumnsAutoSizeMode, GridUpdateMode
 
 from scholarship_app.utils.html import redirect
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
-from scholarship_app.utils.scholarship_management import groups_string_to_list
-from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.managers.review_log import ReviewLog
+from scholarship_app.managers.storage.factory import get_storage_backend
+from scholarship_app.managers.storage.prefetch import Dataset, get_prefetch_cache
+from scholarship_app.utils.eligibility_matrix import (
+    EligibilityMatrix,
+    get_eligibility_matrix,
+)
+from scholarship_app.utils.reviews import ReviewIndex
 from scholarship_app.managers.sharepoint.file_versioning import DataManager, DataType
 from scholarship_app.sessions.session_manager import SessionManager
+from scholarship_app.components.export import export_download
 from scholarship_app.components.home.graphing import distribution_graph_expander
 from scholarship_app.components.home.statistics import main_data_statistics
 from scholarship_app.components.home.review import submit_review_expander
+from scholarship_app.components.home.columns import (
+    column_controls,
+    full_text_viewer,
+    preview_long_text,
+    project_columns,
+)
+from scholarship_app.components.home.grid_options import grid_options
+from scholarship_app.components.home.main_table import (
+    TableSelection,
+    matching_rows,
+    page_controls,
+    page_rows,
+    table_window_controls,
+)
 
 # Default setting for Streamlit page
 st.set_page_config(layout="wide")
 
-SHAREPOINT = SharepointSession(st.session_state)
-if not SHAREPOINT.is_signed_in():
+STORAGE = get_storage_backend(st.session_state)
+if not STORAGE.is_signed_in():
     redirect("/Account")
 
-MAIN_DATA = DataManager(st.session_state, DataType.MAIN, SHAREPOINT)
+MAIN_DATA = DataManager(st.session_state, DataType.MAIN, STORAGE)
+PREFETCH = get_prefetch_cache()
 SESSION = SessionManager(st.session_state, "home", "download")
 
-js = JsCode(
-    """
- function(event) {
-    const api = event.api; 
-     window.addEventListener('clear.rows', (e) => {
-         api.deselectAll(); 
-     });    
- }
- """
-)
-jscode = JsCode(
-    """
-            function(params) {
-                if (params.data.Review === 'Yes') {
-                    return {
-                        'color': 'white',
-                        'backgroundColor': '#017252'
-                    }
-                }
-                if (params.data.Review === 'No') {
-                    return {
-                        'color': 'white',
-                        'backgroundColor': '#8E0303'
-                    }
-                }
-                if (params.data.Review === 'Maybe') {
-                    return {
-                        'color': 'white',
-                        'backgroundColor': '#A2A200'
-                    }
-                }
-            };
-            """
-)
-
 # Start of displayed page
 st.title("Home")
 st.header("Review Applicants")
@@ -87,112 +65,47 @@ def error_view():
 def downloading_data_view():
     """
     The downloading data view which also initializes the homepage session with necessary data.
+    Datasets prefetched when the user signed in are taken from the prefetch cache.
     """
     with st.spinner("Downloading Data..."):
-        master_sheet = MAIN_DATA.retrieve_master()
+        master_sheet = PREFETCH.take(STORAGE, Dataset.MASTER, MAIN_DATA.retrieve_master)
 
         if "students" not in st.session_state and not master_sheet is None:
             st.session_state.students = master_sheet
 
         if "scholarships" not in st.session_state:
-            SHAREPOINT.download("/data/Scholarships.xlsx", "/data/")
-            st.session_state.scholarships = pd.read_excel(
-                get_appdata_path("/data/Scholarships.xlsx")
-            )
+            st.session_state.scholarships = PREFETCH.take(STORAGE, Dataset.SCHOLARSHIPS)
 
-        if "user_recommendations" not in st.session_state:
+        if "review_log" not in st.session_state:
             try:
-                SHAREPOINT.download(
-                    f"/data/{SHAREPOINT.get_hawk_id()}_Reviews.xlsx", "/data/"
-                )
-            except:
-                new_file = pd.DataFrame(
-                    columns=["UID", "Scholarship", "Rating", "Additional Feedback"]
-                )
-                new_file.to_excel(
-                    get_appdata_path(f"/data/{SHAREPOINT.get_hawk_id()}_Reviews.xlsx"),
-                    index=False,
+                st.session_state.review_log = PREFETCH.take(
+                    STORAGE, Dataset.USER_REVIEWS
                 )
-                SHAREPOINT.upload(
-                    f"/data/{SHAREPOINT.get_hawk_id()}_Reviews.xlsx", "/data/"
-                )
-            st.session_state.user_recommendations = pd.read_excel(
-                get_appdata_path(f"/data/{SHAREPOINT.get_hawk_id()}_Reviews.xlsx")
-            )
+            except FileNotFoundError:
+                # First time this user is reviewing, any other failure is left to surface
+                # rather than replacing their reviews with an empty file
+                st.session_state.review_log = ReviewLog.create(STORAGE)
 
     SESSION.set_view("main")
 
 
 def compute_reviews(
-    current_data, user_recommendations, current_scholarship, scholarships
+    current_data,
+    review_index: ReviewIndex,
+    current_scholarship,
+    eligibility: EligibilityMatrix,
 ):
     """
-    Compute the selected reviews for current scholarship???
+    Adds the user's reviews for current scholarship and drops the students who are not
+    eligible for it
     """
-    current_data_reviews = []
-    for index, row in current_data.iterrows():
-        student_recommendation = user_recommendations.loc[
-            (user_recommendations["UID"] == row["UID"])
-            & (user_recommendations["Scholarship"] == current_scholarship)
-        ]
-        if len(student_recommendation) > 0:
-            current_data_reviews.append(student_recommendation["Rating"].iloc[0])
-        else:
-            current_data_reviews.append("N/A")
-    current_data["Review"] = current_data_reviews
-
-    # Filtering current data with scholarship criteria
-    criteria = scholarships.loc[scholarships["Name"] == current_scholarship]
-    groups_columns = []
-    criteria_no_groups = []
-    for column in criteria.columns.tolist():
-        if column[0:5] == "Group":
-            if (
-                isinstance(criteria[column].iloc[0], str)
-                and criteria[column].iloc[0].startswith("[")
-                and criteria[column].iloc[0].endswith("]")
-            ):
-                groups_columns.append(groups_string_to_list(criteria[column].iloc[0]))
-        elif column not in ["Name", "Total Amount", "Value"]:
-            criteria_no_groups.append(column)
-    for criterion in criteria_no_groups:
-        if criterion in current_data.columns.tolist():
-            try:
-                value = float(criteria[criterion])
-                in_group = False
-                for group in groups_columns:
-                    if criterion in group:
-                        in_group = True
-                        met_criteria = False
-                        for index, student in current_data.iterrows():
-                            for group_c in group:
-                                if student[group_c] >= value:
-                                    met_criteria = True
-                            if met_criteria == False:
-                                current_data.drop(index)
-                if in_group == False:
-                    current_data.drop(
-                        current_data.loc[current_data[criterion] < value].index,
-                        inplace=True,
-                    )
-            except ValueError:
-                value = criteria[criterion]
-                in_group = False
-                for group in groups_columns:
-                    if criterion in group:
-                        in_group = True
-                        met_criteria = False
-                        for index, student in current_data.iterrows():
-                            for group_c in group:
-                                if student[group_c] >= value:
-                                    met_criteria = True
-                            if met_criteria == False:
-                                current_data.drop(index)
-                if in_group == False:
-                    current_data.drop(
-                        current_data.loc[current_data[criterion] != value].index,
-                        inplace=True,
-                    )
+    current_data["Review"] = review_index.column(
+        current_data["UID"], current_scholarship
+    )
+
+    # Filtering current data with the scholarship's column of the eligibility matrix
+    eligible = eligibility.mask(current_scholarship)
+    current_data.drop(current_data.index[~eligible], inplace=True)
 
 
 def main_view():
@@ -205,8 +118,9 @@ def main_view():
     students = st.session_state.students
     current_data = students.copy()
 
-    user_recommendations = st.session_state.user_recommendations
+    review_log = st.session_state.review_log
     scholarships = st.session_state.scholarships
+    eligibility = get_eligibility_matrix(st.session_state).sync(students, scholarships)
 
     # Selecting a scholarship to use for filtering and reviews
     current_scholarship = st.selectbox(
@@ -216,44 +130,33 @@ def main_view():
     if current_scholarship != "None":
         # Adding previos reviews to current data
         compute_reviews(
-            current_data, user_recommendations, current_scholarship, scholarships
+            current_data, review_log.index, current_scholarship, eligibility
         )
+        eligible_count = eligibility.eligible_count(current_scholarship)
+    else:
+        eligible_count = len(students)
 
-    # Configuring options for table functionality
+    # Searching, sorting and paging are done here so only the shown page is sent to the grid
     current_data.insert(0, "Select All", None)
-    graph_data = GridOptionsBuilder.from_dataframe(current_data)
-    graph_data.configure_pagination(enabled=True)  # Add pagination
-    graph_data.configure_side_bar()  # Add a sidebar
-    graph_data.configure_default_column(editable=False, groupable=True)
-    graph_data.configure_selection(
-        selection_mode="multiple", use_checkbox=True
-    )  # Enable multi-row selection
-    graph_data.configure_column("Select All", headerCheckboxSelection=True)
-    graph_data.configure_grid_options(onFirstDataRendered=js)
-    graph_data.configure_column(
-        "Describe any relevant life experience related to engineering. ",
-        onCellClicked=JsCode(
-            "function(params) { alert(params.node.data['Describe any relevant life experience related to engineering. ']); };"
-        ),
+    selection = TableSelection(SESSION)
+    window = table_window_controls(SESSION, current_data.columns.tolist())
+    matching = matching_rows(current_data, window)
+    students_grid(
+        page_rows(matching, window),
+        current_data.columns.tolist(),
+        selection,
+        current_scholarship,
+        f"students-{current_scholarship}-{window}",
     )
-    gridoptions = graph_data.build()
-    gridoptions["getRowStyle"] = jscode
-    custom_css = {}
 
-    # Building the table
-    grid_table = AgGrid(
-        current_data,
-        gridOptions=gridoptions,
-        theme="balham",
-        custom_css=custom_css,
-        height=700,
-        columns_auto_size_mode=ColumnsAutoSizeMode.FIT_CONTENTS,
-        allow_unsafe_jscode=True,
-        update_mode=GridUpdateMode.MODEL_CHANGED,
-    )
+    page_controls(SESSION, window, len(matching))
+    if st.button(f"Select All {len(matching)} Matching Students"):
+        selection.select(matching["UID"])
+        st.experimental_rerun()
 
     # Displaying statistics about main data frame
-    main_data_statistics(current_data, students, grid_table)
+    selected = selection.rows(current_data)
+    main_data_statistics(eligible_count, len(students), len(selected), selection)
 
     # Actions for user to take on main data frame
     with st.container():
@@ -262,19 +165,53 @@ def main_view():
         # Submitting recommendations for scholarhsips
         with col1:
             submit_review_expander(
-                current_scholarship, user_recommendations, grid_table, SHAREPOINT
+                current_scholarship,
+                review_log,
+                selected["UID"].tolist(),
+                STORAGE,
             )
 
         # Viewing graphs of student distributions
         with col2:
-            distribution_graph_expander(current_data, grid_table)
+            distribution_graph_expander(current_data, selection.positions(current_data))
 
         with col3:
-            if st.button("Export Current Table"):
-                grid_table["data"].to_excel(
-                    get_appdata_path("./data/Exported_Data.xlsx")
-                )
-                st.success("Exported data to /data as Exported_Data.xlsx")
+            st.write("Export Current Table")
+            export_download(
+                matching.drop(columns=["Select All"]), "home", "Exported_Data"
+            )
+
+
+def students_grid(page, columns, selection: TableSelection, scholarship: str, key: str):
+    """
+    Renders the grid of a page of students, sending only the user's columns with long answers
+    shortened to previews, and records the students selected in it
+    """
+    columns = column_controls(STORAGE.get_hawk_id(), columns)
+    grid_rows, shortened = preview_long_text(project_columns(page, columns))
+
+    # Options are built once per column schema, only the selected rows change per rerun
+    gridoptions = grid_options(grid_rows, selection.positions(grid_rows), scholarship)
+    custom_css = {}
+
+    # Building the table, a new grid is created for each page and selection made elsewhere
+    grid_table = AgGrid(
+        grid_rows,
+        gridOptions=gridoptions,
+        theme="balham",
+        custom_css=custom_css,
+        height=700,
+        columns_auto_size_mode=ColumnsAutoSizeMode.FIT_CONTENTS,
+        allow_unsafe_jscode=True,
+        update_mode=GridUpdateMode.MODEL_CHANGED,
+        key=f"{key}-{hash(tuple(columns))}-{selection.version}",
+    )
+    # The grid returns its input until it has reported its state
+    if grid_table["data"] is not grid_rows:
+        selection.update(
+            grid_rows["UID"], [row["UID"] for row in grid_table["selected_rows"]]
+        )
+    full_text_viewer(page, shortened, selection.uids)
 
 
 if SESSION.view == "main":
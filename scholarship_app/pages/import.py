@@ -35,15 +35,15 @@ from scholarship_app.managers.import_data.alignment_settings import (
     AlignmentManager,
 )
 from scholarship_app.components.import_data.script_editor import render_script_expander
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.components.export import export_download
+from scholarship_app.managers.storage.factory import get_storage_backend
 from scholarship_app.utils.html import redirect
 from scholarship_app.managers.sharepoint.file_versioning import DataManager, DataType
-from scholarship_app.utils.output import get_appdata_path
 
 # HELPERS AND FLOW MANAGEMENT
 
-SHAREPOINT = SharepointSession(st.session_state)
-if not SHAREPOINT.is_signed_in():
+STORAGE = get_storage_backend(st.session_state)
+if not STORAGE.is_signed_in():
     redirect("/Account")
 
 SESSION = ImportSessionManager(st.session_state)
@@ -271,21 +271,10 @@ def display_done_view():
     download_container.write("### Download the Imported Datasheet")
     download_container.write("Save the datasheet you just imported locally")
 
-    SESSION.data.to_excel(
-        f"{get_appdata_path('temp/download')}/student_data_export.xls"
-    )
-    with open(
-        f"{get_appdata_path('temp/download')}/student_data_export.xls", "rb"
-    ) as file:
-        download_container.download_button(
-            label="Download Datasheet",
-            data=file,
-            file_name="student_data_export.xls",
-            mime="image/png",
-        )
+    export_download(SESSION.data, "imported", "student_data_export", download_container)
 
     if set_as_master:
-        file_data = DataManager(st.session_state, DataType.MAIN, SHAREPOINT)
+        file_data = DataManager(st.session_state, DataType.MAIN, STORAGE)
         file_data.set_master(SESSION.data)
         set_as_master_container.success("Master datasheet in sharepoint updated!")
         return
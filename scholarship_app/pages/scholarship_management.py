@@ -6,7 +6,7 @@ from streamlit_extras.stateful_button import button
 import pandas as pd
 
 from scholarship_app.utils.html import centered_text, redirect
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.managers.storage.factory import get_storage_backend
 from scholarship_app.utils.scholarship_management import (
     write_rows,
     edit_row,
@@ -14,31 +14,36 @@ from scholarship_app.utils.scholarship_management import (
     equalize_dictionary_columns,
 )
 from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.utils.eligibility_matrix import get_eligibility_matrix
 from scholarship_app.managers.sharepoint.file_versioning import DataManager, DataType
 
-SHAREPOINT = SharepointSession(st.session_state)
-if not SHAREPOINT.is_signed_in():
+STORAGE = get_storage_backend(st.session_state)
+if not STORAGE.is_signed_in():
     redirect("/Account")
 
 # Setting variables for script
 with st.spinner("Downloading Data..."):
     if "master_sheet" not in st.session_state:
-        data = DataManager(st.session_state, DataType.MAIN, SHAREPOINT)
+        data = DataManager(st.session_state, DataType.MAIN, STORAGE)
         st.session_state.master_sheet = data.retrieve_master()
     master_sheet = st.session_state.master_sheet
     if "scholarships" not in st.session_state:
         try:
-            SHAREPOINT.download("/data/Scholarships.xlsx", "/data/")
+            STORAGE.download("/data/Scholarships.xlsx", "/data/")
             SCHOLARSHIPS_SHEET = pd.read_excel(
                 get_appdata_path("/data/Scholarships.xlsx")
             )
         except FileNotFoundError:
             write_rows(
-                pd.DataFrame({}), "/data/Scholarships.xlsx", "Scholarships", SHAREPOINT
+                pd.DataFrame({}), "/data/Scholarships.xlsx", "Scholarships", STORAGE
             )
             SCHOLARSHIPS_SHEET = pd.DataFrame({})
         st.session_state.scholarships = SCHOLARSHIPS_SHEET
     scholarships = st.session_state.scholarships
+    # Kept in step with each scholarship created, edited or deleted below
+    ELIGIBILITY = get_eligibility_matrix(st.session_state).sync(
+        master_sheet, scholarships
+    )
 
 # This is for determining how many groups have been added to a scholarship
 # Needed because of experimental_rerun() call to allow as many groups as they want
@@ -135,9 +140,10 @@ def display_create_dynamic():
             # Append the newly created scholarship to the new dataframe and write it to the file
             new_scholarships = new_scholarships.append(scholarship)
             write_rows(
-                new_scholarships, "data/Scholarships.xlsx", "Scholarships", SHAREPOINT
+                new_scholarships, "data/Scholarships.xlsx", "Scholarships", STORAGE
             )
             st.session_state.scholarships = new_scholarships
+            ELIGIBILITY.update_scholarship(scholarship)
             st.write(name + " has been successfully created.")
 
 
@@ -194,10 +200,17 @@ def display_edit_dynamic():
                         chosen_val = st.text_input("Edit " + col)
                     # Edit the row with the new value
                 edit_row(scholarships, index, [(col, chosen_val)])
+            # Preview how many students the edited criteria admit, under the name as edited
+            edited = scholarships.loc[index]
+            ELIGIBILITY.update_scholarship(edited)
+            st.info(
+                f"{ELIGIBILITY.eligible_count(edited['Name'])} of {len(master_sheet)}"
+                " students meet these criteria"
+            )
             if st.button("Finalize Changes", key="Finalize Changes"):
                 # We changed the values in our scholarships dataframe, but have not updated the actual file, so that is done here
                 write_rows(
-                    scholarships, "data/Scholarships.xlsx", "Scholarships", SHAREPOINT
+                    scholarships, "data/Scholarships.xlsx", "Scholarships", STORAGE
                 )
                 st.write(edit_sch + " has been successfully edited.")
 
@@ -236,9 +249,10 @@ def display_delete():
                     new_scholarships,
                     "data/Scholarships.xlsx",
                     "Scholarships",
-                    SHAREPOINT,
+                    STORAGE,
                 )
                 st.session_state.scholarships = new_scholarships
+                ELIGIBILITY.remove_scholarship(delete_sch)
                 st.write(delete_sch + " has been successfully deleted.")
 
 
@@ -283,10 +297,9 @@ def display_import():
         file_path = pd.read_excel(file[0])
         new_scholarships = file_path.head()
         # Write the new scholarships sheet to the correct area.
-        write_rows(
-            new_scholarships, "data/Scholarships.xlsx", "Scholarships", SHAREPOINT
-        )
+        write_rows(new_scholarships, "data/Scholarships.xlsx", "Scholarships", STORAGE)
         st.session_state.scholarships = new_scholarships
+        ELIGIBILITY.sync(master_sheet, new_scholarships)
         st.write(
             file[0].name + " has been successfully imported as your new scholarships."
         )
@@ -321,8 +334,9 @@ def display_import():
             st.session_state.scholarships,
             "data/Scholarships.xlsx",
             "Scholarships",
-            SHAREPOINT,
+            STORAGE,
         )
+        ELIGIBILITY.sync(master_sheet, st.session_state.scholarships)
         st.write(
             file[0].name + " has been successfully added to the existing scholarships."
         )
@@ -3,52 +3,43 @@ Winners: A page for the admin to be able to export the scholarship winners after
 """
 
 # Importing packages
-import os
 import streamlit as st
 import pandas as pd
 import numpy as np
+from scholarship_app.components.winners.allocation import allocation_expander
 from scholarship_app.utils.html import redirect
 from scholarship_app.utils.output import get_appdata_path
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.utils.reviews import vote_getters
+from scholarship_app.utils.eligibility_matrix import get_eligibility_matrix
+from scholarship_app.managers.storage.factory import get_storage_backend
+from scholarship_app.managers.storage.prefetch import Dataset, get_prefetch_cache
 
 # Default setting for Streamlit page
 st.set_page_config(layout="wide")
 
-SHAREPOINT = SharepointSession(st.session_state)
-if not SHAREPOINT.is_signed_in():
+STORAGE = get_storage_backend(st.session_state)
+if not STORAGE.is_signed_in():
     redirect("/Account")
 
 # Setting variables for script
 with st.spinner("Downloading Data..."):
     if "students" not in st.session_state:
-        SHAREPOINT.download("/data/Master_Sheet.xlsx", "/data/")
+        STORAGE.download("/data/Master_Sheet.xlsx", "/data/")
         st.session_state.students = pd.read_excel(
             get_appdata_path("/data/Master_Sheet.xlsx")
         )
     students = st.session_state.students
     current_data = students.copy()
     if "scholarships" not in st.session_state:
-        SHAREPOINT.download("/data/Scholarships.xlsx", "/data/")
-        st.session_state.scholarships = pd.read_excel(
-            get_appdata_path("/data/Scholarships.xlsx")
+        st.session_state.scholarships = get_prefetch_cache().take(
+            STORAGE, Dataset.SCHOLARSHIPS
         )
     scholarships = st.session_state.scholarships
-    if "all_recommendations" not in st.session_state:
-        files = SHAREPOINT.get_files()
-        for file in files:
-            if file == "Select File":
-                continue
-            if "/data/" in file and "reviews" in file and "/tests/" not in file:
-                SHAREPOINT.download(file, "/data/")
-        result = []
-        DIRECTORY = ".app_data/data"
-        for filename in os.listdir(DIRECTORY):
-            file = os.path.join(DIRECTORY, filename)
-            if os.path.isfile(file):
-                if "Reviews.xlsx" in file:
-                    result.append(pd.read_excel(file))
-        st.session_state.all_recommendations = result
-    all_recommendations = st.session_state.all_recommendations
+    if "vote_tally" not in st.session_state:
+        st.session_state.vote_tally = get_prefetch_cache().take(
+            STORAGE, Dataset.VOTE_TALLY
+        )
+    vote_scores = st.session_state.vote_tally.scores
 
 
 # Start of display
@@ -60,34 +51,13 @@ current_scholarship = st.selectbox(
     np.append(["None"], scholarships["Name"].values),
 )
 
-# Calculating vote scores for selected scholarship
-current_data.insert(0, "Vote Score", None)
-for student_index, student in current_data.iterrows():
-    for recommender in all_recommendations:
-        for recommendation_index, recommendation in recommender.iterrows():
-            if (
-                recommendation["UID"] == student["UID"]
-                and recommendation["Scholarship"] == current_scholarship
-            ):
-                if current_data.at[student_index, "Vote Score"] == None:
-                    current_data.at[student_index, "Vote Score"] = 0
-                if recommendation["Rating"] == "Yes":
-                    current_data.at[student_index, "Vote Score"] = (
-                        current_data.at[student_index, "Vote Score"] + 1
-                    )
-                elif recommendation["Rating"] == "No":
-                    current_data.at[student_index, "Vote Score"] = (
-                        current_data.at[student_index, "Vote Score"] - 1
-                    )
-                elif recommendation["Rating"] == "Maybe":
-                    current_data.at[student_index, "Vote Score"] = current_data.at[
-                        student_index, "Vote Score"
-                    ]
-
-# Dropping students that received no reviews or a negative vote Score
-current_data = current_data[current_data["Vote Score"].notna()]
-current_data.drop(current_data.loc[current_data["Vote Score"] < 0].index, inplace=True)
-current_data = current_data.sort_values(by=["Vote Score"], ascending=False)
+# Only students eligible for the selected scholarship can win it
+if current_scholarship != "None":
+    eligibility = get_eligibility_matrix(st.session_state).sync(students, scholarships)
+    current_data = current_data.loc[eligibility.mask(current_scholarship)]
+
+# Dropping students that received no reviews or a negative vote score
+current_data = vote_getters(current_data, vote_scores, current_scholarship)
 
 # Giving feedback if no scholarship selected
 if current_scholarship == "None":
@@ -119,3 +89,11 @@ with st.container():
                 get_appdata_path("/data/Scholarship_Winners.xlsx")
             )
             st.success("Exported data to /data as Scholarship_Winners.xlsx")
+
+# Allocating the awards of every scholarship at once
+allocation_expander(
+    students,
+    scholarships,
+    vote_scores,
+    get_eligibility_matrix(st.session_state).sync(students, scholarships).matrix,
+)
@@ -3,18 +3,22 @@ Main entry point for streamlit app. Sets up the page routing for the application
 """
 import pathlib
 from st_pages import Page, show_pages
+from scholarship_app.managers.config import ConfigManager
 
 HERE = pathlib.Path(__file__).parent
+# Config value which lists the diagnostics page in the navigation
+DIAGNOSTICS_CONFIG_KEY = "show_diagnostics"
 
-show_pages(
-    [
-        Page(HERE.joinpath("pages/home.py"), "Home"),
-        Page(
-            HERE.joinpath("pages/scholarship_management.py"), "Scholarship Management"
-        ),
-        Page(HERE.joinpath("pages/account.py"), "Account"),
-        Page(HERE.joinpath("pages/download.py"), "Download File"),
-        Page(HERE.joinpath("pages/import.py"), "Import Data"),
-        Page(HERE.joinpath("pages/export.py"), "Export Data"),
-    ]
-)
+PAGES = [
+    Page(HERE.joinpath("pages/home.py"), "Home"),
+    Page(HERE.joinpath("pages/scholarship_management.py"), "Scholarship Management"),
+    Page(HERE.joinpath("pages/account.py"), "Account"),
+    Page(HERE.joinpath("pages/download.py"), "Download File"),
+    Page(HERE.joinpath("pages/import.py"), "Import Data"),
+    Page(HERE.joinpath("pages/export.py"), "Export Data"),
+]
+
+if ConfigManager().data.get(DIAGNOSTICS_CONFIG_KEY, False):
+    PAGES.append(Page(HERE.joinpath("pages/diagnostics.py"), "Diagnostics"))
+
+show_pages(PAGES)
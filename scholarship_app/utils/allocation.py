@@ -0,0 +1,452 @@
+"""
+Allocation of scholarship awards across every scholarship at once
+
+Each scholarship offers its Total Amount of awards, and each student can be awarded a limited
+number of scholarships. Students are candidates for the scholarships they are eligible for and
+were reviewed for with a vote score of at least 0, the vote getters listed on the winners page.
+The allocation maximizes the total vote score of the awards, breaking ties toward giving more
+awards.
+
+Small allocations are solved exactly as a min cost flow from the students, through their
+candidate scholarships, to the awards. Larger ones are allocated greedily by score, then
+repaired by moving awarded students to scholarships with awards left, or swapping them out, when
+that raises the total.
+"""
+import numpy as np
+import pandas as pd
+
+AUTOMATIC = "Automatic"
+GREEDY = "Greedy with Repair"
+EXACT = "Exact"
+ALLOCATION_METHODS = [AUTOMATIC, GREEDY, EXACT]
+# Candidate (student, scholarship) pairs up to which the automatic method is exact
+EXACT_MAX_CANDIDATES = 5000
+# Repair moves made after the greedy allocation before it is returned as is
+MAX_REPAIRS = 500
+
+
+def award_counts(total_amounts: pd.Series) -> np.ndarray:
+    """
+    Number of awards each scholarship offers, from its Total Amount. Amounts which are not a
+    number offer no awards.
+    """
+    counts = pd.to_numeric(total_amounts, errors="coerce").fillna(0).clip(lower=0)
+    return counts.to_numpy().astype(np.int64)
+
+
+def score_matrix(uids: pd.Series, names: list[str], scores: pd.Series) -> np.ndarray:
+    """
+    Vote score of each student (rows, in the order of uids) for each scholarship (columns, in
+    the order of names), NaN where the student was not reviewed for the scholarship
+
+    Parameters
+    ----------
+    uids : pd.Series
+        UID of each student
+    names : list[str]
+        Name of each scholarship
+    scores : pd.Series
+        Vote scores indexed by (UID, Scholarship), from VoteTally.scores
+    """
+    table = scores.unstack("Scholarship").reindex(columns=names)
+    return table.reindex(uids.to_numpy()).to_numpy(dtype=float)
+
+
+def award_weights(
+    scores: np.ndarray, candidates: np.ndarray, capacity: np.ndarray, limits: np.ndarray
+) -> np.ndarray:
+    """
+    Integer weight of awarding each candidate pair, 0 for pairs which are not candidates.
+    Scores are scaled past the most awards which can be given, so that adding 1 per award only
+    breaks ties between allocations of the same total score.
+    """
+    awards = min(int(capacity.sum()), int(limits.sum()))
+    weights = np.nan_to_num(scores).astype(np.int64) * (awards + 1) + 1
+    return np.where(candidates, weights, 0)
+
+
+def descending_ranks(values: np.ndarray, axis: int) -> np.ndarray:
+    """
+    Rank of each value along axis, 0 for the largest, ties ranked in order of position
+    """
+    order = np.argsort(-values, axis=axis, kind="stable")
+    positions = np.arange(values.shape[axis]).reshape((-1, 1) if axis == 0 else (1, -1))
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.broadcast_to(positions, order.shape), axis)
+    return ranks
+
+
+def allocate_greedy(
+    weights: np.ndarray, capacity: np.ndarray, limits: np.ndarray
+) -> np.ndarray:
+    """
+    Awards the highest weighted candidates first, a round of proposals at a time. Each round
+    every scholarship proposes to its best open candidates, as many as it has awards left, and
+    each student accepts their best proposals, as many as they can still be awarded.
+
+    Returns
+    -------
+    Whether each student (rows) is awarded each scholarship (columns)
+    """
+    awarded = np.zeros(weights.shape, dtype=bool)
+    open_pairs = weights > 0
+    while True:
+        awards_left = capacity - awarded.sum(axis=0)
+        limits_left = limits - awarded.sum(axis=1)
+        open_pairs &= awards_left[np.newaxis, :] > 0
+        open_pairs &= limits_left[:, np.newaxis] > 0
+        if not open_pairs.any():
+            return awarded
+
+        proposed = open_pairs & (
+            descending_ranks(np.where(open_pairs, weights, 0), axis=0)
+            < awards_left[np.newaxis, :]
+        )
+        accepted = proposed & (
+            descending_ranks(np.where(proposed, weights, 0), axis=1)
+            < limits_left[:, np.newaxis]
+        )
+        awarded |= accepted
+        open_pairs &= ~accepted
+
+
+def best_refills(
+    weights: np.ndarray, awarded: np.ndarray, available: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Best student who can still be awarded each scholarship and is not already, with the
+    weight of awarding them, 0 where there is no such student
+    """
+    refill_weights = np.where((weights > 0) & ~awarded & available, weights, 0)
+    refill_students = np.argmax(refill_weights, axis=0)
+    return refill_students, refill_weights[refill_students, np.arange(weights.shape[1])]
+
+
+def best_move(
+    weights: np.ndarray,
+    awarded: np.ndarray,
+    capacity: np.ndarray,
+    limits: np.ndarray,
+) -> tuple[int, tuple[int, int] | None, tuple[int, int] | None, tuple[int, int] | None]:
+    """
+    Best single change to the allocation: adding an award, or taking an award from a student
+    (moving it to a scholarship with awards left, if any) and refilling it with the best
+    student who can still be awarded it
+
+    Returns
+    -------
+    Gain in weight of the change, and the award it removes, the award it adds for the same
+    student and the refill award, each (student, scholarship) or None
+    """
+    available = (awarded.sum(axis=1) < limits)[:, np.newaxis]
+    has_awards_left = (awarded.sum(axis=0) < capacity)[np.newaxis, :]
+    addable = np.where((weights > 0) & ~awarded & has_awards_left, weights, 0)
+
+    # Adding an award to a student who can still be awarded
+    additions = np.where(available, addable, 0)
+    student, scholarship = divmod(int(np.argmax(additions)), weights.shape[1])
+    best = (int(additions[student, scholarship]), None, (student, scholarship), None)
+
+    students, scholarships = np.nonzero(awarded)
+    if len(students) == 0:
+        return best
+    refill_students, refills = best_refills(weights, awarded, available)
+
+    # Taking each award, then moving it to each scholarship (the last column moves it nowhere)
+    moves = np.column_stack(
+        [addable[students], np.zeros(len(students), dtype=weights.dtype)]
+    )
+    gains = (
+        moves
+        - weights[students, scholarships][:, np.newaxis]
+        + refills[scholarships][:, np.newaxis]
+    )
+    gains[:, :-1][moves[:, :-1] == 0] = np.iinfo(weights.dtype).min
+    award, target = divmod(int(np.argmax(gains)), gains.shape[1])
+    if gains[award, target] <= best[0]:
+        return best
+
+    student, scholarship = int(students[award]), int(scholarships[award])
+    return (
+        int(gains[award, target]),
+        (student, scholarship),
+        None if target == weights.shape[1] else (student, target),
+        None
+        if refills[scholarship] == 0
+        else (int(refill_students[scholarship]), scholarship),
+    )
+
+
+def repair(
+    weights: np.ndarray,
+    awarded: np.ndarray,
+    capacity: np.ndarray,
+    limits: np.ndarray,
+    max_repairs: int = MAX_REPAIRS,
+) -> np.ndarray:
+    """
+    Improves an allocation by applying the best move of best_move while it raises the total
+    weight, up to max_repairs moves
+    """
+    awarded = awarded.copy()
+    for _ in range(max_repairs):
+        gain, removed, added, refilled = best_move(weights, awarded, capacity, limits)
+        if gain <= 0:
+            break
+        if removed is not None:
+            awarded[removed] = False
+        for award in (added, refilled):
+            if award is not None:
+                awarded[award] = True
+
+    return awarded
+
+
+def flow_network(
+    weights: np.ndarray, capacity: np.ndarray, limits: np.ndarray
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Flow network of an allocation, from a source to each student (up to their limit), through
+    an edge to each of their candidate scholarships (costing the negated weight) and on to a
+    sink (up to the scholarship's awards). Students are the first nodes, followed by the
+    scholarships, the source and the sink. Each edge is followed by its reverse, so edge ^ 1 is
+    the reverse of edge.
+
+    Returns
+    -------
+    Tail, head, cost and residual capacity of each edge, the edges between students and
+    scholarships in the order of np.nonzero(weights > 0)
+    """
+    student_count, scholarship_count = weights.shape
+    students, scholarships = np.nonzero(weights > 0)
+    source = student_count + scholarship_count
+
+    forward = np.concatenate(
+        [
+            [np.full(student_count, source), np.arange(student_count)],
+            [students, student_count + scholarships],
+            [
+                student_count + np.arange(scholarship_count),
+                np.full(scholarship_count, source + 1),
+            ],
+        ],
+        axis=1,
+    )
+    forward_costs = np.concatenate(
+        [
+            np.zeros(student_count),
+            -weights[students, scholarships].astype(float),
+            np.zeros(scholarship_count),
+        ]
+    )
+
+    tails = np.empty(2 * forward.shape[1], dtype=np.int64)
+    tails[0::2], tails[1::2] = forward
+    heads = np.empty_like(tails)
+    heads[0::2], heads[1::2] = forward[1], forward[0]
+    costs = np.empty(len(tails))
+    costs[0::2], costs[1::2] = forward_costs, -forward_costs
+    residual = np.zeros(len(tails), dtype=np.int64)
+    residual[0::2] = np.concatenate([limits, np.ones(len(students)), capacity])
+
+    return tails, heads, costs, residual
+
+
+def shortest_paths(
+    network: tuple[np.ndarray, np.ndarray, np.ndarray],
+    usable: np.ndarray,
+    nodes: int,
+    source: int,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Bellman-Ford shortest paths from source over the usable edges of the network's tails,
+    heads and costs, relaxing every edge at once each pass. The network must not have a
+    negative cycle.
+
+    Returns
+    -------
+    Distance to each node (inf where unreachable) and the edge each node is reached by
+    """
+    tails, heads, costs = network
+    distances = np.full(nodes, np.inf)
+    distances[source] = 0
+    parents = np.full(nodes, -1)
+    edges = np.nonzero(usable)[0]
+    for _ in range(nodes):
+        candidate = distances[tails[edges]] + costs[edges]
+        improved = edges[candidate < distances[heads[edges]]]
+        if len(improved) == 0:
+            break
+
+        # Shortest improvement of each node
+        candidate = distances[tails[improved]] + costs[improved]
+        improved = improved[np.lexsort((candidate, heads[improved]))]
+        _, first = np.unique(heads[improved], return_index=True)
+        improved = improved[first]
+        distances[heads[improved]] = distances[tails[improved]] + costs[improved]
+        parents[heads[improved]] = improved
+
+    return distances, parents
+
+
+def allocate_exact(
+    weights: np.ndarray, capacity: np.ndarray, limits: np.ndarray
+) -> np.ndarray:
+    """
+    Maximum weight allocation, as a min cost flow of flow_network solved by successive shortest
+    paths. Flow is augmented along the cheapest path while it lowers the cost.
+
+    Returns
+    -------
+    Whether each student (rows) is awarded each scholarship (columns)
+    """
+    tails, heads, costs, residual = flow_network(weights, capacity, limits)
+    source = sum(weights.shape)
+    sink = source + 1
+
+    while True:
+        distances, parents = shortest_paths(
+            (tails, heads, costs), residual > 0, sink + 1, source
+        )
+        if not distances[sink] < 0:
+            break
+
+        path, node = [], sink
+        while node != source:
+            path.append(parents[node])
+            node = tails[parents[node]]
+        path = np.array(path)
+        flow = residual[path].min()
+        residual[path] -= flow
+        residual[path ^ 1] += flow
+
+    # A pair's edge has no capacity left once its student is awarded the scholarship
+    students, scholarships = np.nonzero(weights > 0)
+    awarded = np.zeros(weights.shape, dtype=bool)
+    pair_edges = 2 * (weights.shape[0] + np.arange(len(students)))
+    awarded[students, scholarships] = residual[pair_edges] == 0
+    return awarded
+
+
+def allocate(
+    scores: np.ndarray,
+    eligible: np.ndarray,
+    capacity: np.ndarray,
+    limits: int | np.ndarray = 1,
+    method: str = AUTOMATIC,
+) -> np.ndarray:
+    """
+    Allocates the awards of every scholarship to the students with the highest total vote score
+
+    Parameters
+    ----------
+    scores : np.ndarray
+        Vote score of each student (rows) for each scholarship (columns), NaN where not reviewed
+    eligible : np.ndarray
+        Whether each student is eligible for each scholarship
+    capacity : np.ndarray
+        Number of awards each scholarship offers
+    limits : int | np.ndarray, optional
+        Most scholarships each student (or every student) can be awarded
+    method : str, optional
+        One of ALLOCATION_METHODS, AUTOMATIC solves allocations with up to
+        EXACT_MAX_CANDIDATES candidate pairs exactly
+
+    Returns
+    -------
+    Whether each student is awarded each scholarship
+    """
+    capacity = np.asarray(capacity, dtype=np.int64)
+    limits = np.broadcast_to(np.asarray(limits, dtype=np.int64), scores.shape[:1])
+    with np.errstate(invalid="ignore"):
+        candidates = eligible & (scores >= 0)
+    weights = award_weights(scores, candidates, capacity, limits)
+
+    if method == EXACT or (
+        method == AUTOMATIC and candidates.sum() <= EXACT_MAX_CANDIDATES
+    ):
+        return allocate_exact(weights, capacity, limits)
+    return repair(weights, allocate_greedy(weights, capacity, limits), capacity, limits)
+
+
+def award_table(
+    students: pd.DataFrame,
+    scholarships: pd.DataFrame,
+    scores: np.ndarray,
+    awarded: np.ndarray,
+) -> pd.DataFrame:
+    """
+    A row per award, ordered by scholarship and then highest vote score first, with the
+    Scholarship, its Value and the student's Vote Score inserted before the student's columns
+
+    Parameters
+    ----------
+    students : pd.DataFrame
+        Students of the rows of scores and awarded
+    scholarships : pd.DataFrame
+        Scholarships of the columns of scores and awarded, with Name and Value columns
+    """
+    award_scholarships, award_students = np.nonzero(awarded.T)
+    award_scores = scores[award_students, award_scholarships].astype(int)
+    order = np.lexsort((-award_scores, award_scholarships))
+
+    table = students.iloc[award_students[order]].reset_index(drop=True)
+    table.insert(0, "Vote Score", award_scores[order])
+    table.insert(
+        0, "Value", scholarships["Value"].to_numpy()[award_scholarships[order]]
+    )
+    table.insert(
+        0, "Scholarship", scholarships["Name"].to_numpy()[award_scholarships[order]]
+    )
+    return table
+
+
+# pylint: disable-next=too-many-arguments
+def allocate_awards(
+    students: pd.DataFrame,
+    scholarships: pd.DataFrame,
+    scores: pd.Series,
+    eligibility: pd.DataFrame,
+    limits: int = 1,
+    method: str = AUTOMATIC,
+) -> pd.DataFrame:
+    """
+    Allocates the awards of every scholarship, see allocate
+
+    Parameters
+    ----------
+    students : pd.DataFrame
+        Master sheet of student data
+    scholarships : pd.DataFrame
+        Scholarships sheet, the first scholarship of each name is allocated
+    scores : pd.Series
+        Vote scores indexed by (UID, Scholarship), from VoteTally.scores
+    eligibility : pd.DataFrame
+        Eligibility of each student (sharing the students index) for each scholarship (columns
+        named by scholarship), as kept by EligibilityMatrix
+    limits : int, optional
+        Most scholarships each student can be awarded
+    method : str, optional
+        One of ALLOCATION_METHODS
+
+    Returns
+    -------
+    The awards, as returned by award_table
+    """
+    scholarships = scholarships.loc[scholarships["Name"].notna()]
+    scholarships = scholarships.drop_duplicates("Name")
+    names = scholarships["Name"].tolist()
+
+    eligible = eligibility.reindex(
+        index=students.index, columns=names, fill_value=False
+    ).to_numpy(dtype=bool)
+    student_scores = score_matrix(students["UID"], names, scores)
+    awarded = allocate(
+        student_scores,
+        eligible,
+        award_counts(scholarships["Total Amount"]),
+        limits,
+        method,
+    )
+
+    return award_table(students, scholarships, student_scores, awarded)
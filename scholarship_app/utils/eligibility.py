@@ -0,0 +1,150 @@
+"""
+Scholarship eligibility: which students meet the criteria of a scholarship
+
+A scholarship row holds a value for each criterion it requires. A numeric value is a minimum
+(a student's value must be at least it), any other value must be matched exactly. Group columns
+(named "Group ...") list criteria of which a student needs to meet only one.
+
+The criteria of a scholarship are compiled once into an Eligibility, which computes the mask of
+eligible students over a whole student frame with vectorized comparisons. Compiled criteria are
+cached by the contents of the scholarship row, so editing a scholarship compiles it again while
+reruns of an unchanged scholarship reuse it.
+"""
+from dataclasses import dataclass
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from scholarship_app.utils.scholarship_management import groups_string_to_list
+
+# Scholarship columns which describe the scholarship rather than a requirement
+NON_CRITERIA = ("Name", "Total Amount", "Value")
+GROUP_PREFIX = "Group"
+# Criterion value which every student matches, such as a Major of "All"
+ANY_VALUE = "All"
+
+# Compiled criteria kept for the most recently used scholarship versions
+CACHE_SIZE = 128
+
+
+@dataclass(frozen=True)
+class Eligibility:
+    """
+    Compiled criteria of a scholarship
+
+    Attributes
+    ----------
+    minimums : tuple[tuple[str, float], ...]
+        Column and minimum value of each numeric criterion
+    matches : tuple[tuple[str, str], ...]
+        Column and required value of each other criterion
+    groups : tuple[tuple[str, ...], ...]
+        Columns of each group, of which a student must meet at least one criterion
+    """
+
+    minimums: tuple[tuple[str, float], ...] = ()
+    matches: tuple[tuple[str, str], ...] = ()
+    groups: tuple[tuple[str, ...], ...] = ()
+
+    def mask(self, students: pd.DataFrame) -> pd.Series:
+        """
+        Which students are eligible. Criteria on columns students does not have are skipped.
+        A student missing the value of a minimum is only excluded by a group, where none of its
+        criteria were met, so minimums outside of groups only exclude students known to fall
+        short. A student missing the value of any other criterion does not match it.
+
+        Returns
+        -------
+        Boolean series sharing the index of students
+        """
+        met = {}
+        known = {}
+        for column, minimum in self.minimums:
+            if column in students.columns:
+                values = pd.to_numeric(students[column], errors="coerce").to_numpy()
+                known[column] = ~np.isnan(values)
+                met[column] = known[column] & (values >= minimum)
+        for column, value in self.matches:
+            if column in students.columns:
+                known[column] = np.ones(len(students), dtype=bool)
+                met[column] = (students[column] == value).to_numpy()
+
+        eligible = np.ones(len(students), dtype=bool)
+        grouped = set()
+        for group in self.groups:
+            members = [column for column in group if column in met]
+            if members:
+                eligible &= np.logical_or.reduce([met[column] for column in members])
+                grouped.update(members)
+
+        for column, column_met in met.items():
+            if column not in grouped:
+                eligible &= column_met | ~known[column]
+
+        return pd.Series(eligible, index=students.index)
+
+    def eligible(self, students: pd.DataFrame) -> pd.DataFrame:
+        """
+        Rows of students which are eligible
+        """
+        return students.loc[self.mask(students)]
+
+
+def scholarship_version(scholarship: pd.Series) -> tuple:
+    """
+    Hashable contents of a scholarship row's criteria, which change whenever the scholarship is
+    edited. Unset criteria are left out.
+    """
+    version = []
+    for column, value in scholarship.items():
+        if column in NON_CRITERIA:
+            continue
+        if isinstance(value, (list, tuple)):
+            value = tuple(value)
+        elif pd.isnull(value) or value == "":
+            continue
+        version.append((column, value))
+
+    return tuple(version)
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_criteria(version: tuple) -> Eligibility:
+    """
+    Compiles the criteria of a scholarship version (see scholarship_version)
+    """
+    minimums = []
+    matches = []
+    groups = []
+    for column, value in version:
+        if str(column).startswith(GROUP_PREFIX):
+            if isinstance(value, str) and value.startswith("[") and value.endswith("]"):
+                value = groups_string_to_list(value)
+            if isinstance(value, (list, tuple)) and value:
+                groups.append(tuple(value))
+            continue
+
+        try:
+            minimums.append((column, float(value)))
+        except (TypeError, ValueError):
+            if value != ANY_VALUE:
+                matches.append((column, value))
+
+    return Eligibility(tuple(minimums), tuple(matches), tuple(groups))
+
+
+def compile_scholarship(scholarships: pd.DataFrame, name: str) -> Eligibility:
+    """
+    Compiled criteria of the scholarship called name, reused while the scholarship is unchanged
+
+    Raises
+    ------
+    KeyError
+        There is no scholarship called name
+    """
+    rows = scholarships.loc[scholarships["Name"] == name]
+    if rows.empty:
+        raise KeyError(f"No scholarship named {name}")
+
+    return compile_criteria(scholarship_version(rows.iloc[0]))
@@ -0,0 +1,159 @@
+"""
+Cached eligibility of every student for every scholarship
+
+Home switches between scholarships on every rerun, so the eligibility of each student for each
+scholarship is kept in a boolean matrix in the user's session rather than computed per switch.
+The matrix is kept in step incrementally: a created or edited scholarship recomputes only its
+column, and changed master rows (found by hashing rows) recompute only their rows.
+"""
+import pandas as pd
+from streamlit.runtime.state import SessionStateProxy
+
+from scholarship_app.utils.eligibility import compile_criteria, scholarship_version
+
+# Session key the matrix of a user is kept under
+ELIGIBILITY_MATRIX_KEY = "eligibility_matrix"
+
+
+class EligibilityMatrix:
+    """
+    Boolean students x scholarships eligibility matrix
+
+    Attributes
+    ----------
+    matrix : pd.DataFrame
+        Eligibility of each student (sharing the students index) for each scholarship (columns
+        named by scholarship)
+    _versions : dict[str, tuple]
+        Criteria version (see scholarship_version) each scholarship's column was computed from
+    _students : pd.DataFrame | None
+        Students the matrix was last computed for
+    _row_hashes : pd.Series | None
+        Hash of each row of _students, for finding the rows which changed
+    _counts : pd.Series | None
+        Eligible students per scholarship, computed when first needed after a change
+    """
+
+    def __init__(self):
+        self.matrix = pd.DataFrame(dtype=bool)
+        self._versions = {}
+        self._students = None
+        self._row_hashes = None
+        self._counts = None
+
+    def sync(
+        self, students: pd.DataFrame, scholarships: pd.DataFrame
+    ) -> "EligibilityMatrix":
+        """
+        Brings the matrix up to date with students and scholarships, recomputing only what
+        changed since the last sync. Cheap when neither changed.
+        """
+        self.update_students(students)
+
+        current = {}
+        for _, scholarship in scholarships.iterrows():
+            name = scholarship.get("Name")
+            if not pd.isnull(name) and name not in current:
+                current[name] = scholarship
+
+        for name in set(self._versions) - set(current):
+            self.remove_scholarship(name)
+        for scholarship in current.values():
+            self.update_scholarship(scholarship)
+
+        return self
+
+    def update_students(self, students: pd.DataFrame):
+        """
+        Recomputes the rows of students which were added or changed since the last update, rows
+        no longer in students are dropped
+        """
+        if students is self._students:
+            return
+
+        row_hashes = pd.util.hash_pandas_object(students, index=True)
+        incremental = (
+            self._students is not None
+            and students.columns.equals(self._students.columns)
+            and students.index.is_unique
+        )
+        if incremental:
+            changed = ~row_hashes.isin(self._row_hashes)
+            matrix = self.matrix.reindex(index=students.index, fill_value=False)
+            if changed.any():
+                changed_students = students.loc[changed]
+                for name, version in self._versions.items():
+                    matrix.loc[changed, name] = compile_criteria(version).mask(
+                        changed_students
+                    )
+            self.matrix = matrix.astype(bool)
+        else:
+            self.matrix = pd.DataFrame(
+                {
+                    name: compile_criteria(version).mask(students)
+                    for name, version in self._versions.items()
+                },
+                index=students.index,
+                dtype=bool,
+            )
+        self._students = students
+        self._row_hashes = row_hashes
+        self._counts = None
+
+    def update_scholarship(self, scholarship: pd.Series):
+        """
+        Recomputes the column of a created or edited scholarship, if its criteria changed
+        """
+        name = scholarship["Name"]
+        version = scholarship_version(scholarship)
+        if self._versions.get(name) == version:
+            return
+
+        self._versions[name] = version
+        if self._students is not None:
+            self.matrix[name] = compile_criteria(version).mask(self._students)
+        self._counts = None
+
+    def remove_scholarship(self, name: str):
+        """
+        Drops the column of a deleted scholarship
+        """
+        self._versions.pop(name, None)
+        if name in self.matrix.columns:
+            self.matrix = self.matrix.drop(columns=name)
+        self._counts = None
+
+    def mask(self, name: str) -> pd.Series:
+        """
+        Which students are eligible for the scholarship called name
+
+        Raises
+        ------
+        KeyError
+            The scholarship is not in the matrix
+        """
+        return self.matrix[name]
+
+    def eligible_count(self, name: str) -> int:
+        """
+        Number of students eligible for the scholarship called name
+
+        Raises
+        ------
+        KeyError
+            The scholarship is not in the matrix
+        """
+        if self._counts is None:
+            self._counts = self.matrix.sum()
+
+        return int(self._counts[name])
+
+
+def get_eligibility_matrix(session: SessionStateProxy) -> EligibilityMatrix:
+    """
+    Returns the eligibility matrix kept in the streamlit session, creating it if needed
+    """
+    if ELIGIBILITY_MATRIX_KEY not in session:
+        session[ELIGIBILITY_MATRIX_KEY] = EligibilityMatrix()
+
+    return session[ELIGIBILITY_MATRIX_KEY]
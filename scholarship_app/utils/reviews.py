@@ -0,0 +1,143 @@
+"""
+Functions and index for combining reviews with student data
+"""
+import pandas as pd
+
+# Review shown for a student the user has not reviewed
+NO_REVIEW = "N/A"
+# Vote each rating gives a student, other ratings are a review without a vote
+RATING_VOTES = {"Yes": 1, "No": -1, "Maybe": 0}
+# Columns of vote_counts, a count of each rating and of every review
+VOTE_COUNTS = list(RATING_VOTES) + ["Reviews"]
+
+
+class ReviewIndex:
+    """
+    Ratings of a reviewer's reviews keyed by (UID, Scholarship), kept alongside their reviews
+    so a review can be found without scanning them. When a student was reviewed more than once
+    for a scholarship the first review is kept.
+
+    Attributes
+    ----------
+    _ratings : dict[str, dict]
+        Rating of each reviewed student's UID, per scholarship
+    """
+
+    def __init__(self, reviews: pd.DataFrame | None = None):
+        self._ratings: dict[str, dict] = {}
+        if reviews is not None:
+            self.add(reviews)
+
+    def __contains__(self, key: tuple) -> bool:
+        uid, scholarship = key
+        return uid in self._ratings.get(scholarship, {})
+
+    def add(self, reviews: pd.DataFrame):
+        """
+        Indexes reviews, which follow the reviews already indexed
+        """
+        reviews = reviews.loc[reviews["UID"].notna()]
+        for uid, scholarship, rating in zip(
+            reviews["UID"], reviews["Scholarship"], reviews["Rating"]
+        ):
+            self._ratings.setdefault(scholarship, {}).setdefault(uid, rating)
+
+    def rating(self, uid, scholarship: str):
+        """
+        Rating of the student for scholarship
+
+        Returns
+        -------
+        The rating, NO_REVIEW if the student was not reviewed for it
+        """
+        return self._ratings.get(scholarship, {}).get(uid, NO_REVIEW)
+
+    def reviewed(self, uids: list, scholarship: str):
+        """
+        First of uids already reviewed for scholarship
+
+        Returns
+        -------
+        UID of the student, None if none of them were reviewed
+        """
+        ratings = self._ratings.get(scholarship, {})
+        return next((uid for uid in uids if uid in ratings), None)
+
+    def count(self, scholarship: str) -> int:
+        """
+        Number of students reviewed for scholarship
+        """
+        return len(self._ratings.get(scholarship, {}))
+
+    def column(self, uids: pd.Series, scholarship: str) -> pd.Series:
+        """
+        Rating of each student for scholarship
+
+        Returns
+        -------
+        Rating of each student, sharing the index of uids, NO_REVIEW for students without a
+        review
+        """
+        ratings = self._ratings.get(scholarship, {})
+        reviewed = uids.isin(list(ratings))
+        column = pd.Series(NO_REVIEW, index=uids.index, dtype=object)
+        column[reviewed] = uids[reviewed].map(ratings).astype(object)
+
+        return column
+
+
+def vote_counts(reviews: pd.DataFrame) -> pd.DataFrame:
+    """
+    Number of Yes, No and Maybe ratings, and of reviews, of each student for each scholarship
+    they were reviewed for
+
+    Returns
+    -------
+    Counts indexed by (UID, Scholarship) with a column for each of VOTE_COUNTS, students
+    without a review are left out
+    """
+    ratings = reviews["Rating"]
+    counts = pd.DataFrame(
+        {rating: (ratings == rating).astype(int) for rating in RATING_VOTES},
+        index=reviews.index,
+    )
+    counts["Reviews"] = 1
+
+    return counts.groupby([reviews["UID"], reviews["Scholarship"]]).sum()
+
+
+def vote_scores(counts: pd.DataFrame) -> pd.Series:
+    """
+    Vote score of each row of counts from vote_counts, Yes is a vote for, No a vote against
+    and any other rating counts as reviewed without a vote
+    """
+    scores = sum(counts[rating] * vote for rating, vote in RATING_VOTES.items())
+    return scores.rename("Score")
+
+
+def vote_getters(
+    students: pd.DataFrame, tally: pd.Series, scholarship: str
+) -> pd.DataFrame:
+    """
+    Students reviewed for scholarship without a negative vote score, highest score first, with
+    their score inserted as the first column, Vote Score
+
+    Parameters
+    ----------
+    students : pd.DataFrame
+        Students to rank, with a UID column
+    tally : pd.Series
+        Vote scores indexed by (UID, Scholarship), from VoteTally.scores
+    scholarship : str
+        Name of the scholarship to rank the students for
+    """
+    scores = tally[tally.index.get_level_values("Scholarship") == scholarship]
+    scores = scores.droplevel("Scholarship")
+
+    getters = students.copy()
+    getters.insert(0, "Vote Score", getters["UID"].map(scores))
+    # Students without a review have no score, so they are dropped with the negative scores
+    getters = getters.loc[getters["Vote Score"] >= 0]
+    getters["Vote Score"] = getters["Vote Score"].astype(int)
+
+    return getters.sort_values(by=["Vote Score"], ascending=False, kind="stable")
@@ -6,24 +6,24 @@ import os
 
 import pandas as pd
 from scholarship_app.utils.output import get_appdata_path
-from scholarship_app.managers.sharepoint.sharepoint_session import SharepointSession
+from scholarship_app.managers.storage.storage_backend import StorageBackend
 
 
-def read_rows(file_path, sharepoint: SharepointSession):
+def read_rows(file_path, storage: StorageBackend):
     """
     Reads Excel spreadsheet and returns the rows
     """
-    sharepoint.download(f"{file_path}", os.path.dirname(file_path))
+    storage.download(f"{file_path}", os.path.dirname(file_path))
     excel = pd.read_excel(get_appdata_path(file_path))
     return excel.head()
 
 
-def write_rows(dataframe, file_path, sheet_name, sharepoint: SharepointSession):
+def write_rows(dataframe, file_path, sheet_name, storage: StorageBackend):
     """
     Writes the rows of a dataframe to the file_path with sheet_name
     """
     dataframe.to_excel(get_appdata_path(file_path), sheet_name=sheet_name, index=False)
-    sharepoint.upload(file_path, f"{os.path.dirname(file_path)}")
+    storage.upload(file_path, f"{os.path.dirname(file_path)}")
 
 
 def edit_row(dataframe, row_index, column_names_and_values):
@@ -7,7 +7,6 @@ Downloads files
 """
 import os.path
 import re
-import time
 from os.path import exists
 from re import Pattern
 
@@ -58,9 +57,6 @@ def logged_in(
     if manager is None:
         manager = get_manager()
 
-    # Work around for caching not working with cookie manager
-    time.sleep(0.2)
-
     if creds is None:
         cookies = {}
         # Work around for `duplicate` cookie managers
@@ -68,9 +64,8 @@ def logged_in(
             cookies = manager.get_all()
         except DuplicateWidgetID:
             pass
-        # Work around for caching not working with cookie manager
-        if cookies == {}:
-            return logged_in(manager)
+        # An empty result means the browser has not sent its cookies yet. It reruns the script
+        # once it has, so report logged out for this run rather than waiting.
         if "cred" not in cookies:
             return False
         creds = manager.get("cred")
@@ -0,0 +1,111 @@
+"""
+Times allocating the awards of every scholarship at once in scholarship_app.utils.allocation,
+greedily with repair and exactly, against the previous per scholarship top N, which ranks each
+scholarship on its own so the same student can top several awards.
+"""
+import numpy as np
+import typer
+from scholarship_app.utils.allocation import (
+    allocate_exact,
+    allocate_greedy,
+    award_weights,
+    repair,
+    score_matrix,
+)
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+)
+from tests.benchmark.timing import summarize, time_call
+from tests.reference import vote_tally
+
+app = typer.Typer()
+
+
+def top_per_scholarship(scores: np.ndarray, eligible: np.ndarray, capacity):
+    """
+    Previous export, the top Total Amount vote getters of each scholarship ranked on its own
+    """
+    awarded = np.zeros(scores.shape, dtype=bool)
+    ranked = np.where(eligible & (np.nan_to_num(scores, nan=-1) >= 0), scores, np.nan)
+    for scholarship, awards in enumerate(capacity):
+        column = ranked[:, scholarship]
+        reviewed = np.nonzero(~np.isnan(column))[0]
+        order = reviewed[np.argsort(-column[reviewed], kind="stable")]
+        awarded[order[:awards], scholarship] = True
+    return awarded
+
+
+def report(label: str, awarded: np.ndarray, scores: np.ndarray, limit: int):
+    """
+    Prints the awards, total vote score and students over the limit of an allocation
+    """
+    print(
+        f"{label:<32} {awarded.sum():6d} awards   score {int(scores[awarded].sum()):7d}"
+        f"   {int((awarded.sum(axis=1) > limit).sum()):5d} students over the limit"
+    )
+
+
+@app.command()
+# pylint: disable-next=too-many-arguments,too-many-locals
+def run(
+    students: int = typer.Option(5000, help="Students in the master sheet"),
+    scholarships: int = typer.Option(300, help="Scholarships allocated"),
+    reviews: int = typer.Option(200000, help="Reviews left by all reviewers"),
+    eligibility: float = typer.Option(0.3, help="Chance a student is eligible"),
+    limit: int = typer.Option(1, help="Scholarships per student"),
+    exact_limit: int = typer.Option(
+        20000, help="Candidate pairs up to which the exact solver is timed"
+    ),
+    repeat: int = typer.Option(3, help="Runs timed per allocation"),
+):
+    """
+    Runs the allocation benchmark
+    """
+    rng = np.random.default_rng(0)
+    student_data = generate_students(students)
+    names = generate_scholarships(scholarships)
+    scores = score_matrix(
+        student_data["UID"],
+        names,
+        vote_tally([generate_reviews(reviews, student_data, names)]),
+    )
+    eligible = rng.random(scores.shape) < eligibility
+    capacity = rng.integers(1, 6, scholarships)
+    limits = np.full(students, limit)
+
+    with np.errstate(invalid="ignore"):
+        candidates = eligible & (scores >= 0)
+    weights = award_weights(scores, candidates, capacity, limits)
+    print(f"{students} students x {scholarships} scholarships")
+    print(f"{candidates.sum()} candidate pairs, {capacity.sum()} awards")
+
+    top_samples, top = time_call(
+        lambda: top_per_scholarship(scores, eligible, capacity), repeat
+    )
+    greedy_samples, greedy = time_call(
+        lambda: allocate_greedy(weights, capacity, limits), repeat
+    )
+    repair_samples, repaired = time_call(
+        lambda: repair(weights, greedy, capacity, limits), repeat
+    )
+
+    summarize("top N per scholarship", top_samples)
+    summarize("greedy", greedy_samples)
+    summarize("repair", repair_samples)
+    if candidates.sum() <= exact_limit:
+        exact_samples, exact = time_call(
+            lambda: allocate_exact(weights, capacity, limits), 1
+        )
+        summarize("exact", exact_samples)
+
+    report("top N per scholarship", top, scores, limit)
+    report("greedy", greedy, scores, limit)
+    report("greedy with repair", repaired, scores, limit)
+    if candidates.sum() <= exact_limit:
+        report("exact", exact, scores, limit)
+
+
+if __name__ == "__main__":
+    app(prog_name="allocation")
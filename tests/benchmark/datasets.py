@@ -0,0 +1,62 @@
+"""
+Synthetic students, scholarships and reviews for benchmarks
+"""
+import numpy as np
+import pandas as pd
+
+RATINGS = ("Yes", "No", "Maybe")
+
+
+def generate_students(count: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Students with a UID and a few numeric and categorical criteria columns
+    """
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame(
+        {
+            "UID": np.arange(1000000, 1000000 + count),
+            "Name": [f"Student {index}" for index in range(count)],
+            "Cumulative GPA": rng.uniform(2.0, 4.0, count).round(2),
+            "ACT Composite": rng.integers(16, 37, count),
+            "SAT Combined": rng.integers(900, 1601, count),
+            "Major": rng.choice(["EE", "CE", "ME", "BME"], count),
+        }
+    )
+
+
+def generate_scholarships(count: int) -> list[str]:
+    """
+    Scholarship names
+    """
+    return [f"Scholarship {index}" for index in range(count)]
+
+
+def generate_reviews(
+    count: int, students: pd.DataFrame, scholarships: list[str], seed: int = 0
+) -> pd.DataFrame:
+    """
+    Reviews of random students for random scholarships, including repeat reviews and reviews of
+    UIDs which are not in students
+    """
+    rng = np.random.default_rng(seed)
+    uids = students["UID"].to_numpy()
+    # A few reviews of students which have since been removed
+    uids = np.append(uids, np.arange(1, max(2, len(uids) // 100)))
+    return pd.DataFrame(
+        {
+            "UID": rng.choice(uids, count),
+            "Scholarship": rng.choice(scholarships, count),
+            "Rating": rng.choice(RATINGS, count),
+            "Additional Feedback": "",
+        }
+    )
+
+
+def reviewer_sheets(reviews: pd.DataFrame, reviewers: int) -> list[pd.DataFrame]:
+    """
+    Splits the reviews between reviewers, as the review sheets are downloaded
+    """
+    return [
+        reviews.iloc[rows].reset_index(drop=True)
+        for rows in np.array_split(np.arange(len(reviews)), reviewers)
+    ]
@@ -0,0 +1,66 @@
+"""
+Compares exporting the master sheet with DataFrame.to_excel against the streamed xlsx written by
+scholarship_app.managers.export, by time and peak memory allocated while writing, and times the
+CSV and Parquet exports.
+"""
+import tracemalloc
+from functools import partial
+from io import BytesIO
+import pandas as pd
+import typer
+from scholarship_app.managers.export import ExportFormat, write_export
+from tests.benchmark.datasets import generate_students
+from tests.benchmark.timing import summarize, time_call
+
+app = typer.Typer()
+
+
+def to_excel_bytes(frame: pd.DataFrame) -> bytes:
+    """
+    Previous implementation, which wrote the whole table through pandas' openpyxl writer
+    """
+    stream = BytesIO()
+    frame.to_excel(stream, index=False)
+    return stream.getvalue()
+
+
+def peak_memory(function) -> int:
+    """
+    Largest number of bytes allocated at once while function runs
+    """
+    tracemalloc.start()
+    try:
+        function()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+@app.command()
+def run(
+    students: int = typer.Option(10000, help="Students in the exported table"),
+    answers: int = typer.Option(10, help="Extra text columns in the exported table"),
+    repeat: int = typer.Option(3, help="Runs timed per export"),
+):
+    """
+    Runs the export benchmark
+    """
+    table = generate_students(students)
+    for index in range(answers):
+        table[f"Answer {index}"] = "answer " * 20
+
+    exports = {
+        "to_excel": partial(to_excel_bytes, table),
+        "streamed xlsx": partial(write_export, table, ExportFormat.XLSX),
+        "csv": partial(write_export, table, ExportFormat.CSV),
+        "parquet": partial(write_export, table, ExportFormat.PARQUET),
+    }
+    for label, export in exports.items():
+        samples, data = time_call(export, repeat)
+        peak = peak_memory(export)
+        summarize(f"{label} ({len(data) // 1024} KiB)", samples)
+        print(f"{'':<32} peak allocated {peak / 2**20:8.1f} MiB")
+
+
+if __name__ == "__main__":
+    app(prog_name="export")
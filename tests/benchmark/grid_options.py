@@ -0,0 +1,58 @@
+"""
+Compares building the homepage grid options with GridOptionsBuilder on every rerun against
+copying the options cached per schema in scholarship_app.components.home.grid_options. Both
+include encoding the JsCode in the options, which AgGrid does on every call.
+"""
+import typer
+from st_aggrid import JsCode
+from st_aggrid.shared import walk_gridOptions
+from scholarship_app.components.home.columns import preview_long_text
+from scholarship_app.components.home.grid_options import (
+    build_grid_options,
+    grid_options,
+)
+from tests.benchmark.datasets import generate_students
+from tests.benchmark.timing import summarize, time_call
+from tests.reference import build_per_rerun
+
+app = typer.Typer()
+
+
+def encode(options: dict) -> dict:
+    """
+    Encodes the JsCode in options as AgGrid does
+    """
+    walk_gridOptions(
+        options, lambda value: value.js_code if isinstance(value, JsCode) else value
+    )
+    return options
+
+
+@app.command()
+def run(
+    rows: int = typer.Option(50, help="Rows on the grid page"),
+    columns: int = typer.Option(40, help="Extra text columns sent to the grid"),
+    repeat: int = typer.Option(200, help="Reruns timed per implementation"),
+):
+    """
+    Runs the grid options benchmark
+    """
+    page = generate_students(rows)
+    for index in range(columns):
+        page[f"Answer {index}"] = "answer"
+    page.insert(0, "Select All", None)
+    page, _ = preview_long_text(page)
+    selected = [0, 2, 4]
+
+    build_grid_options.cache_clear()
+    rebuilt, _ = time_call(lambda: encode(build_per_rerun(page, selected)), repeat)
+    cached, _ = time_call(
+        lambda: encode(grid_options(page, selected, "Scholarship")), repeat
+    )
+
+    summarize(f"built per rerun ({page.shape[1]} columns)", rebuilt)
+    summarize(f"cached per schema ({page.shape[1]} columns)", cached)
+
+
+if __name__ == "__main__":
+    app(prog_name="grid_options")
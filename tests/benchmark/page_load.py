@@ -0,0 +1,211 @@
+"""
+Measures how long pages take to load for a signed in user, from requesting the page until its
+last script run finishes. Requires the streamlit server to be running (see tests.cli --test
+benchmark).
+
+Pages are requested over streamlit's websocket protocol, the way the browser requests them, so
+no browser is needed. The browser's part in signing in is its reply to the cookie component,
+which is sent once each run finishes and reruns the script, as the component's reply does.
+Rendering in the browser is not included.
+
+Each page is loaded as a new browser session, which is when credentials are restored from the
+cookie, then again within the same session, as navigating through the sidebar does, and as a
+new signed out session.
+"""
+import asyncio
+import json
+import time
+import typer
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from tornado.websocket import websocket_connect
+from scholarship_app.managers.sharepoint.sharepoint_session import (
+    COOKIE_CREDENTIALS_KEY,
+)
+from tests.benchmark.timing import summarize
+
+STREAM_URL = "ws://localhost:9000/_stcore/stream"
+PAGES = ("Account", "Export Data", "Download File")
+# Seconds to wait for each message from the server
+MESSAGE_TIMEOUT = 30
+
+app = typer.Typer()
+
+
+class BrowserSession:
+    """
+    A browser session connected to the streamlit server, holding the browser's cookies
+
+    Attributes
+    ----------
+    cookies : dict
+        Cookies of the browser, the cookie component reads and writes them
+    page_hashes : dict[str, str]
+        Script hash of each page, by its name
+    """
+
+    def __init__(self, cookies: dict, page_hashes: dict[str, str] | None = None):
+        self.cookies = cookies
+        self.page_hashes = {} if page_hashes is None else page_hashes
+        self._replies = {}
+        self._cached = {}
+        self._connection = None
+
+    async def _request(self, page: str):
+        """
+        Asks the server to run the page with the component replies sent so far
+        """
+        message = BackMsg()
+        message.rerun_script.page_script_hash = self.page_hashes.get(page, "")
+        for widget_id, value in self._replies.items():
+            widget = message.rerun_script.widget_states.widgets.add()
+            widget.id = widget_id
+            widget.json_value = json.dumps(value)
+        await self._connection.write_message(message.SerializeToString(), binary=True)
+
+    async def _receive(self) -> ForwardMsg:
+        """
+        Next message from the server, resolving messages the server sent by reference
+        """
+        data = await asyncio.wait_for(self._connection.read_message(), MESSAGE_TIMEOUT)
+        if data is None:
+            raise ConnectionError("The streamlit server closed the session")
+
+        message = ForwardMsg()
+        message.ParseFromString(data)
+        if message.WhichOneof("type") == "ref_hash":
+            return self._cached[message.ref_hash]
+        if message.hash:
+            self._cached[message.hash] = message
+        return message
+
+    def _reply(self, element) -> bool:
+        """
+        Answers a cookie component as the browser would
+
+        Returns
+        -------
+        Whether the reply changed, which reruns the script
+        """
+        if element.WhichOneof("type") != "component_instance":
+            return False
+
+        args = json.loads(element.component_instance.json_args)
+        if args.get("method") == "getAll":
+            value = dict(self.cookies)
+        elif args.get("method") == "set":
+            # The browser reads JSON cookies back as objects
+            self.cookies[args["cookie"]] = json.loads(args["value"])
+            value = True
+        elif args.get("method") == "delete":
+            self.cookies.pop(args["cookie"], None)
+            value = True
+        else:
+            return False
+
+        widget_id = element.component_instance.id
+        if self._replies.get(widget_id) == value:
+            return False
+        self._replies[widget_id] = value
+        return True
+
+    async def load(self, page: str = "") -> list:
+        """
+        Loads the page, the main script by default, answering the cookie component until a run
+        finishes without new replies
+
+        Returns
+        -------
+        Elements rendered by the last run
+        """
+        if self._connection is None:
+            self._connection = await websocket_connect(STREAM_URL)
+
+        await self._request(page)
+        elements = []
+        while True:
+            message = await self._receive()
+            kind = message.WhichOneof("type")
+            if kind == "delta" and message.delta.WhichOneof("type") == "new_element":
+                elements.append(message.delta.new_element)
+            elif kind == "pages_changed":
+                self.page_hashes.update(
+                    {
+                        app_page.page_name: app_page.page_script_hash
+                        for app_page in message.pages_changed.app_pages
+                    }
+                )
+            elif kind == "script_finished":
+                # Every component is answered, as each one replies in the browser
+                replied = [self._reply(element) for element in elements]
+                if not any(replied):
+                    return elements
+                elements = []
+                await self._request(page)
+
+    def close(self):
+        """
+        Disconnects from the server
+        """
+        if self._connection is not None:
+            self._connection.close()
+
+
+async def time_load(session: BrowserSession, page: str) -> float:
+    """
+    Seconds taken to load page in session, checking it rendered a header
+    """
+    start = time.perf_counter()
+    elements = await session.load(page)
+    elapsed = time.perf_counter() - start
+
+    if not any(element.WhichOneof("type") == "heading" for element in elements):
+        raise AssertionError(f"{page} did not render a header")
+    return elapsed
+
+
+async def benchmark(repeat: int, hawk_id: str, password: str):
+    """
+    Times each page in a new session, the same session and signed out
+    """
+    main = BrowserSession({})
+    await main.load()
+    main.close()
+    cookies = {COOKIE_CREDENTIALS_KEY: {"username": hawk_id, "password": password}}
+
+    for page in PAGES:
+        samples = []
+        for _ in range(repeat):
+            session = BrowserSession(dict(cookies), main.page_hashes)
+            samples.append(await time_load(session, page))
+            session.close()
+        summarize(f"{page} (new session)", samples)
+
+        session = BrowserSession(dict(cookies), main.page_hashes)
+        await session.load(page)
+        samples = [await time_load(session, page) for _ in range(repeat)]
+        session.close()
+        summarize(f"{page} (same session)", samples)
+
+    samples = []
+    for _ in range(repeat):
+        session = BrowserSession({}, main.page_hashes)
+        samples.append(await time_load(session, "Account"))
+        session.close()
+    summarize("Account (signed out)", samples)
+
+
+@app.command()
+def run(
+    repeat: int = typer.Option(10, help="Loads per page"),
+    hawk_id: str = typer.Option("benchmark@uiowa.edu"),
+    password: str = typer.Option("benchmark"),
+):
+    """
+    Runs the page load benchmark against the running server
+    """
+    asyncio.run(benchmark(repeat, hawk_id, password))
+
+
+if __name__ == "__main__":
+    app(prog_name="page_load")
@@ -0,0 +1,128 @@
+"""
+Times loading every reviewer's reviews with scholarship_app.managers.review_corpus, with a cold
+and a warm parsed file cache, against the previous winners page, which read every review sheet
+in appdata one at a time, and against loading each reviewer's log in turn. Reviewers are kept
+in a local storage directory, with the sheets of reviewers from an earlier cycle left in appdata.
+"""
+import os
+import shutil
+import tempfile
+import pandas as pd
+import typer
+from scholarship_app.managers.review_corpus import (
+    get_parse_pool,
+    get_parsed_cache,
+    load_review_corpus,
+)
+from scholarship_app.managers.review_log import (
+    LOG_FOLDER,
+    ReviewLog,
+    list_reviewers,
+    local_path,
+    snapshot_path,
+)
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.utils.output import get_appdata_path
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+)
+from tests.benchmark.timing import summarize, time_call
+from tests.benchmark.vote_tally import reviewer_id, write_logs
+
+app = typer.Typer()
+
+
+def read_appdata_sheets() -> tuple[pd.DataFrame, int]:
+    """
+    Previous winners page, which read every review sheet in appdata whether or not its reviewer
+    is still listed
+
+    Returns
+    -------
+    The reviews and the number of sheets read
+    """
+    folder = get_appdata_path("data")
+    sheets = [file for file in os.listdir(folder) if file.endswith("Reviews.xlsx")]
+    frames = [pd.read_excel(os.path.join(folder, file)) for file in sheets]
+    return pd.concat(frames, ignore_index=True), len(sheets)
+
+
+def read_each_log(storage: LocalStorage) -> pd.DataFrame:
+    """
+    Loads each listed reviewer's log in turn
+    """
+    return pd.concat(
+        [
+            ReviewLog.load(storage, hawk_id).reviews
+            for hawk_id in list_reviewers(storage)
+        ],
+        ignore_index=True,
+    )
+
+
+def cold_corpus(storage: LocalStorage):
+    """
+    Loads the corpus with nothing in the parsed file cache
+    """
+    get_parsed_cache().clear()
+    return load_review_corpus(storage)
+
+
+@app.command()
+# pylint: disable-next=too-many-arguments,too-many-locals
+def run(
+    students: int = typer.Option(5000, help="Students in the master sheet"),
+    reviews: int = typer.Option(50000, help="Reviews left by all reviewers"),
+    reviewers: int = typer.Option(10, help="Reviewers the reviews are split between"),
+    stale: int = typer.Option(5, help="Sheets left in appdata by an earlier cycle"),
+    submitted: int = typer.Option(10, help="Students reviewed per submit"),
+    repeat: int = typer.Option(3, help="Runs timed per implementation"),
+):
+    """
+    Runs the review corpus benchmark
+    """
+    student_data = generate_students(students)
+    scholarships = generate_scholarships(10)
+    review_data = generate_reviews(reviews, student_data, scholarships)
+    stale_ids = [reviewer_id(reviewers + reviewer) for reviewer in range(stale)]
+
+    with tempfile.TemporaryDirectory() as root:
+        logs = write_logs(root, review_data, reviewers)
+        for hawk_id in stale_ids:
+            storage = LocalStorage(root, hawk_id)
+            ReviewLog(hawk_id, review_data.iloc[:1000]).write_snapshot(storage)
+            os.remove(os.path.join(root, "data", f"{hawk_id}_Reviews.xlsx"))
+        storage = logs[0][0]
+        get_parse_pool().submit(int).result()
+
+        appdata_samples, (_, sheets) = time_call(read_appdata_sheets, repeat)
+        each_samples, expected = time_call(lambda: read_each_log(storage), repeat)
+        cold_samples, _ = time_call(lambda: cold_corpus(storage), repeat)
+        warm_samples, corpus = time_call(lambda: load_review_corpus(storage), repeat)
+        if not corpus.reviews["UID"].astype(int).equals(expected["UID"].astype(int)):
+            raise AssertionError("Review corpus does not match loading each log")
+
+        logs[-1][1].append(
+            logs[-1][0],
+            generate_reviews(submitted, student_data, [scholarships[0]], seed=1),
+        )
+        submit_samples, corpus = time_call(lambda: load_review_corpus(storage), 1)
+
+        print(f"{sheets} sheets in appdata, {len(corpus.generations)} listed reviewers")
+        summarize(f"read appdata sheets ({sheets})", appdata_samples)
+        summarize("load each log", each_samples)
+        summarize("corpus, cold cache", cold_samples)
+        summarize("corpus, warm cache", warm_samples)
+        summarize(f"corpus after a submit ({submitted})", submit_samples)
+
+        for hawk_id in [
+            reviewer_id(reviewer) for reviewer in range(reviewers)
+        ] + stale_ids:
+            os.remove(local_path(snapshot_path(hawk_id)))
+            shutil.rmtree(get_appdata_path(f"{LOG_FOLDER}/{hawk_id}"), True)
+
+
+if __name__ == "__main__":
+    app(prog_name="review_corpus")
@@ -0,0 +1,88 @@
+"""
+Compares building the Review column of the home page with a per student scan of the reviews
+and with the keyed join against the (UID, Scholarship) index in scholarship_app.utils.reviews,
+and checks all give the same column. Also compares checking the students selected for a submit for
+existing reviews with a scan per student against the index.
+"""
+import pandas as pd
+import typer
+from scholarship_app.utils.reviews import ReviewIndex
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+)
+from tests.benchmark.timing import summarize, time_call
+from tests.reference import review_column, review_column_scan
+
+app = typer.Typer()
+
+
+def reviewed_scan(user_recommendations: pd.DataFrame, uids: list, scholarship: str):
+    """
+    Previous duplicate check of a submit, which filtered every review for each selected student
+    """
+    for uid in uids:
+        if (
+            len(
+                user_recommendations.loc[
+                    (user_recommendations["UID"] == uid)
+                    & (user_recommendations["Scholarship"] == scholarship)
+                ]
+            )
+            > 0
+        ):
+            return uid
+    return None
+
+
+@app.command()
+def run(
+    students: int = typer.Option(5000, help="Students in the master sheet"),
+    reviews: int = typer.Option(20000, help="Reviews left by the user"),
+    scholarships: int = typer.Option(10, help="Scholarships reviewed"),
+    repeat: int = typer.Option(5, help="Runs of the keyed join, the scan runs once"),
+    selected: int = typer.Option(200, help="Students selected for a submit"),
+):
+    """
+    Runs the review join benchmark
+    """
+    student_data = generate_students(students)
+    scholarship_names = generate_scholarships(scholarships)
+    review_data = generate_reviews(reviews, student_data, scholarship_names)
+    scholarship = scholarship_names[0]
+
+    scan_samples, scanned = time_call(
+        lambda: review_column_scan(student_data, review_data, scholarship), 1
+    )
+    join_samples, joined = time_call(
+        lambda: review_column(student_data["UID"], review_data, scholarship), repeat
+    )
+
+    index_build_samples, index = time_call(lambda: ReviewIndex(review_data), repeat)
+    index_samples, indexed = time_call(
+        lambda: index.column(student_data["UID"], scholarship), repeat
+    )
+
+    if joined.tolist() != scanned or indexed.tolist() != scanned:
+        raise AssertionError("Keyed join does not match the per student scan")
+
+    # Students nobody reviewed, so every one of them is checked
+    unreviewed = list(range(-int(selected), 0))
+    check_scan_samples, _ = time_call(
+        lambda: reviewed_scan(review_data, unreviewed, scholarship), 1
+    )
+    check_index_samples, _ = time_call(
+        lambda: index.reviewed(unreviewed, scholarship), repeat
+    )
+
+    summarize(f"per student scan ({students}x{reviews})", scan_samples)
+    summarize(f"keyed join ({students}x{reviews})", join_samples)
+    summarize(f"index build ({reviews} reviews)", index_build_samples)
+    summarize(f"index column ({students}x{reviews})", index_samples)
+    summarize(f"duplicate scan ({selected}x{reviews})", check_scan_samples)
+    summarize(f"duplicate index ({selected}x{reviews})", check_index_samples)
+
+
+if __name__ == "__main__":
+    app(prog_name="review_join")
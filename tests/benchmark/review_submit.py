@@ -0,0 +1,75 @@
+"""
+Compares submitting reviews by rewriting and uploading the reviewer's whole review sheet against
+appending a segment to their review log in scholarship_app.managers.review_log, as the number of
+reviews the reviewer has already left grows. Both upload to a local storage directory.
+"""
+import os
+import tempfile
+from functools import partial
+import pandas as pd
+import typer
+from scholarship_app.managers.review_log import ReviewLog, local_path, snapshot_path
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+)
+from tests.benchmark.timing import summarize, time_call
+
+app = typer.Typer()
+
+HAWK_ID = "review-submit-benchmark"
+
+
+def submit_rewrite(
+    storage: LocalStorage, reviews: pd.DataFrame, new_reviews: pd.DataFrame
+) -> pd.DataFrame:
+    """
+    Previous implementation, which wrote every review to the sheet and uploaded it
+    """
+    reviews = pd.concat([reviews, new_reviews], ignore_index=True)
+    reviews.to_excel(local_path(snapshot_path(HAWK_ID)), index=False)
+    storage.upload(snapshot_path(HAWK_ID), "/data/")
+    return reviews
+
+
+@app.command()
+def run(
+    history: list[int] = typer.Option(
+        [1000, 10000, 50000], help="Reviews already left by the reviewer"
+    ),
+    submitted: int = typer.Option(10, help="Students reviewed per submit"),
+    repeat: int = typer.Option(5, help="Submits timed per implementation"),
+):
+    """
+    Runs the review submit benchmark
+    """
+    students = generate_students(max(history))
+    scholarships = generate_scholarships(10)
+    new_reviews = generate_reviews(submitted, students, scholarships, seed=1)
+
+    with tempfile.TemporaryDirectory() as root:
+        storage = LocalStorage(root, HAWK_ID)
+        for count in history:
+            reviews = generate_reviews(count, students, scholarships)
+            rewrite_samples, _ = time_call(
+                partial(submit_rewrite, storage, reviews, new_reviews), repeat
+            )
+
+            review_log = ReviewLog(HAWK_ID, reviews)
+            review_log.write_snapshot(storage)
+            append_samples, _ = time_call(
+                partial(review_log.append, storage, new_reviews), repeat
+            )
+            for segment in review_log.segments:
+                os.remove(local_path(segment))
+
+            summarize(f"rewrite sheet ({count} reviews)", rewrite_samples)
+            summarize(f"append segment ({count} reviews)", append_samples)
+
+    os.remove(local_path(snapshot_path(HAWK_ID)))
+
+
+if __name__ == "__main__":
+    app(prog_name="review_submit")
@@ -0,0 +1,77 @@
+"""
+Compares binning the points of the home page distribution graph with a scan of the bins for
+every point against the grouped count in scholarship_app.components.home.graphing, and checks
+both give the same bins and marker weights. With --render, also times drawing and encoding
+the graph as each plot type, which is what a figure cache miss in the distribution expander
+pays for.
+"""
+from functools import partial
+import numpy as np
+import pandas as pd
+import typer
+from scholarship_app.components.home.graphing import HEXBIN, HISTOGRAM, SCATTER
+from scholarship_app.components.home.plotting import dynamic_fig
+from tests.benchmark.datasets import generate_students
+from tests.benchmark.timing import summarize, time_call
+from tests.reference import weighted_bins_grouped, weighted_bins_scan
+
+app = typer.Typer()
+
+
+def render(var_df: pd.DataFrame, x_axis: str, y_axis: str, kind: str) -> int:
+    """
+    Draws the graph as kind and encodes it as a PNG, as a figure cache miss does
+
+    Returns
+    -------
+    Size of the PNG in bytes
+    """
+    png, _ = dynamic_fig(var_df, x_axis, y_axis, [False, True, "None", kind])
+    return len(png)
+
+
+@app.command()
+# pylint: disable-next=too-many-arguments
+def run(
+    points: list[int] = typer.Option([1000, 10000, 50000], help="Points plotted"),
+    x_axis: str = typer.Option("Cumulative GPA", help="Column on the x axis"),
+    y_axis: str = typer.Option("ACT Composite", help="Column on the y axis"),
+    scan_limit: int = typer.Option(
+        10000, help="Largest number of points the scan is run for"
+    ),
+    repeat: int = typer.Option(5, help="Runs of the grouped count, the scan runs once"),
+    render_plots: bool = typer.Option(
+        False, "--render", help="Also time drawing each plot type"
+    ),
+):
+    """
+    Runs the scatter binning benchmark
+    """
+    for count in points:
+        students = generate_students(count)
+        grouped_samples, grouped = time_call(
+            partial(weighted_bins_grouped, students, x_axis, y_axis, True), repeat
+        )
+
+        if count <= scan_limit:
+            scan_samples, scanned = time_call(
+                partial(weighted_bins_scan, students, x_axis, y_axis, True), 1
+            )
+            if not np.array_equal(grouped, scanned, equal_nan=True):
+                raise AssertionError("Grouped bins do not match the scan")
+            summarize(f"scan of bins ({count} points)", scan_samples)
+
+        summarize(
+            f"grouped count ({count} points, {len(grouped)} bins)", grouped_samples
+        )
+
+        if render_plots:
+            for kind in (SCATTER, HEXBIN, HISTOGRAM):
+                render_samples, _ = time_call(
+                    partial(render, students, x_axis, y_axis, kind), repeat
+                )
+                summarize(f"render {kind} ({count} points)", render_samples)
+
+
+if __name__ == "__main__":
+    app(prog_name="scatter_bins")
@@ -0,0 +1,104 @@
+"""
+Compares fetching N files (folder listing plus a download per file) with the office365 client
+used by SharepointSession against the asyncio client. Runs against its own sharepoint stand-in
+with simulated round trip latency, so no streamlit server is needed.
+"""
+import os
+import tempfile
+import time
+import typer
+from scholarship_app.managers.sharepoint.async_client import (
+    AsyncSharepointClient,
+    run_sync,
+)
+from scholarship_app.managers.sharepoint.sharepoint_session import create_client
+from tests.stand_in import DOCUMENT_LIBRARY, SharepointStandIn, StandInConfig
+from tests.benchmark.timing import summarize
+
+app = typer.Typer()
+
+
+def fetch_serial(client, folder: str, destination: str) -> int:
+    """
+    Lists folder and downloads every file one at a time with the office365 client
+    """
+    files = (
+        client.web.get_folder_by_server_relative_path(folder)
+        .get_files(True)
+        .execute_query()
+    )
+    for file in files:
+        local_path = os.path.join(destination, file.properties["Name"])
+        with open(local_path, "wb") as local_file:
+            file.download(local_file).execute_query()
+
+    return len(files)
+
+
+async def fetch_concurrent(
+    client: AsyncSharepointClient, folder: str, destination: str
+) -> int:
+    """
+    Lists folder and downloads every file concurrently with the asyncio client
+    """
+    files = await client.list_files(folder)
+    await client.download_many(
+        [
+            (file["ServerRelativeUrl"], os.path.join(destination, file["Name"]))
+            for file in files
+        ]
+    )
+
+    return len(files)
+
+
+@app.command()
+def run(
+    files: int = typer.Option(50, help="Files in the fetched folder"),
+    size: int = typer.Option(20000, help="Bytes per file"),
+    latency: float = typer.Option(0.05, help="Simulated round trip latency (s)"),
+    concurrency: int = typer.Option(8, help="Requests in flight for the async client"),
+    repeat: int = typer.Option(5, help="Fetches per client"),
+):
+    """
+    Runs the fetch benchmark
+    """
+    with tempfile.TemporaryDirectory() as root, tempfile.TemporaryDirectory() as out:
+        stand_in = SharepointStandIn(root, config=StandInConfig(latency=latency))
+        os.makedirs(stand_in.library_path("data"))
+        for index in range(files):
+            with open(stand_in.library_path("data", f"{index}.xlsx"), "wb") as file:
+                file.write(os.urandom(size))
+
+        with stand_in:
+            client = create_client(stand_in.url, "benchmark", "benchmark", True)
+            folder = f"{stand_in.site_path}/{DOCUMENT_LIBRARY}/data"
+
+            samples = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                assert fetch_serial(client, folder, out) == files
+                samples.append(time.perf_counter() - start)
+            summarize(f"office365 client ({files} files)", samples)
+
+            async def fetch_all() -> list[float]:
+                async_samples = []
+                async with AsyncSharepointClient(
+                    client, stand_in.url, concurrency
+                ) as async_client:
+                    for _ in range(repeat):
+                        start = time.perf_counter()
+                        assert (
+                            await fetch_concurrent(async_client, folder, out) == files
+                        )
+                        async_samples.append(time.perf_counter() - start)
+                return async_samples
+
+            summarize(
+                f"asyncio client ({files} files, {concurrency} in flight)",
+                run_sync(fetch_all()),
+            )
+
+
+if __name__ == "__main__":
+    app(prog_name="sharepoint_fetch")
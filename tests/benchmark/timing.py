@@ -0,0 +1,27 @@
+"""
+Timing and reporting shared by the benchmarks
+"""
+import statistics
+import time
+
+
+def time_call(function, repeat: int) -> tuple[list[float], any]:
+    """
+    Seconds taken by each of repeat calls to function, and the last result
+    """
+    samples, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        samples.append(time.perf_counter() - start)
+    return samples, result
+
+
+def summarize(label: str, samples: list[float]):
+    """
+    Prints the median and worst sample in milliseconds
+    """
+    print(
+        f"{label:<32} median {statistics.median(samples) * 1000:8.1f} ms"
+        f"   max {max(samples) * 1000:8.1f} ms   (n={len(samples)})"
+    )
@@ -0,0 +1,64 @@
+"""
+Compares ranking the students on the winners page by vote score with the previous scan of
+every reviewer's reviews for each student against the (UID, Scholarship) tally in
+scholarship_app.utils.reviews, and checks both rank the same students.
+"""
+import typer
+from scholarship_app.utils.reviews import vote_getters
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+    reviewer_sheets,
+)
+from tests.benchmark.timing import summarize, time_call
+from tests.reference import same_scores, vote_getters_scan, vote_tally
+
+app = typer.Typer()
+
+
+@app.command()
+# pylint: disable-next=too-many-arguments
+def run(
+    students: int = typer.Option(5000, help="Students in the master sheet"),
+    reviews: int = typer.Option(50000, help="Reviews left by all reviewers"),
+    reviewers: int = typer.Option(10, help="Reviewers the reviews are split between"),
+    scholarships: int = typer.Option(10, help="Scholarships reviewed"),
+    repeat: int = typer.Option(5, help="Runs of the tally, the scan runs once"),
+    scan_students: int = typer.Option(
+        5, help="Students ranked by the scan, as it loops over every review for each"
+    ),
+):
+    """
+    Runs the vote scores benchmark
+    """
+    student_data = generate_students(students)
+    scholarship_names = generate_scholarships(scholarships)
+    all_reviews = reviewer_sheets(
+        generate_reviews(reviews, student_data, scholarship_names), reviewers
+    )
+    scholarship = scholarship_names[0]
+
+    tally_samples, tally = time_call(lambda: vote_tally(all_reviews), repeat)
+    rank_samples, _ = time_call(
+        lambda: vote_getters(student_data, tally, scholarship), repeat
+    )
+
+    scanned_students = student_data.iloc[:scan_students]
+    scan_samples, scanned = time_call(
+        lambda: vote_getters_scan(scanned_students, all_reviews, scholarship), 1
+    )
+    if not same_scores(vote_getters(scanned_students, tally, scholarship), scanned):
+        raise AssertionError("Vote tally does not match the per student scan")
+
+    summarize(f"per student scan ({scan_students}x{reviews})", scan_samples)
+    print(
+        f"{'  projected to ' + str(students) + ' students':<32} "
+        f"{scan_samples[0] * students / max(scan_students, 1):8.1f} s"
+    )
+    summarize(f"tally ({reviews} reviews)", tally_samples)
+    summarize(f"rank ({students} students)", rank_samples)
+
+
+if __name__ == "__main__":
+    app(prog_name="vote_scores")
@@ -0,0 +1,120 @@
+"""
+Compares loading the winners page vote scores by reading every reviewer's review log against
+syncing the saved tally in scholarship_app.managers.vote_tally, when nothing changed and after a
+reviewer submits, and checks both give the same scores. Reviewers are kept in a local storage
+directory.
+"""
+import os
+import shutil
+import tempfile
+import time
+import pandas as pd
+import typer
+from scholarship_app.managers.review_log import (
+    LOG_FOLDER,
+    ReviewLog,
+    list_reviewers,
+    local_path,
+    snapshot_path,
+)
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.managers.vote_tally import synced_tally, tally_path
+from scholarship_app.utils.output import get_appdata_path
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+)
+from tests.benchmark.timing import summarize, time_call
+from tests.reference import same_tally, vote_tally
+
+app = typer.Typer()
+
+
+def reviewer_id(reviewer: int) -> str:
+    """
+    ID of a generated reviewer
+    """
+    return f"vote-tally-benchmark-{reviewer}"
+
+
+def read_every_log(storage: LocalStorage) -> pd.Series:
+    """
+    Previous implementation, which read every reviewer's log and counted all of their reviews
+    """
+    return vote_tally(
+        [
+            ReviewLog.load(storage, hawk_id).reviews
+            for hawk_id in list_reviewers(storage)
+        ]
+    )
+
+
+def write_logs(
+    root: str, review_data: pd.DataFrame, reviewers: int
+) -> list[tuple[LocalStorage, ReviewLog]]:
+    """
+    Splits the reviews between reviewers, writing the snapshot of each into root
+    """
+    logs = []
+    for reviewer in range(reviewers):
+        storage = LocalStorage(root, reviewer_id(reviewer))
+        review_log = ReviewLog(
+            storage.get_hawk_id(), review_data.iloc[reviewer::reviewers]
+        )
+        review_log.write_snapshot(storage)
+        logs.append((storage, review_log))
+
+    return logs
+
+
+@app.command()
+def run(
+    students: int = typer.Option(5000, help="Students in the master sheet"),
+    reviews: int = typer.Option(50000, help="Reviews left by all reviewers"),
+    reviewers: int = typer.Option(10, help="Reviewers the reviews are split between"),
+    submitted: int = typer.Option(10, help="Students reviewed per submit"),
+    repeat: int = typer.Option(5, help="Runs timed per implementation"),
+):
+    """
+    Runs the vote tally benchmark
+    """
+    student_data = generate_students(students)
+    scholarships = generate_scholarships(10)
+    new_reviews = generate_reviews(submitted, student_data, scholarships, seed=1)
+
+    with tempfile.TemporaryDirectory() as root:
+        logs = write_logs(
+            root, generate_reviews(reviews, student_data, scholarships), reviewers
+        )
+        storage = logs[0][0]
+        full_samples, scores = time_call(lambda: read_every_log(storage), repeat)
+        cold_samples, _ = time_call(lambda: synced_tally(storage), 1)
+        warm_samples, tally = time_call(lambda: synced_tally(storage), repeat)
+        if not same_tally(tally.scores, scores):
+            raise AssertionError("Synced tally does not match reading every log")
+
+        submit_samples = []
+        for _ in range(repeat):
+            logs[-1][1].append(logs[-1][0], new_reviews)
+            start = time.perf_counter()
+            tally = synced_tally(storage)
+            submit_samples.append(time.perf_counter() - start)
+        if not same_tally(tally.scores, read_every_log(storage)):
+            raise AssertionError("Synced tally does not match reading every log")
+
+        summarize(f"read every log ({reviews} reviews)", full_samples)
+        summarize("first sync", cold_samples)
+        summarize("sync, nothing changed", warm_samples)
+        summarize(f"sync after a submit ({submitted})", submit_samples)
+
+        os.remove(tally_path(root))
+        for reviewer in range(reviewers):
+            os.remove(local_path(snapshot_path(reviewer_id(reviewer))))
+            shutil.rmtree(
+                get_appdata_path(f"{LOG_FOLDER}/{reviewer_id(reviewer)}"), True
+            )
+
+
+if __name__ == "__main__":
+    app(prog_name="vote_tally")
@@ -5,10 +5,13 @@ import os
 import signal
 import time
 import subprocess
+import tempfile
+from contextlib import contextmanager
 from typing import Optional
 import typer
 from typing_extensions import Annotated
 from dotenv import dotenv_values
+from tests.stand_in import SharepointStandIn, configure_app
 
 CONFIG = dotenv_values(".env")
 if "BROWSER" not in CONFIG:
@@ -19,6 +22,17 @@ CMD = {
     "PLAYWRIGHT_CONFIG": f"--browser {CONFIG['BROWSER']} --tracing retain-on-failure",
     "PYUNIT": 'unittest discover -s tests.unit -p "*.py"',
     "REPORT": "poetry run coverage report && poetry run coverage html",
+    "PAGE_LOAD_BENCHMARK": "python -m tests.benchmark.page_load",
+    "FETCH_BENCHMARK": "python -m tests.benchmark.sharepoint_fetch",
+    "REVIEW_JOIN_BENCHMARK": "python -m tests.benchmark.review_join",
+    "GRID_OPTIONS_BENCHMARK": "python -m tests.benchmark.grid_options",
+    "SCATTER_BINS_BENCHMARK": "python -m tests.benchmark.scatter_bins",
+    "EXPORT_BENCHMARK": "python -m tests.benchmark.export",
+    "REVIEW_SUBMIT_BENCHMARK": "python -m tests.benchmark.review_submit",
+    "VOTE_SCORES_BENCHMARK": "python -m tests.benchmark.vote_scores",
+    "VOTE_TALLY_BENCHMARK": "python -m tests.benchmark.vote_tally",
+    "ALLOCATION_BENCHMARK": "python -m tests.benchmark.allocation",
+    "REVIEW_CORPUS_BENCHMARK": "python -m tests.benchmark.review_corpus",
 }
 
 app = typer.Typer()
@@ -63,14 +77,44 @@ def start_streamlit_subprocess(coverage: bool = True):
     return process
 
 
+@contextmanager
+def sharepoint_target(stand_in: bool):
+    """
+    Points the app at a local sharepoint stand-in for the duration of the context when stand_in
+    is set, otherwise the sharepoint site configured in .env is used.
+    """
+    if not stand_in:
+        yield
+        return
+
+    with tempfile.TemporaryDirectory() as root:
+        with SharepointStandIn(root, port=9100) as server:
+            previous_url = configure_app(server.url, True)
+            print(f"Using SharePoint stand-in at {server.url}")
+            try:
+                yield
+            finally:
+                configure_app(previous_url, False)
+
+
 @app.command()
 def run(
     focus: Annotated[Optional[str], typer.Argument(None)] = None,
     test: Annotated[str, typer.Argument("all")] = "all",
+    stand_in: Annotated[bool, typer.Option("--stand-in")] = False,
 ):
     """
     Main run command interface for cli
     """
+    # Benchmarks always run against the stand-in so results don't depend on the network
+    with sharepoint_target(stand_in or test == "benchmark"):
+        run_tests(focus, test)
+
+
+def run_tests(focus: str | None, test: str):
+    """
+    Runs the selected test suites
+    """
     if test == "all":
         print("Running PyUnit tests:")
         poetry_pyunit_cmd = f"poetry run coverage run --source src -m {CMD['PYUNIT']}"
@@ -111,9 +155,33 @@ def run(
         subprocess.run(
             poetry_pyunit_cmd, stderr=subprocess.STDOUT, check=True, shell=True
         )
+    elif test == "benchmark":
+        streamlit_process = start_streamlit_subprocess(coverage=False)
+
+        try:
+            subprocess.run(
+                f"poetry run {CMD['PAGE_LOAD_BENCHMARK']}", check=True, shell=True
+            )
+        finally:
+            os.killpg(os.getpgid(streamlit_process.pid), signal.SIGTERM)
+
+        # Benchmarks which don't need the streamlit server
+        for benchmark in (
+            "FETCH_BENCHMARK",
+            "REVIEW_JOIN_BENCHMARK",
+            "GRID_OPTIONS_BENCHMARK",
+            "SCATTER_BINS_BENCHMARK",
+            "EXPORT_BENCHMARK",
+            "REVIEW_SUBMIT_BENCHMARK",
+            "VOTE_SCORES_BENCHMARK",
+            "VOTE_TALLY_BENCHMARK",
+            "ALLOCATION_BENCHMARK",
+            "REVIEW_CORPUS_BENCHMARK",
+        ):
+            subprocess.run(f"poetry run {CMD[benchmark]}", check=True, shell=True)
     else:
         typer.echo(
-            "Invalid option, please pick from the following: [all/playwright/pyunit]"
+            "Invalid option, please pick from the following: [all/playwright/pyunit/benchmark]"
         )
 
 
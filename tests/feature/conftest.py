@@ -5,6 +5,7 @@ import time
 from dotenv import dotenv_values
 from playwright.sync_api import sync_playwright
 from scholarship_app.managers.config import ConfigManager
+from scholarship_app.managers.sharepoint.sharepoint_session import STAND_IN_CONFIG_KEY
 
 pytest_plugins = ["tests.feature.fixtures.import_data", "tests.feature.fixtures.login"]
 
@@ -26,4 +27,6 @@ def pytest_sessionstart():
     # setup config with default values
     env_config = dotenv_values(".env")
     config = ConfigManager()
-    config.set_value("sharepoint_url", env_config["SHAREPOINT_URL"])
+    # tests.cli --stand-in has already pointed the config at the local stand-in
+    if not config.data.get(STAND_IN_CONFIG_KEY, False):
+        config.set_value("sharepoint_url", env_config["SHAREPOINT_URL"])
@@ -0,0 +1,196 @@
+"""
+Previous implementations of optimized code, the unit tests and benchmarks check the optimized
+code gives the same results
+"""
+import numpy as np
+import pandas as pd
+from st_aggrid import GridOptionsBuilder
+from scholarship_app.components.home.graphing import bin_points, bin_weights
+from scholarship_app.components.home.grid_options import ROW_STYLE
+from scholarship_app.utils.reviews import NO_REVIEW, vote_counts, vote_scores
+
+
+def weighted_bins_scan(
+    var_df: pd.DataFrame, x_axis: str, y_axis: str, weighted: bool
+) -> np.ndarray:
+    """
+    Previous implementation, which looked through the bins found so far for every point
+    """
+    var_xs = var_df[x_axis][(var_df[x_axis] != 0) & (var_df[y_axis] != 0)]
+    var_ys = var_df[y_axis][(var_df[x_axis] != 0) & (var_df[y_axis] != 0)]
+    weighted_bins = np.zeros((len(var_xs), 3))
+    for i in var_xs.index:
+        found = False
+        for j in range(weighted_bins.shape[0]):
+            if found:
+                continue
+            if weighted_bins[j][0] == 0 or (
+                weighted_bins[j][0] == var_xs[i] and weighted_bins[j][1] == var_ys[i]
+            ):
+                weighted_bins[j][0] = var_xs[i]
+                weighted_bins[j][1] = var_ys[i]
+                weighted_bins[j][2] += 1
+                found = True
+    weighted_bins = weighted_bins[~np.all(weighted_bins == 0, axis=1)]
+    for wbin in weighted_bins:
+        if weighted:
+            wbin[-1] = wbin[-1] - (np.min(weighted_bins[:, 2]) - 1)
+        else:
+            wbin[-1] = 1
+        if wbin[-1] > 10:
+            wbin[-1] = 10
+    return weighted_bins
+
+
+def weighted_bins_grouped(
+    var_df: pd.DataFrame, x_axis: str, y_axis: str, weighted: bool
+) -> np.ndarray:
+    """
+    Bins and marker weights as dynamic_fig computes them
+    """
+    nonzero = (var_df[x_axis] != 0) & (var_df[y_axis] != 0)
+    weighted_bins = bin_points(var_df[x_axis][nonzero], var_df[y_axis][nonzero])
+    weighted_bins[:, 2] = bin_weights(weighted_bins[:, 2], weighted)
+    return weighted_bins
+
+
+def review_column(
+    uids: pd.Series, user_recommendations: pd.DataFrame, scholarship: str
+) -> pd.Series:
+    """
+    Previous implementation, which looked up the user's rating of each student for scholarship
+    with a left join of the students onto the reviews keyed by (UID, Scholarship) on every
+    rerun. When a student was reviewed more than once the first review is used.
+
+    Parameters
+    ----------
+    uids : pd.Series
+        UID of each student, the returned series shares its index
+    user_recommendations : pd.DataFrame
+        The user's reviews, with UID, Scholarship and Rating columns
+    scholarship : str
+        Name of the scholarship to look up ratings for
+
+    Returns
+    -------
+    Rating of each student, NO_REVIEW for students without a review
+    """
+    reviews = user_recommendations.loc[
+        (user_recommendations["Scholarship"] == scholarship)
+        & user_recommendations["UID"].notna(),
+        ["UID", "Rating"],
+    ]
+    ratings = reviews.drop_duplicates("UID", keep="first").set_index("UID")["Rating"]
+
+    reviewed = uids.isin(ratings.index)
+    column = pd.Series(NO_REVIEW, index=uids.index, dtype=object)
+    column[reviewed] = uids[reviewed].map(ratings).astype(object)
+
+    return column
+
+
+def review_column_scan(
+    current_data: pd.DataFrame, user_recommendations: pd.DataFrame, scholarship: str
+) -> list:
+    """
+    Previous implementation, which filtered every review for each student
+    """
+    current_data_reviews = []
+    for _, row in current_data.iterrows():
+        student_recommendation = user_recommendations.loc[
+            (user_recommendations["UID"] == row["UID"])
+            & (user_recommendations["Scholarship"] == scholarship)
+        ]
+        if len(student_recommendation) > 0:
+            current_data_reviews.append(student_recommendation["Rating"].iloc[0])
+        else:
+            current_data_reviews.append("N/A")
+    return current_data_reviews
+
+
+def vote_getters_scan(
+    current_data: pd.DataFrame, all_recommendations: list[pd.DataFrame], scholarship
+) -> pd.DataFrame:
+    """
+    Previous implementation, which looped over every review of every reviewer for each student
+    """
+    current_data = current_data.copy()
+    current_data.insert(0, "Vote Score", None)
+    for student_index, student in current_data.iterrows():
+        for recommender in all_recommendations:
+            for _, recommendation in recommender.iterrows():
+                if (
+                    recommendation["UID"] == student["UID"]
+                    and recommendation["Scholarship"] == scholarship
+                ):
+                    if current_data.at[student_index, "Vote Score"] is None:
+                        current_data.at[student_index, "Vote Score"] = 0
+                    if recommendation["Rating"] == "Yes":
+                        current_data.at[student_index, "Vote Score"] += 1
+                    elif recommendation["Rating"] == "No":
+                        current_data.at[student_index, "Vote Score"] -= 1
+
+    current_data = current_data[current_data["Vote Score"].notna()]
+    current_data = current_data.drop(
+        current_data.loc[current_data["Vote Score"] < 0].index
+    )
+    return current_data.sort_values(by=["Vote Score"], ascending=False)
+
+
+def same_scores(actual: pd.DataFrame, expected: pd.DataFrame) -> bool:
+    """
+    Whether both rank the same students with the same vote scores, ties may be in any order
+    """
+    scores = actual["Vote Score"].sort_index()
+    return actual["Vote Score"].tolist() == expected["Vote Score"].tolist() and (
+        scores.equals(expected["Vote Score"].sort_index().astype(scores.dtype))
+    )
+
+
+def vote_tally(all_reviews: list[pd.DataFrame]) -> pd.Series:
+    """
+    Previous implementation, which summed the vote score of each student for each scholarship
+    over the reviews of every reviewer at once
+
+    Returns
+    -------
+    Vote score indexed by (UID, Scholarship), students without a review are left out
+    """
+    frames = [reviews[["UID", "Scholarship", "Rating"]] for reviews in all_reviews]
+    if not frames:
+        frames = [pd.DataFrame(columns=["UID", "Scholarship", "Rating"])]
+
+    return vote_scores(vote_counts(pd.concat(frames, ignore_index=True)))
+
+
+def same_tally(actual: pd.Series, expected: pd.Series) -> bool:
+    """
+    Whether both have the same vote score for each (UID, Scholarship), whichever dtypes the
+    reviews were read with
+    """
+    actual = actual.sort_index()
+    expected = expected.sort_index()
+    return (
+        actual.tolist() == expected.tolist()
+        and actual.index.tolist() == expected.index.tolist()
+    )
+
+
+def build_per_rerun(rows: pd.DataFrame, pre_selected_rows: list[int]) -> dict:
+    """
+    Previous implementation, which built the homepage grid options from the rows on every rerun
+    """
+    graph_data = GridOptionsBuilder.from_dataframe(rows)
+    graph_data.configure_side_bar()
+    graph_data.configure_default_column(
+        editable=False, groupable=True, sortable=False, filter=False
+    )
+    graph_data.configure_selection(
+        selection_mode="multiple",
+        use_checkbox=True,
+        pre_selected_rows=pre_selected_rows,
+    )
+    graph_data.configure_column("Select All", headerCheckboxSelection=True)
+    options = graph_data.build()
+    options["getRowStyle"] = ROW_STYLE
+    return options
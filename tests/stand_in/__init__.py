@@ -0,0 +1,31 @@
+"""
+Local stand-in for the sharepoint site, used to run the app, e2e tests and benchmarks without
+the real sharepoint tenant.
+"""
+from scholarship_app.managers.config import ConfigManager
+from scholarship_app.managers.sharepoint.sharepoint_session import (
+    SHAREPOINT_CONFIG_KEY,
+    STAND_IN_CONFIG_KEY,
+)
+from tests.stand_in.server import (
+    DOCUMENT_LIBRARY,
+    RequestRecord,
+    SharepointStandIn,
+    StandInConfig,
+)
+
+
+def configure_app(url: str | None, stand_in: bool) -> str | None:
+    """
+    Sets the sharepoint url in the app config
+
+    Returns
+    -------
+    The previously configured sharepoint url
+    """
+    config = ConfigManager()
+    previous = config.data.get(SHAREPOINT_CONFIG_KEY)
+    if url is not None:
+        config.set_value(SHAREPOINT_CONFIG_KEY, url)
+    config.set_value(STAND_IN_CONFIG_KEY, stand_in)
+    return previous
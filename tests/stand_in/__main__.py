@@ -0,0 +1,53 @@
+"""
+Runs the sharepoint stand-in server and points the app config at it.
+
+Example: python -m tests.stand_in --latency 0.2 --bandwidth 1000000
+"""
+import tempfile
+import time
+from typing import Optional
+import typer
+from tests.stand_in import SharepointStandIn, StandInConfig, configure_app
+
+app = typer.Typer()
+
+
+@app.command()
+# pylint: disable-next=too-many-arguments
+def run(
+    root: Optional[str] = typer.Option(None, help="Directory backing the site"),
+    port: int = typer.Option(9100),
+    latency: float = typer.Option(0.0, help="Seconds added to every request"),
+    bandwidth: Optional[int] = typer.Option(None, help="Bytes per second"),
+    failure_rate: float = typer.Option(0.0, help="Probability a request fails"),
+    failure_status: int = typer.Option(503),
+    retry_after: Optional[int] = typer.Option(None),
+    seed: Optional[int] = typer.Option(None),
+    configure: bool = typer.Option(True, help="Point the app config at the stand-in"),
+):
+    """
+    Serves the stand-in until interrupted
+    """
+    root = root or tempfile.mkdtemp(prefix="sharepoint-stand-in-")
+    config = StandInConfig(
+        latency, bandwidth, failure_rate, failure_status, retry_after, seed
+    )
+    stand_in = SharepointStandIn(root, port=port, config=config).start()
+    print(f"SharePoint stand-in serving {root} at {stand_in.url}")
+
+    if configure:
+        previous_url = configure_app(stand_in.url, True)
+
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        stand_in.stop()
+        if configure:
+            configure_app(previous_url, False)
+
+
+if __name__ == "__main__":
+    app(prog_name="stand_in")
@@ -0,0 +1,764 @@
+"""
+Local stand-in for the subset of the SharePoint REST API used by SharepointSession.
+
+Files are stored in a directory on disk (the document library "Shared Documents" is a folder
+inside it). Every request can be delayed to simulate round trip latency and limited bandwidth,
+and failures (throttling, outages) can be injected either randomly or on demand.
+
+Supported endpoints (relative to {site}/_api/):
+    contextInfo                                       form digest
+    $batch                                            OData v3 batch of any of the below
+    Web                                               web properties
+    Web/getFolderByServerRelativePath(...)            folder properties, Files and Folders
+    Web/getFolderByServerRelativeUrl(...)
+    .../Recycle                                       folder removal
+    Web/RootFolder/Folders('a')/Folders/Add('b')      used by ensure_folder_path
+    .../Files, .../Folders                            $filter=substringof(), $orderby, $skip, $top
+    .../Files/add(url=,overwrite=)                    small file uploads
+    Web/getFileByServerRelativePath(...)              file properties
+    Web/getFileByServerRelativeUrl(...)
+    .../$value                                        file download
+    .../startUpload, continueUpload, finishUpload     upload sessions
+"""
+import base64
+import email
+import email.policy
+import hashlib
+import json
+import os
+import random
+import re
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, unquote, urlsplit
+
+DOCUMENT_LIBRARY = "Shared Documents"
+JSON_CONTENT_TYPE = "application/json;odata=verbose;charset=utf-8"
+# Splits a url path on / which are not inside of a function call's parenthesis
+SEGMENT_REGEX = re.compile(r"(?:[^/(]|\([^)]*\))+")
+CALL_REGEX = re.compile(r"^(?P<name>[^(]+)(?:\((?P<args>.*)\))?$", re.DOTALL)
+# The only $filter supported on collections, a case insensitive match on part of the name
+NAME_FILTER_REGEX = re.compile(r"^substringof\('((?:[^']|'')*)',\s*Name\)$")
+
+
+class StandInError(Exception):
+    """
+    Error which is returned to the client as a SharePoint formatted error response
+    """
+
+    def __init__(self, status: int, message: str, headers: dict | None = None):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+        self.headers = headers or {}
+
+    def body(self) -> bytes:
+        """
+        SharePoint error response body
+        """
+        return json.dumps(
+            {
+                "error": {
+                    "code": f"-{self.status}, Microsoft.SharePoint.StandIn",
+                    "message": {"lang": "en-US", "value": self.message},
+                }
+            }
+        ).encode("utf-8")
+
+
+@dataclass
+class StandInResponse:
+    """
+    Response produced for a single (possibly batched) request
+    """
+
+    status: int
+    body: bytes = b""
+    content_type: str = JSON_CONTENT_TYPE
+    headers: dict = field(default_factory=dict)
+
+    @staticmethod
+    def json(payload: dict, status: int = 200) -> "StandInResponse":
+        """
+        Verbose OData JSON response wrapped in the "d" envelope
+        """
+        return StandInResponse(status, json.dumps({"d": payload}).encode("utf-8"))
+
+    @staticmethod
+    def error(error: StandInError) -> "StandInResponse":
+        """
+        SharePoint formatted error response
+        """
+        return StandInResponse(error.status, error.body(), headers=error.headers)
+
+
+@dataclass
+class RequestRecord:
+    """
+    Log entry of a request the stand-in received
+    """
+
+    method: str
+    path: str
+    status: int
+    request_bytes: int
+    response_bytes: int
+    batched: bool = False
+
+
+@dataclass
+class StandInConfig:
+    """
+    Network behaviour of the stand-in
+
+    latency : float
+        Seconds added to every HTTP request (round trip time)
+    bandwidth : int | None
+        Bytes per second used to delay request and response bodies, None for unlimited
+    failure_rate : float
+        Probability (0 - 1) any HTTP request fails with failure_status
+    failure_status : int
+        Status code returned for injected failures
+    retry_after : int | None
+        Value of the Retry-After header on injected failures
+    seed : int | None
+        Seed for the failure injection random generator
+    """
+
+    latency: float = 0.0
+    bandwidth: int | None = None
+    failure_rate: float = 0.0
+    failure_status: int = 503
+    retry_after: int | None = None
+    seed: int | None = None
+
+
+def _parse_arguments(args: str | None) -> tuple[list[str], dict[str, str]]:
+    """
+    Parses the arguments of an OData function call, ex: add(url='a.xlsx',overwrite=true)
+    """
+    positional, named = [], {}
+    if not args:
+        return positional, named
+
+    for part in re.findall(r"(?:[^,']|'(?:[^']|'')*')+", args):
+        key, sep, value = part.partition("=")
+        if not sep or key.startswith("'"):
+            key, value = None, part
+        value = unquote(value.strip())
+        if value.startswith("'") and value.endswith("'"):
+            value = value[1:-1].replace("''", "'")
+        elif value.startswith("guid'"):
+            value = value[5:-1]
+
+        if key is None:
+            positional.append(value)
+        else:
+            named[key.strip().lower()] = value
+
+    return positional, named
+
+
+def _apply_query(items: list[dict], query: dict) -> list[dict]:
+    """
+    Applies the $filter, $orderby, $skip and $top options of a collection request
+    """
+    if "$filter" in query:
+        match = NAME_FILTER_REGEX.match(query["$filter"][0].strip())
+        if match is None:
+            raise StandInError(400, f"Unsupported filter {query['$filter'][0]}")
+        text = match.group(1).replace("''", "'").lower()
+        items = [item for item in items if text in item["Name"].lower()]
+
+    if "$orderby" in query:
+        field_name, _, direction = query["$orderby"][0].partition(" ")
+        items = sorted(
+            items,
+            key=lambda item: str(item[field_name]).lower(),
+            reverse=direction.strip().lower() == "desc",
+        )
+
+    skip = int(query.get("$skip", ["0"])[0])
+    items = items[skip:]
+    if "$top" in query:
+        items = items[: int(query["$top"][0])]
+
+    return items
+
+
+class SharepointStandIn:  # pylint: disable=too-many-instance-attributes
+    """
+    Local HTTP server speaking enough of the SharePoint REST API for SharepointSession.
+
+    Attributes
+    ----------
+    root : str
+        Directory which backs the site. The document library is stored in root/Shared Documents
+    site_path : str
+        Server relative path of the site, ex: /sites/scholarships
+    config : StandInConfig
+        Latency, bandwidth and failure injection settings. Can be changed while running.
+    credentials : dict[str, str] | None
+        Accepted username/password pairs, None accepts any non empty credentials
+    requests : list[RequestRecord]
+        Every request received since start (batched sub requests included)
+    """
+
+    # pylint: disable-next=too-many-arguments
+    def __init__(
+        self,
+        root: str,
+        site_path: str = "/sites/scholarships",
+        host: str = "127.0.0.1",
+        port: int = 0,
+        config: StandInConfig | None = None,
+        credentials: dict[str, str] | None = None,
+    ):
+        self.root = os.path.abspath(root)
+        self.site_path = "/" + site_path.strip("/")
+        self.config = config or StandInConfig()
+        self.credentials = credentials
+        self.requests: list[RequestRecord] = []
+
+        self._host = host
+        self._port = port
+        self._server = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._random = random.Random(self.config.seed)
+        self._forced_failures: list[StandInError] = []
+        self._upload_sessions: dict[str, bytearray] = {}
+        self._resource_ids: dict[str, tuple[str, str]] = {}
+
+        os.makedirs(os.path.join(self.root, DOCUMENT_LIBRARY), exist_ok=True)
+
+    @property
+    def url(self) -> str:
+        """
+        Absolute url of the site, what the app is configured with as the sharepoint url
+        """
+        return f"http://{self._host}:{self._port}{self.site_path}"
+
+    def start(self) -> "SharepointStandIn":
+        """
+        Starts serving on a background thread
+        """
+        stand_in = self
+
+        class _Handler(_StandInRequestHandler):
+            server_stand_in = stand_in
+
+        self._server = ThreadingHTTPServer((self._host, self._port), _Handler)
+        self._port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """
+        Stops the server
+        """
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "SharepointStandIn":
+        return self.start()
+
+    def __exit__(self, *_exc):
+        self.stop()
+
+    def fail_next(self, count: int = 1, status: int = 503, retry_after=None):
+        """
+        Forces the next count HTTP requests to fail with status
+        """
+        headers = {} if retry_after is None else {"Retry-After": str(retry_after)}
+        with self._lock:
+            self._forced_failures.extend(
+                StandInError(status, "Injected failure", headers) for _ in range(count)
+            )
+
+    def reset_log(self):
+        """
+        Clears the request log
+        """
+        with self._lock:
+            self.requests = []
+
+    def request_count(self, batched: bool = False) -> int:
+        """
+        Number of HTTP requests received. Batched sub requests are only counted if batched is True
+        """
+        with self._lock:
+            return len([r for r in self.requests if batched or not r.batched])
+
+    def library_path(self, *parts: str) -> str:
+        """
+        Absolute disk path to a file in the document library
+        """
+        return os.path.join(self.root, DOCUMENT_LIBRARY, *parts)
+
+    # Request handling
+
+    def handle_http(self, method: str, raw_path: str, headers, body: bytes):
+        """
+        Handles a full HTTP request, applying network simulation. Returns a StandInResponse
+        """
+        self._simulate_transfer(self.config.latency, len(body))
+        try:
+            self._authenticate(headers)
+            self._maybe_fail()
+            path, query = self._split_api_path(raw_path)
+            if path == "$batch":
+                response = self._handle_batch(headers, body)
+            else:
+                response = self._dispatch(path, query, body)
+        except StandInError as error:
+            response = StandInResponse.error(error)
+        except Exception as error:  # pylint: disable=broad-exception-caught
+            response = StandInResponse.error(StandInError(500, repr(error)))
+
+        self._simulate_transfer(0, len(response.body))
+        self._record(method, raw_path, response, len(body), False)
+        return response
+
+    def _simulate_transfer(self, latency: float, size: int):
+        delay = latency
+        if self.config.bandwidth:
+            delay += size / self.config.bandwidth
+        if delay > 0:
+            time.sleep(delay)
+
+    # pylint: disable-next=too-many-arguments
+    def _record(self, method, path, response, request_bytes, batched):
+        with self._lock:
+            self.requests.append(
+                RequestRecord(
+                    method,
+                    path,
+                    response.status,
+                    request_bytes,
+                    len(response.body),
+                    batched,
+                )
+            )
+
+    def _authenticate(self, headers):
+        authorization = headers.get("Authorization", "")
+        if not authorization.startswith("Bearer "):
+            raise StandInError(401, "Missing access token")
+
+        try:
+            decoded = base64.b64decode(authorization[len("Bearer ") :]).decode("utf-8")
+        except ValueError as error:
+            raise StandInError(401, "Invalid access token") from error
+
+        username, _, password = decoded.partition(":")
+        if not username or not password:
+            raise StandInError(401, "Invalid access token")
+
+        if self.credentials is not None and self.credentials.get(username) != password:
+            raise StandInError(401, "Invalid credentials")
+
+    def _maybe_fail(self):
+        with self._lock:
+            if self._forced_failures:
+                raise self._forced_failures.pop(0)
+
+            if self.config.failure_rate <= 0:
+                return
+            if self._random.random() >= self.config.failure_rate:
+                return
+
+        headers = {}
+        if self.config.retry_after is not None:
+            headers["Retry-After"] = str(self.config.retry_after)
+        raise StandInError(self.config.failure_status, "Injected failure", headers)
+
+    def _split_api_path(self, raw_path: str) -> tuple[str, dict]:
+        parts = urlsplit(raw_path)
+        prefix = f"{self.site_path}/_api/"
+        if not parts.path.startswith(prefix):
+            raise StandInError(404, f"Unknown endpoint {parts.path}")
+
+        return parts.path[len(prefix) :], parse_qs(parts.query)
+
+    def _handle_batch(self, headers, body: bytes) -> StandInResponse:
+        message = email.message_from_bytes(
+            b"Content-Type: "
+            + headers.get("Content-Type", "").encode("ascii")
+            + b"\r\n\r\n"
+            + body,
+            policy=email.policy.compat32,
+        )
+        boundary = f"batchresponse_{uuid.uuid4()}"
+        parts = []
+        for request_part in self._batch_request_parts(message):
+            response = self._handle_batch_part(request_part)
+            reason = "No Content" if response.status == 204 else "OK"
+            if response.status >= 400:
+                reason = "Error"
+            lines = [f"HTTP/1.1 {response.status} {reason}"]
+            lines.append(f"Content-Type: {response.content_type}")
+            lines.extend(f"{k}: {v}" for k, v in response.headers.items())
+            payload = "\r\n".join(lines) + "\r\n\r\n" + response.body.decode("utf-8")
+            parts.append(
+                f"--{boundary}\r\nContent-Type: application/http\r\n"
+                f"Content-Transfer-Encoding: binary\r\n\r\n{payload}\r\n"
+            )
+
+        return StandInResponse(
+            200,
+            ("".join(parts) + f"--{boundary}--\r\n").encode("utf-8"),
+            content_type=f"multipart/mixed; boundary={boundary}",
+        )
+
+    def _batch_request_parts(self, message):
+        """
+        Flattens change sets, SharePoint answers change set requests as top level responses
+        """
+        for part in message.get_payload():
+            if part.is_multipart():
+                yield from self._batch_request_parts(part)
+            elif part.get_content_type() == "application/http":
+                yield part.get_payload(decode=True)
+
+    def _handle_batch_part(self, raw_request: bytes) -> StandInResponse:
+        head, _, body = raw_request.replace(b"\r\n", b"\n").partition(b"\n\n")
+        lines = head.decode("utf-8").strip().split("\n")
+        # The url is not always encoded, it may contain spaces
+        method, url = lines[0].rsplit(" ", 1)[0].split(" ", 1)
+        sub_headers = dict(line.split(":", 1) for line in lines[1:] if ":" in line)
+        method = sub_headers.get("X-HTTP-Method", method).strip()
+        body = body.strip()
+        try:
+            path, query = self._split_api_path(
+                urlsplit(url)._replace(netloc="").geturl()
+            )
+            response = self._dispatch(path, query, body)
+        except StandInError as error:
+            response = StandInResponse.error(error)
+
+        self._record(method, url, response, len(body), True)
+        return response
+
+    def _dispatch(self, path: str, query: dict, body: bytes):
+        segments = SEGMENT_REGEX.findall(path)
+        if [segment.lower() for segment in segments] == ["contextinfo"]:
+            return StandInResponse.json(
+                {
+                    "GetContextWebInformation": {
+                        "FormDigestValue": f"stand-in-digest,{uuid.uuid4()}",
+                        "FormDigestTimeoutSeconds": 1800,
+                        "WebFullUrl": self.url,
+                        "SiteFullUrl": self.url,
+                    }
+                }
+            )
+
+        if not segments or segments[0].lower() != "web":
+            raise StandInError(404, f"Unknown endpoint {path}")
+
+        kind, target = "web", ""
+        for segment in segments[1:]:
+            kind, target, response = self._step(kind, target, segment, query, body)
+            if response is not None:
+                return response
+
+        return self._render(kind, target, query)
+
+    # pylint: disable-next=too-many-arguments,too-many-return-statements
+    def _step(self, kind, target, segment, query, body):
+        """
+        Resolves the next path segment. Returns (kind, target, response or None)
+        """
+        name, positional, named = self._parse_call(segment)
+        lowered = name.lower()
+
+        if kind == "web":
+            if lowered in ("getfilebyserverrelativepath", "getfilebyserverrelativeurl"):
+                return (
+                    "file",
+                    self._relative(named.get("decodedurl", *positional)),
+                    None,
+                )
+            if lowered in ("getfilebyid", "getfolderbyid"):
+                return self._resource_by_id(positional[0])
+            if lowered in (
+                "getfolderbyserverrelativepath",
+                "getfolderbyserverrelativeurl",
+            ):
+                return (
+                    "folder",
+                    self._relative(named.get("decodedurl", *positional)),
+                    None,
+                )
+            if lowered == "rootfolder":
+                return "folder", "", None
+
+        if kind == "folder":
+            if lowered == "folders" and positional:
+                return "folder", self._join(target, positional[0]), None
+            if lowered == "folders":
+                return "folders", target, None
+            if lowered == "files" and positional:
+                return "file", self._join(target, positional[0]), None
+            if lowered == "files":
+                return "files", target, None
+            if lowered == "recycle":
+                self._folder_json(target, {})
+                shutil.rmtree(self._disk(target))
+                return (
+                    "folder",
+                    target,
+                    StandInResponse.json({"Recycle": str(uuid.uuid4())}),
+                )
+
+        if kind == "folders" and lowered == "add":
+            folder = self._join(target, named.get("url", *positional))
+            os.makedirs(self._disk(folder), exist_ok=True)
+            return "folder", folder, self._render("folder", folder, query)
+
+        if kind == "files" and lowered == "add":
+            file = self._join(target, named.get("url", *positional))
+            self._write_file(file, body, named.get("overwrite", "false") == "true")
+            return "file", file, self._render("file", file, query)
+
+        if kind == "file":
+            return self._file_operation(target, lowered, named, body, query)
+
+        raise StandInError(404, f"Unsupported segment {segment} on {kind}")
+
+    # pylint: disable-next=too-many-arguments
+    def _file_operation(self, target, operation, named, body, query):
+        if operation == "$value":
+            self._require_file(target)
+            with open(self._disk(target), "rb") as file:
+                content = file.read()
+            return (
+                "file",
+                target,
+                StandInResponse(200, content, content_type="application/octet-stream"),
+            )
+
+        upload_id = named.get("uploadid")
+        if operation == "startupload":
+            self._upload_sessions[upload_id] = bytearray(body)
+            return "file", target, self._upload_offset("StartUpload", upload_id)
+        if operation == "continueupload":
+            self._upload_session(upload_id).extend(body)
+            return "file", target, self._upload_offset("ContinueUpload", upload_id)
+        if operation == "finishupload":
+            content = self._upload_session(upload_id)
+            content.extend(body)
+            del self._upload_sessions[upload_id]
+            self._write_file(target, bytes(content), True)
+            return "file", target, self._render("file", target, query)
+
+        raise StandInError(404, f"Unsupported file operation {operation}")
+
+    def _upload_session(self, upload_id: str) -> bytearray:
+        if upload_id not in self._upload_sessions:
+            raise StandInError(404, f"Upload session {upload_id} not found")
+        return self._upload_sessions[upload_id]
+
+    def _upload_offset(self, function: str, upload_id: str) -> StandInResponse:
+        return StandInResponse.json(
+            {function: str(len(self._upload_sessions[upload_id]))}
+        )
+
+    def _render(self, kind: str, target: str, query: dict) -> StandInResponse:
+        if kind == "web":
+            return StandInResponse.json(
+                {
+                    "__metadata": {"type": "SP.Web", "uri": f"{self.url}/_api/Web"},
+                    "Title": "Stand-in",
+                    "Url": self.url,
+                    "ServerRelativeUrl": self.site_path,
+                }
+            )
+        if kind == "file":
+            self._require_file(target)
+            return StandInResponse.json(self._file_json(target))
+        if kind == "folder":
+            return StandInResponse.json(self._folder_json(target, query))
+        if kind == "files":
+            return StandInResponse.json(
+                {"results": _apply_query(self._children(target)[0], query)}
+            )
+        if kind == "folders":
+            return StandInResponse.json(
+                {"results": _apply_query(self._children(target)[1], query)}
+            )
+
+        raise StandInError(404, f"Unknown resource {kind}")
+
+    def _folder_json(self, target: str, query: dict) -> dict:
+        disk = self._disk(target)
+        if not os.path.isdir(disk):
+            raise StandInError(404, f"Folder {target} not found")
+
+        server_relative = self._server_relative(target)
+        data = {
+            "__metadata": {
+                "type": "SP.Folder",
+                "uri": f"{self.url}/_api/Web/getFolderByServerRelativePath"
+                f"(DecodedUrl='{quote(server_relative, safe='')}')",
+            },
+            "Name": os.path.basename(target),
+            "ServerRelativeUrl": server_relative,
+            "ServerRelativePath": {"DecodedUrl": server_relative},
+            "Exists": True,
+            "ItemCount": len(os.listdir(disk)),
+            "TimeLastModified": self._modified(disk),
+            "UniqueId": self._unique_id("folder", target),
+        }
+
+        expand = ",".join(query.get("$expand", [])).lower().split(",")
+        if "files" in expand or "folders" in expand:
+            files, folders = self._children(target)
+            if "files" in expand:
+                data["Files"] = {"results": files}
+            if "folders" in expand:
+                data["Folders"] = {"results": folders}
+        return data
+
+    def _file_json(self, target: str) -> dict:
+        disk = self._disk(target)
+        server_relative = self._server_relative(target)
+        stat = os.stat(disk)
+        etag = hashlib.sha1(
+            f"{server_relative}:{stat.st_mtime_ns}:{stat.st_size}".encode("utf-8")
+        ).hexdigest()
+        unique_id = self._unique_id("file", target)
+        return {
+            "__metadata": {
+                "type": "SP.File",
+                "uri": f"{self.url}/_api/Web/getFileByServerRelativePath"
+                f"(DecodedUrl='{quote(server_relative, safe='')}')",
+            },
+            "Name": os.path.basename(target),
+            "ServerRelativeUrl": server_relative,
+            "ServerRelativePath": {"DecodedUrl": server_relative},
+            "Exists": True,
+            "Length": str(stat.st_size),
+            "TimeLastModified": self._modified(disk),
+            "ETag": f'"{{{etag[:32]}}},1"',
+            "UniqueId": unique_id,
+        }
+
+    def _unique_id(self, kind: str, target: str) -> str:
+        """
+        Stable id of a file or folder, remembered so it can be resolved by GetFileById
+        """
+        unique_id = str(uuid.uuid5(uuid.NAMESPACE_URL, self._server_relative(target)))
+        self._resource_ids[unique_id] = (kind, target)
+        return unique_id
+
+    def _resource_by_id(self, unique_id: str) -> tuple[str, str, None]:
+        if unique_id not in self._resource_ids:
+            raise StandInError(404, f"Item {unique_id} not found")
+        kind, target = self._resource_ids[unique_id]
+        return kind, target, None
+
+    def _children(self, target: str) -> tuple[list[dict], list[dict]]:
+        disk = self._disk(target)
+        if not os.path.isdir(disk):
+            raise StandInError(404, f"Folder {target} not found")
+
+        files, folders = [], []
+        for name in sorted(os.listdir(disk)):
+            child = self._join(target, name)
+            if os.path.isdir(self._disk(child)):
+                folders.append(self._folder_json(child, {}))
+            else:
+                files.append(self._file_json(child))
+        return files, folders
+
+    def _write_file(self, target: str, content: bytes, overwrite: bool):
+        disk = self._disk(target)
+        if not os.path.isdir(os.path.dirname(disk)):
+            raise StandInError(404, f"Folder {os.path.dirname(target)} not found")
+        if os.path.exists(disk) and not overwrite:
+            raise StandInError(409, f"File {target} already exists")
+
+        with open(disk, "wb") as file:
+            file.write(content)
+
+    def _require_file(self, target: str):
+        if not os.path.isfile(self._disk(target)):
+            raise StandInError(404, "File Not Found.")
+
+    @staticmethod
+    def _parse_call(segment: str) -> tuple[str, list[str], dict[str, str]]:
+        match = CALL_REGEX.match(segment)
+        positional, named = _parse_arguments(match.group("args"))
+        return unquote(match.group("name")), positional, named
+
+    def _relative(self, path: str) -> str:
+        """
+        Site relative path of a server relative (or already site relative) path
+        """
+        path = unquote(path)
+        if path.startswith(self.site_path + "/"):
+            path = path[len(self.site_path) + 1 :]
+        return path.strip("/")
+
+    @staticmethod
+    def _join(parent: str, child: str) -> str:
+        return "/".join(part for part in (parent, unquote(child).strip("/")) if part)
+
+    def _server_relative(self, target: str) -> str:
+        return f"{self.site_path}/{target}".rstrip("/")
+
+    def _disk(self, target: str) -> str:
+        disk = os.path.normpath(os.path.join(self.root, target))
+        if not disk.startswith(self.root):
+            raise StandInError(400, f"Invalid path {target}")
+        return disk
+
+    @staticmethod
+    def _modified(disk: str) -> str:
+        modified = datetime.fromtimestamp(os.path.getmtime(disk), tz=timezone.utc)
+        return modified.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    """
+    Bridges http.server requests to the SharepointStandIn instance
+    """
+
+    server_stand_in: SharepointStandIn = None
+    protocol_version = "HTTP/1.1"
+
+    def _handle(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        response = self.server_stand_in.handle_http(
+            self.command, self.path, self.headers, body
+        )
+
+        self.send_response(response.status)
+        self.send_header("Content-Type", response.content_type)
+        self.send_header("Content-Length", str(len(response.body)))
+        for key, value in response.headers.items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(response.body)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+    do_PATCH = _handle
+
+    def log_message(self, *_args):
+        """
+        Requests are recorded on the stand-in instead of printed
+        """
@@ -0,0 +1,179 @@
+"""
+Allocating the awards of every scholarship at once
+"""
+import itertools
+import unittest
+import numpy as np
+import pandas as pd
+from scholarship_app.utils.allocation import (
+    EXACT,
+    GREEDY,
+    allocate,
+    allocate_awards,
+    allocate_exact,
+    allocate_greedy,
+    award_weights,
+    repair,
+)
+from tests.reference import vote_tally
+
+
+def is_valid(awarded, weights, capacity, limits) -> bool:
+    """
+    Whether an allocation only awards candidates, within each scholarship's awards and each
+    student's limit
+    """
+    return (
+        (awarded.sum(axis=0) <= capacity).all()
+        and (awarded.sum(axis=1) <= limits).all()
+        and (weights[awarded] > 0).all()
+    )
+
+
+def best_weight(weights, capacity, limits) -> int:
+    """
+    Highest total weight of any valid allocation, trying every set of candidate pairs
+    """
+    pairs = list(zip(*np.nonzero(weights > 0)))
+    best = 0
+    for count in range(len(pairs) + 1):
+        for chosen in itertools.combinations(pairs, count):
+            awarded = np.zeros(weights.shape, dtype=bool)
+            awarded[tuple(np.array(chosen, dtype=int).reshape(-1, 2).T)] = True
+            if is_valid(awarded, weights, capacity, limits):
+                best = max(best, int(weights[awarded].sum()))
+    return best
+
+
+def random_instance(rng, students: int, scholarships: int):
+    """
+    Random scores, eligibility, awards and limits
+    """
+    scores = rng.integers(-2, 5, (students, scholarships)).astype(float)
+    scores[rng.random(scores.shape) < 0.2] = np.nan
+    eligible = rng.random(scores.shape) < 0.8
+    capacity = rng.integers(0, 3, scholarships)
+    limits = rng.integers(1, 3, students)
+    with np.errstate(invalid="ignore"):
+        candidates = eligible & (scores >= 0)
+    return scores, eligible, capacity, limits, candidates
+
+
+class AllocationTest(unittest.TestCase):
+    """
+    Unit Tests for src.utils.allocation
+    """
+
+    def test_exact_matches_every_allocation(self):
+        """
+        Verify the min cost flow finds the best allocation of small instances
+        """
+        rng = np.random.default_rng(0)
+        solved = 0
+        while solved < 60:
+            scores, _, capacity, limits, candidates = random_instance(
+                rng, rng.integers(1, 6), rng.integers(1, 4)
+            )
+            if candidates.sum() > 9:
+                continue
+            weights = award_weights(scores, candidates, capacity, limits)
+
+            awarded = allocate_exact(weights, capacity, limits)
+
+            assert is_valid(awarded, weights, capacity, limits)
+            assert weights[awarded].sum() == best_weight(weights, capacity, limits)
+            solved += 1
+
+    def test_greedy_with_repair(self):
+        """
+        Verify the greedy allocation is valid, repairing it never lowers the total and neither
+        beats the exact allocation
+        """
+        rng = np.random.default_rng(1)
+        for _ in range(20):
+            scores, _, capacity, limits, candidates = random_instance(rng, 40, 8)
+            weights = award_weights(scores, candidates, capacity, limits)
+
+            greedy = allocate_greedy(weights, capacity, limits)
+            repaired = repair(weights, greedy, capacity, limits)
+            exact = allocate_exact(weights, capacity, limits)
+
+            assert is_valid(greedy, weights, capacity, limits)
+            assert is_valid(repaired, weights, capacity, limits)
+            assert (
+                weights[greedy].sum() <= weights[repaired].sum() <= weights[exact].sum()
+            )
+
+    def test_repair_moves_award(self):
+        """
+        Verify a student is moved to their second choice when it frees an award for another
+        """
+        scores = np.array([[5.0, 4.0], [4.0, np.nan]])
+        eligible = np.ones(scores.shape, dtype=bool)
+        capacity, limits = np.array([1, 1]), np.array([1, 1])
+        weights = award_weights(scores, eligible & (scores >= 0), capacity, limits)
+
+        greedy = allocate_greedy(weights, capacity, limits)
+        assert greedy.tolist() == [[True, False], [False, False]]
+
+        expected = [[False, True], [True, False]]
+        assert repair(weights, greedy, capacity, limits).tolist() == expected
+        for method in (GREEDY, EXACT):
+            assert allocate(scores, eligible, capacity, 1, method).tolist() == expected
+
+    def test_allocate_awards(self):
+        """
+        Verify awards respect eligibility, vote scores, Total Amount and the per student limit,
+        preferring to give more awards when the total score ties
+        """
+        students = pd.DataFrame({"UID": [10, 20, 30, 40], "Name": list("abcd")})
+        scholarships = pd.DataFrame(
+            {
+                "Name": ["Merit", "Need", "Unfunded", "Merit"],
+                "Total Amount": ["2", "1", "None", "5"],
+                "Value": ["1000", "500", "100", "1"],
+            }
+        )
+        reviews = pd.DataFrame(
+            {
+                "UID": [10, 20, 30, 40, 10, 20, 30],
+                "Scholarship": ["Merit"] * 4 + ["Need", "Need", "Unfunded"],
+                "Rating": ["Yes", "Maybe", "Yes", "No", "Maybe", "Yes", "Yes"],
+            }
+        )
+        eligibility = pd.DataFrame(
+            {
+                "Merit": [True, True, False, True],
+                "Need": [True, True, True, True],
+                "Unfunded": [True, True, True, True],
+            },
+            index=students.index,
+        )
+
+        awards = allocate_awards(
+            students, scholarships, vote_tally([reviews]), eligibility, limits=2
+        )
+
+        assert awards.columns.tolist() == [
+            "Scholarship",
+            "Value",
+            "Vote Score",
+            "UID",
+            "Name",
+        ]
+        assert awards["Scholarship"].tolist() == ["Merit", "Merit", "Need"]
+        assert awards["UID"].tolist() == [10, 20, 20]
+        assert awards["Vote Score"].tolist() == [1, 0, 1]
+        assert awards["Value"].tolist() == ["1000", "1000", "500"]
+
+        awards = allocate_awards(
+            students, scholarships, vote_tally([reviews]), eligibility
+        )
+        assert sorted(zip(awards["Scholarship"], awards["UID"])) == [
+            ("Merit", 10),
+            ("Need", 20),
+        ]
+
+
+if __name__ == "__main__":
+    unittest.main()
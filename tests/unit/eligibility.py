@@ -0,0 +1,118 @@
+"""
+Compiled scholarship eligibility
+"""
+import unittest
+import numpy as np
+import pandas as pd
+from scholarship_app.utils.eligibility import (
+    Eligibility,
+    compile_criteria,
+    compile_scholarship,
+)
+
+
+class EligibilityTest(unittest.TestCase):
+    """
+    Unit Tests for src.utils.eligibility
+    """
+
+    def setUp(self):
+        self.students = pd.DataFrame(
+            {
+                "UID": [1, 2, 3, 4, 5],
+                "GPA": [3.9, 3.2, 3.8, np.nan, 3.6],
+                "ACT Composite": [30, 33, 20, np.nan, np.nan],
+                "SAT Combined": [np.nan, np.nan, 1450, 1500, 1100],
+                "Major": [
+                    "Electrical Engineering",
+                    "Electrical Engineering",
+                    "Computer Science and Engineering",
+                    "Electrical Engineering",
+                    np.nan,
+                ],
+            },
+            index=[10, 11, 12, 13, 14],
+        )
+        self.scholarships = pd.DataFrame(
+            {
+                "Name": ["Test Scholarship", "Open Scholarship"],
+                "Total Amount": ["2", "1"],
+                "Value": ["1000", "500"],
+                "GPA": ["3.5", np.nan],
+                "ACT Composite": ["28", np.nan],
+                "SAT Combined": ["1400", np.nan],
+                "Major": ["Electrical Engineering", "All"],
+                "Group1": ["['ACT Composite', 'SAT Combined']", "[]"],
+            }
+        )
+
+    def test_compile_scholarship(self):
+        """
+        Verify minimums, exact values and groups are compiled from a scholarship row
+        """
+        eligibility = compile_scholarship(self.scholarships, "Test Scholarship")
+        assert eligibility == Eligibility(
+            (("GPA", 3.5), ("ACT Composite", 28.0), ("SAT Combined", 1400.0)),
+            (("Major", "Electrical Engineering"),),
+            (("ACT Composite", "SAT Combined"),),
+        )
+        assert compile_scholarship(self.scholarships, "Open Scholarship") == (
+            Eligibility()
+        )
+        with self.assertRaises(KeyError):
+            compile_scholarship(self.scholarships, "Missing Scholarship")
+
+    def test_mask(self):
+        """
+        Verify a group needs one of its criteria met and missing values only exclude in groups
+        """
+        eligibility = compile_scholarship(self.scholarships, "Test Scholarship")
+
+        mask = eligibility.mask(self.students)
+
+        assert mask.index.tolist() == self.students.index.tolist()
+        # 11 falls short on GPA, 12 is in another major, 14 meets neither group criterion
+        assert mask.tolist() == [True, False, False, True, False]
+        assert eligibility.eligible(self.students)["UID"].tolist() == [1, 4]
+        assert (
+            compile_scholarship(self.scholarships, "Open Scholarship")
+            .mask(self.students)
+            .all()
+        )
+
+    def test_missing_values(self):
+        """
+        Verify a missing value never matches an exact criterion, but only falls short of a
+        minimum in a group
+        """
+        major = Eligibility((), (("Major", "Electrical Engineering"),), ())
+        assert major.mask(self.students).tolist() == [True, True, False, True, False]
+
+        gpa = Eligibility((("GPA", 3.5),), (), ())
+        assert gpa.mask(self.students).tolist() == [True, False, True, True, True]
+
+    def test_skips_missing_columns(self):
+        """
+        Verify criteria on columns the students don't have are skipped
+        """
+        eligibility = Eligibility((("RAI", 300.0),), (), (("RAI", "HS Percentile"),))
+        assert eligibility.mask(self.students).all()
+
+    def test_cached_per_version(self):
+        """
+        Verify criteria are compiled again only once the scholarship changes
+        """
+        compile_criteria.cache_clear()
+        first = compile_scholarship(self.scholarships, "Test Scholarship")
+        assert compile_scholarship(self.scholarships, "Test Scholarship") is first
+        assert compile_criteria.cache_info().misses == 1
+
+        self.scholarships.loc[0, "GPA"] = "3.0"
+        edited = compile_scholarship(self.scholarships, "Test Scholarship")
+        assert edited is not first
+        assert ("GPA", 3.0) in edited.minimums
+        assert compile_criteria.cache_info().misses == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,122 @@
+"""
+Cached students x scholarships eligibility matrix
+"""
+import unittest
+from unittest import mock
+import pandas as pd
+from scholarship_app.utils.eligibility import compile_criteria, compile_scholarship
+from scholarship_app.utils.eligibility_matrix import (
+    EligibilityMatrix,
+    get_eligibility_matrix,
+)
+from tests.benchmark.datasets import generate_students
+
+
+class EligibilityMatrixTest(unittest.TestCase):
+    """
+    Unit Tests for src.utils.eligibility_matrix
+    """
+
+    def setUp(self):
+        self.students = generate_students(200)
+        self.scholarships = pd.DataFrame(
+            {
+                "Name": ["GPA", "Testing", "Major"],
+                "Total Amount": ["1", "1", "1"],
+                "Value": ["1000", "1000", "1000"],
+                "Cumulative GPA": ["3.5", None, None],
+                "ACT Composite": [None, "30", None],
+                "SAT Combined": [None, "1400", None],
+                "Major": [None, None, "EE"],
+                "Group1": [None, "['ACT Composite', 'SAT Combined']", None],
+            }
+        )
+        self.eligibility = EligibilityMatrix().sync(self.students, self.scholarships)
+
+    def assert_matches_compiled(self, students: pd.DataFrame):
+        """
+        Asserts every column equals the scholarship's compiled criteria applied to students
+        """
+        assert self.eligibility.matrix.columns.tolist() == (
+            self.scholarships["Name"].tolist()
+        )
+        for name in self.scholarships["Name"]:
+            expected = compile_scholarship(self.scholarships, name).mask(students)
+            pd.testing.assert_series_equal(
+                self.eligibility.mask(name), expected, check_names=False
+            )
+            assert self.eligibility.eligible_count(name) == expected.sum()
+
+    def test_sync(self):
+        """
+        Verify the matrix matches the compiled criteria and an unchanged sync computes nothing
+        """
+        self.assert_matches_compiled(self.students)
+
+        with mock.patch(
+            "scholarship_app.utils.eligibility_matrix.compile_criteria"
+        ) as compile_spy:
+            self.eligibility.sync(self.students, self.scholarships)
+        compile_spy.assert_not_called()
+
+    def test_update_scholarship(self):
+        """
+        Verify created, edited and deleted scholarships update only their column
+        """
+        self.scholarships.loc[0, "Cumulative GPA"] = "2.5"
+        self.scholarships.loc[3] = {"Name": "New", "Major": "ME", "Group1": "[]"}
+
+        with mock.patch(
+            "scholarship_app.utils.eligibility_matrix.compile_criteria",
+            wraps=compile_criteria,
+        ) as compile_spy:
+            self.eligibility.update_scholarship(self.scholarships.loc[0])
+            self.eligibility.update_scholarship(self.scholarships.loc[3])
+        assert compile_spy.call_count == 2
+        self.assert_matches_compiled(self.students)
+
+        self.scholarships = self.scholarships.drop(index=1)
+        self.eligibility.sync(self.students, self.scholarships)
+        self.assert_matches_compiled(self.students)
+
+    def test_renamed_scholarship(self):
+        """
+        Verify an edited scholarship is counted under its edited name, and the old name is
+        dropped on the next sync
+        """
+        self.scholarships.loc[0, "Name"] = "Renamed"
+        self.scholarships.loc[0, "Cumulative GPA"] = "3.9"
+
+        self.eligibility.update_scholarship(self.scholarships.loc[0])
+        expected = compile_scholarship(self.scholarships, "Renamed").mask(self.students)
+        assert self.eligibility.eligible_count("Renamed") == expected.sum()
+
+        self.eligibility.sync(self.students, self.scholarships)
+        assert set(self.eligibility.matrix.columns) == {"Renamed", "Testing", "Major"}
+        assert self.eligibility.eligible_count("Renamed") == expected.sum()
+
+    def test_update_students(self):
+        """
+        Verify changed, added and removed master rows are brought up to date
+        """
+        students = self.students.drop(index=[3, 4])
+        students.loc[0, "Cumulative GPA"] = 4.0
+        students.loc[1, "Major"] = "EE"
+        students.loc[500] = self.students.loc[3]
+
+        self.eligibility.sync(students, self.scholarships)
+
+        assert self.eligibility.matrix.index.equals(students.index)
+        self.assert_matches_compiled(students)
+
+    def test_kept_in_session(self):
+        """
+        Verify the same matrix is returned for a session
+        """
+        session = {}
+        assert get_eligibility_matrix(session) is get_eligibility_matrix(session)
+        assert get_eligibility_matrix({}) is not get_eligibility_matrix(session)
+
+
+if __name__ == "__main__":
+    unittest.main()
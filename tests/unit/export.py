@@ -0,0 +1,140 @@
+"""
+Export of tables for download
+"""
+import importlib.util
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+import numpy as np
+import pandas as pd
+from scholarship_app.managers.export import (
+    ExportCache,
+    ExportFormat,
+    frame_version,
+    get_export_cache,
+    write_export,
+)
+
+
+def answers_as_text(table: pd.DataFrame) -> pd.DataFrame:
+    """
+    Table with the answers given written as text
+    """
+    return table.assign(
+        Answer=table["Answer"].map(
+            lambda value: value if pd.isna(value) else str(value)
+        )
+    )
+
+
+class ExportTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.export
+    """
+
+    def setUp(self):
+        self.table = pd.DataFrame(
+            {
+                "UID": [1, 2, 3, 4, 5],
+                "Name": ["Ada", "Grace", None, "Alan", "Edsger"],
+                "Cumulative GPA": [3.9, np.nan, 3.1, 2.5, 4.0],
+                "Answer": ["Yes", 7, "No", np.nan, "Maybe"],
+            },
+            index=[10, 11, 12, 13, 14],
+        )
+
+    def assert_written(self, export_format: ExportFormat, read):
+        """
+        Asserts the table read back from its export equals it, without its index. Answers are
+        compared as text as the formats differ in how they keep a column of mixed types.
+        """
+        data = write_export(self.table, export_format)
+        written = read(BytesIO(data))
+        pd.testing.assert_frame_equal(
+            answers_as_text(written),
+            answers_as_text(self.table).reset_index(drop=True),
+            check_dtype=False,
+        )
+
+    def test_write_xlsx(self):
+        """
+        Verify the streamed xlsx holds the table, rows chunked and missing values left empty
+        """
+        with patch("scholarship_app.managers.export.CHUNK_ROWS", 2):
+            self.assert_written(ExportFormat.XLSX, pd.read_excel)
+
+        self.table["Answer"] = [["a"], "b", None, 1.5, pd.Timestamp("2023-04-01")]
+        written = pd.read_excel(BytesIO(write_export(self.table, ExportFormat.XLSX)))
+        assert written["Answer"].tolist()[:2] == ["['a']", "b"]
+        assert pd.isna(written["Answer"][2])
+
+    def test_write_csv(self):
+        """
+        Verify the CSV holds the table
+        """
+        self.assert_written(ExportFormat.CSV, pd.read_csv)
+
+    def test_write_parquet(self):
+        """
+        Verify the Parquet file holds the table, with its column of mixed types as text
+        """
+        self.assert_written(ExportFormat.PARQUET, pd.read_parquet)
+        written = pd.read_parquet(
+            BytesIO(write_export(self.table, ExportFormat.PARQUET))
+        )
+        assert written["Answer"][1] == "7"
+        assert written["UID"].dtype == np.int64
+
+    @unittest.skipUnless(importlib.util.find_spec("xlwt"), "xlwt is not installed")
+    def test_write_xls(self):
+        """
+        Verify the legacy xls holds the table
+        """
+        self.assert_written(ExportFormat.XLS, pd.read_excel)
+
+    def test_frame_version(self):
+        """
+        Verify the version follows the exported values and columns but not the index
+        """
+        version = frame_version(self.table)
+        assert version == frame_version(self.table.reset_index(drop=True))
+        assert version != frame_version(self.table.rename(columns={"UID": "ID"}))
+        assert version != frame_version(self.table.iloc[::-1])
+
+        changed = self.table.copy()
+        changed.loc[12, "Cumulative GPA"] = 3.2
+        assert version != frame_version(changed)
+
+    def test_export_cache(self):
+        """
+        Verify exports are written once per version and format, the oldest dropped past the cap
+        """
+        cache = ExportCache(max_size=2)
+        assert not cache.has_exports("home")
+
+        with patch(
+            "scholarship_app.managers.export.write_export", side_effect=write_export
+        ) as write:
+            data = cache.export("home", self.table, ExportFormat.CSV)
+            assert cache.export("home", self.table.copy(), ExportFormat.CSV) is data
+            assert write.call_count == 1
+            assert cache.has_exports("home")
+            assert (
+                cache.get("home", frame_version(self.table), ExportFormat.CSV) is data
+            )
+
+            cache.export("home", self.table, ExportFormat.XLSX)
+            changed = self.table.assign(Name="Anonymous")
+            cache.export("home", changed, ExportFormat.CSV)
+            assert write.call_count == 3
+
+        assert len(cache) == 2
+        assert cache.get("home", frame_version(self.table), ExportFormat.CSV) is None
+        assert cache.get("master", frame_version(changed), ExportFormat.CSV) is None
+
+        session = {}
+        assert get_export_cache(session) is get_export_cache(session)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""
+Column projection and long text previews of the homepage table
+"""
+import tempfile
+import unittest
+from unittest import mock
+import numpy as np
+import pandas as pd
+from scholarship_app.components.home.columns import (
+    PREVIEW_LENGTH,
+    PREVIEW_SUFFIX,
+    preview_long_text,
+    project_columns,
+    save_columns,
+    saved_columns,
+)
+
+
+class HomeColumnsTest(unittest.TestCase):
+    """
+    Unit Tests for src.components.home.columns
+    """
+
+    def setUp(self):
+        self.essay = "engineering " * 40
+        self.page = pd.DataFrame(
+            {
+                "Select All": [None, None, None],
+                "UID": [1, 2, 3],
+                "Name": ["A", "B", "C"],
+                "GPA": [3.1, 3.5, 3.9],
+                "Essay": [self.essay, "Short answer", np.nan],
+                "Mixed": [1, "two", None],
+            }
+        )
+
+    def test_project_columns(self):
+        """
+        Verify the required columns are always kept, ahead of the chosen ones
+        """
+        projected = project_columns(self.page, ["GPA", "UID", "Missing", "Name"])
+        assert projected.columns.tolist() == ["Select All", "UID", "GPA", "Name"]
+
+    def test_preview_long_text(self):
+        """
+        Verify only text longer than the preview length is shortened, in a copy
+        """
+        previews, shortened = preview_long_text(self.page)
+
+        assert shortened == ["Essay"]
+        assert previews.loc[0, "Essay"] == self.essay[:PREVIEW_LENGTH] + PREVIEW_SUFFIX
+        assert previews.loc[1, "Essay"] == "Short answer"
+        assert pd.isnull(previews.loc[2, "Essay"])
+        assert previews["Mixed"].tolist() == [1, "two", None]
+        assert self.page.loc[0, "Essay"] == self.essay
+
+    def test_saved_per_user(self):
+        """
+        Verify each user's columns are saved separately in the config
+        """
+        with tempfile.TemporaryDirectory() as appdata, mock.patch(
+            "scholarship_app.managers.config.get_appdata_path", return_value=appdata
+        ):
+            assert saved_columns("first") is None
+            save_columns("first", ["Name", "GPA"])
+            save_columns("second", ["Essay"])
+
+            assert saved_columns("first") == ["Name", "GPA"]
+            assert saved_columns("second") == ["Essay"]
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,242 @@
+"""
+Binning of the homepage distribution graph
+"""
+import unittest
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from scholarship_app.components.home.graphing import (
+    AUTOMATIC,
+    HEXBIN,
+    HISTOGRAM,
+    MAX_SCATTER_POINTS,
+    SCATTER,
+    FigureCache,
+    bin_points,
+    bin_weights,
+    figure_key,
+    get_figure_cache,
+    histogram_bins,
+    plot_type,
+    sample_positions,
+)
+from scholarship_app.components.home.plotting import (
+    draw_density,
+    draw_scatter,
+    dynamic_fig,
+)
+from tests.benchmark.datasets import generate_students
+from tests.reference import weighted_bins_grouped, weighted_bins_scan
+
+
+class HomeGraphingTest(unittest.TestCase):
+    """
+    Unit Tests for src.components.home.graphing
+    """
+
+    def assert_matches_scan(self, var_df: pd.DataFrame):
+        """
+        Asserts the bins and weights equal the previous scan's, weighted and unweighted
+        """
+        for weighted in (True, False):
+            grouped = weighted_bins_grouped(var_df, "x", "y", weighted)
+            scanned = weighted_bins_scan(var_df, "x", "y", weighted)
+            np.testing.assert_array_equal(grouped, scanned)
+
+    def test_bin_points(self):
+        """
+        Verify points are counted per coordinate in order of first appearance
+        """
+        bins = bin_points(
+            pd.Series([3.0, 1.0, 3.0, np.nan, np.nan, 1.0]),
+            pd.Series([4.0, 2.0, 4.0, 5.0, 5.0, 2.5]),
+        )
+        np.testing.assert_array_equal(
+            bins,
+            [
+                [3.0, 4.0, 2.0],
+                [1.0, 2.0, 1.0],
+                [np.nan, 5.0, 1.0],
+                [np.nan, 5.0, 1.0],
+                [1.0, 2.5, 1.0],
+            ],
+        )
+
+    def test_bin_weights(self):
+        """
+        Verify weights are rescaled in order against the smallest weight at the time
+        """
+        np.testing.assert_array_equal(
+            bin_weights(np.array([5.0, 5.0, 12.0]), True), [1.0, 5.0, 10.0]
+        )
+        np.testing.assert_array_equal(
+            bin_weights(np.array([7.0, 4.0, 6.0]), True), [4.0, 1.0, 6.0]
+        )
+        np.testing.assert_array_equal(
+            bin_weights(np.array([3.0, 20.0]), False), [1.0, 1.0]
+        )
+        assert len(bin_weights(np.array([]), True)) == 0
+
+    def test_matches_scan(self):
+        """
+        Verify random data, zeros and missing values give the previous scan's bins
+        """
+        rng = np.random.default_rng(0)
+        var_df = pd.DataFrame(
+            {
+                "x": rng.integers(0, 6, 300).astype(float),
+                "y": rng.integers(0, 4, 300).astype(float),
+            },
+            index=rng.permutation(300) + 1000,
+        )
+        var_df.loc[var_df.index[::37], "y"] = np.nan
+        self.assert_matches_scan(var_df)
+
+        # Every bin counted at least twice, so weights are shifted
+        self.assert_matches_scan(
+            pd.DataFrame({"x": [2, 1, 1, 2, 3, 3, 3, 1], "y": [1, 1, 1, 1, 2, 2, 2, 1]})
+        )
+        self.assert_matches_scan(pd.DataFrame({"x": [0, 1], "y": [1, 0]}))
+
+    def test_plot_type(self):
+        """
+        Verify automatic switches to a hexbin above the scatter point limit
+        """
+        assert plot_type(AUTOMATIC, MAX_SCATTER_POINTS) == SCATTER
+        assert plot_type(AUTOMATIC, MAX_SCATTER_POINTS + 1) == HEXBIN
+        assert plot_type(HISTOGRAM, 10) == HISTOGRAM
+        assert plot_type(SCATTER, MAX_SCATTER_POINTS * 10) == SCATTER
+
+    def test_sample_positions(self):
+        """
+        Verify large distributions are sampled to the limit in order, the same on every call
+        """
+        np.testing.assert_array_equal(sample_positions(5, 10), np.arange(5))
+
+        sample = sample_positions(1000, 100)
+        assert len(sample) == 100
+        assert len(np.unique(sample)) == 100
+        assert np.all(np.diff(sample) > 0)
+        assert sample.max() < 1000
+        np.testing.assert_array_equal(sample, sample_positions(1000, 100))
+
+    def test_histogram_bins(self):
+        """
+        Verify every point is counted once on a grid_size grid with empty bins masked
+        """
+        rng = np.random.default_rng(0)
+        var_xs = rng.normal(3, 0.5, 10000)
+        var_ys = rng.normal(25, 4, 10000)
+        counts, x_edges, y_edges = histogram_bins(var_xs, var_ys, 20)
+
+        assert counts.shape == (20, 20)
+        assert len(x_edges) == len(y_edges) == 21
+        assert counts.sum() == 10000
+        assert counts.mask.any()
+        assert not np.any(counts == 0)
+        # Rows are y bins, so the point at the largest y is counted in the last row
+        assert counts[-1].sum() == np.sum(var_ys >= y_edges[-2])
+
+        counts, _, _ = histogram_bins(np.array([]), np.array([]), 20)
+        assert counts.mask.all()
+
+    def test_draw_bounded(self):
+        """
+        Verify the scatter draws at most the sample and density plots skip missing values
+        """
+        count = MAX_SCATTER_POINTS * 3
+        var_xs = pd.Series(np.arange(count, dtype=float))
+        var_ys = pd.Series(np.arange(count, dtype=float) % 7)
+        var_ys[::5] = np.nan
+
+        fig, axes = plt.subplots()
+        assert draw_scatter(var_xs, var_ys, True) == MAX_SCATTER_POINTS
+        assert len(axes.collections[0].get_offsets()) <= MAX_SCATTER_POINTS
+        plt.close(fig)
+
+        for kind in (HEXBIN, HISTOGRAM):
+            fig, axes = plt.subplots()
+            draw_density(var_xs, var_ys, kind)
+            assert axes.collections[0].get_array().sum() == np.sum(var_ys.notna())
+            plt.close(fig)
+
+    def test_dynamic_fig(self):
+        """
+        Verify the graph is returned as a PNG, with a caption only when the scatter is sampled
+        """
+        students = generate_students(MAX_SCATTER_POINTS + 1)
+        options = [True, True, "Selected Students", SCATTER]
+        png, caption = dynamic_fig(
+            students, "Cumulative GPA", "ACT Composite", options, [0, 4]
+        )
+        assert png.startswith(b"\x89PNG")
+        assert str(MAX_SCATTER_POINTS) in caption
+
+        options = [True, True, "None", AUTOMATIC]
+        _, caption = dynamic_fig(students, "Cumulative GPA", "ACT Composite", options)
+        assert caption is None
+        assert not plt.get_fignums()
+
+    def test_figure_key(self):
+        """
+        Verify the key changes with the plotted values, options and highlighted students only
+        """
+        students = generate_students(100)
+        options = [True, True, "Selected Students", AUTOMATIC]
+        key = figure_key(students, "Cumulative GPA", "ACT Composite", options, [1, 2])
+
+        other = students.copy()
+        other["Major"] = "Undecided"
+        assert key == figure_key(
+            other, "Cumulative GPA", "ACT Composite", list(options), [1, 2]
+        )
+        other.loc[other.index[50], "ACT Composite"] += 1
+        assert key != figure_key(
+            other, "Cumulative GPA", "ACT Composite", options, [1, 2]
+        )
+        assert key != figure_key(
+            students.iloc[1:], "Cumulative GPA", "ACT Composite", options, [1, 2]
+        )
+        assert key != figure_key(
+            students, "Cumulative GPA", "SAT Combined", options, [1, 2]
+        )
+        assert key != figure_key(
+            students, "Cumulative GPA", "ACT Composite", options, [1, 3]
+        )
+        assert key != figure_key(
+            students, "Cumulative GPA", "ACT Composite", [False, *options[1:]], [1, 2]
+        )
+
+        # Highlights are only drawn, so only keyed, with the selected students scheme
+        options = [True, True, "None", AUTOMATIC]
+        assert figure_key(
+            students, "Cumulative GPA", "ACT Composite", options, [1, 2]
+        ) == figure_key(students, "Cumulative GPA", "ACT Composite", options, None)
+
+    def test_figure_cache(self):
+        """
+        Verify figures are drawn once and the least recently shown is dropped past the cap
+        """
+        rendered = []
+
+        def render(name):
+            rendered.append(name)
+            return name.encode(), None
+
+        cache = FigureCache(max_size=2)
+        assert cache.get(("a",), lambda: render("a")) == (b"a", None)
+        cache.get(("b",), lambda: render("b"))
+        assert cache.get(("a",), lambda: render("a")) == (b"a", None)
+        cache.get(("c",), lambda: render("c"))
+        cache.get(("b",), lambda: render("b"))
+
+        assert rendered == ["a", "b", "c", "b"]
+        assert len(cache) == 2
+        assert (cache.hits, cache.misses) == (1, 4)
+
+        session = {}
+        assert get_figure_cache(session) is get_figure_cache(session)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+"""
+Homepage grid options cached per column schema
+"""
+import unittest
+from st_aggrid import JsCode
+from st_aggrid.shared import walk_gridOptions
+from scholarship_app.components.home.grid_options import (
+    ROW_STYLE,
+    build_grid_options,
+    grid_options,
+)
+from tests.benchmark.datasets import generate_students
+from tests.reference import build_per_rerun
+
+
+def encoded(options: dict) -> dict:
+    """
+    Options with their JsCode encoded as AgGrid does, which changes them in place
+    """
+    walk_gridOptions(
+        options, lambda value: value.js_code if isinstance(value, JsCode) else value
+    )
+    return options
+
+
+class HomeGridOptionsTest(unittest.TestCase):
+    """
+    Unit Tests for src.components.home.grid_options
+    """
+
+    def setUp(self):
+        build_grid_options.cache_clear()
+        self.page = generate_students(20)
+        self.page.insert(0, "Select All", None)
+
+    def test_matches_builder(self):
+        """
+        Verify the cached options are those GridOptionsBuilder builds for the rows
+        """
+        options = grid_options(self.page, [1, 3], "Merit")
+        assert encoded(options) == encoded(build_per_rerun(self.page, [1, 3]))
+
+    def test_cached_per_schema(self):
+        """
+        Verify options are reused for rows with the same schema and scholarship
+        """
+        grid_options(self.page, [1], "Merit")
+        grid_options(generate_students(20, seed=1), [], "Merit")
+        grid_options(self.page.iloc[10:], [], "Merit")
+        assert build_grid_options.cache_info().misses == 2
+
+        grid_options(self.page, [], "Need")
+        self.page["GPA"] = "4.0"
+        grid_options(self.page, [], "Merit")
+        assert build_grid_options.cache_info().misses == 4
+
+    def test_copied(self):
+        """
+        Verify each rerun gets its own options, so AgGrid encoding them leaves the cache as is
+        """
+        selected = encoded(grid_options(self.page, [1], "Merit"))
+        unselected = grid_options(self.page, [], "Merit")
+
+        assert "preSelectedRows" not in unselected
+        assert unselected["columnDefs"] is not selected["columnDefs"]
+        assert isinstance(unselected["getRowStyle"], JsCode)
+        assert unselected["getRowStyle"].js_code == ROW_STYLE.js_code
+        assert encoded(unselected) == encoded(build_per_rerun(self.page, []))
+
+
+if __name__ == "__main__":
+    unittest.main()
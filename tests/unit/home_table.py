@@ -0,0 +1,80 @@
+"""
+Server side paging of the homepage table
+"""
+import unittest
+import pandas as pd
+from scholarship_app.components.home.main_table import (
+    TableSelection,
+    TableWindow,
+    matching_rows,
+    page_count,
+    page_rows,
+)
+from scholarship_app.sessions.session_manager import SessionManager
+from tests.benchmark.datasets import generate_students
+
+
+class HomeTableTest(unittest.TestCase):
+    """
+    Unit Tests for src.components.home.main_table
+    """
+
+    def setUp(self):
+        self.students = generate_students(120)
+
+    def test_search_and_sort(self):
+        """
+        Verify rows are searched across text columns and UID, and sorted stably
+        """
+        window = TableWindow(search="student 1", sort_by="ACT Composite")
+        matching = matching_rows(self.students, window)
+
+        expected = self.students.loc[
+            self.students["Name"].str.lower().str.contains("student 1")
+        ].sort_values("ACT Composite", kind="stable")
+        pd.testing.assert_frame_equal(matching, expected)
+
+        by_uid = matching_rows(self.students, TableWindow(search="1000005"))
+        assert by_uid["UID"].tolist() == [1000005]
+        assert matching_rows(self.students, TableWindow()) is self.students
+
+    def test_paging(self):
+        """
+        Verify only the window's page of rows is returned, clamped to the last page
+        """
+        window = TableWindow(page=1, page_size=50, sort_by="UID", ascending=False)
+        page = page_rows(matching_rows(self.students, window), window)
+        assert page["UID"].tolist() == list(range(1000069, 1000019, -1))
+
+        last = page_rows(self.students, TableWindow(page=10, page_size=50))
+        assert last["UID"].tolist() == list(range(1000100, 1000120))
+        assert page_count(120, 50) == 3
+        assert page_count(0, 50) == 1
+
+    def test_selection_by_uid(self):
+        """
+        Verify the selection is kept by UID across pages and session reruns
+        """
+        session = SessionManager({}, "home", "main")
+        first_page = self.students.iloc[:50]
+        second_page = self.students.iloc[50:100]
+
+        selection = TableSelection(session)
+        selection.update(first_page["UID"], [1000001, 1000002])
+        selection.update(second_page["UID"], [1000060])
+        selection.update(first_page["UID"], [1000002])
+
+        rerun = TableSelection(session)
+        assert rerun.uids == {1000002, 1000060}
+        assert rerun.positions(second_page) == [10]
+        assert rerun.rows(self.students)["UID"].tolist() == [1000002, 1000060]
+
+        rerun.select(self.students["UID"].iloc[110:])
+        assert len(TableSelection(session).uids) == 12
+        rerun.clear()
+        assert TableSelection(session).uids == set()
+        assert TableSelection(session).version == 2
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""
+Local filesystem storage backend
+"""
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.utils.output import get_appdata_path
+from scholarship_app.utils.scholarship_management import read_rows
+
+
+class LocalStorageTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.storage.local_storage
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        # pylint: disable-next=consider-using-with
+        self.appdata = tempfile.TemporaryDirectory()
+        appdata = patch("scholarship_app.utils.output.APP_DATA", self.appdata.name)
+        appdata.start()
+        self.addCleanup(appdata.stop)
+        self.storage = LocalStorage(self.root.name, "tester")
+
+        os.makedirs(os.path.join(self.root.name, "data", "nested"))
+        for path in ("data/a.xlsx", "data/nested/b.csv", "data/notes.txt"):
+            with open(
+                os.path.join(self.root.name, path), "w", encoding="utf-8"
+            ) as file:
+                file.write(path)
+
+    def tearDown(self):
+        self.root.cleanup()
+        self.appdata.cleanup()
+
+    def test_get_files(self):
+        """
+        Verify only data files are listed, relative to the target directory
+        """
+        assert self.storage.get_files() == [
+            "Select File",
+            "/data/a.xlsx",
+            "/data/nested/b.csv",
+        ]
+        assert self.storage.get_files("data") == [
+            "Select File",
+            "/a.xlsx",
+            "/nested/b.csv",
+        ]
+
+    def test_list_folder(self):
+        """
+        Verify a single folder is listed a page at a time and filtered by name
+        """
+        for name in ("c.xlsx", "B.csv"):
+            with open(
+                os.path.join(self.root.name, "data", name), "w", encoding="utf-8"
+            ) as file:
+                file.write(name)
+
+        first = self.storage.list_folder("data", page_size=2)
+        assert first.folders == ["nested"]
+        assert first.files == ["/data/a.xlsx", "/data/B.csv"]
+        assert first.has_more
+
+        second = self.storage.list_folder("/data/", page=1, page_size=2)
+        assert not second.folders
+        assert second.files == ["/data/c.xlsx"]
+        assert not second.has_more
+
+        assert self.storage.list_folder("", "DAT").folders == ["data"]
+        assert self.storage.list_folder("data", "b.").files == ["/data/B.csv"]
+
+    def test_has_files(self):
+        """
+        Verify existing and missing files are reported
+        """
+        assert self.storage.has_files(["/data/a.xlsx", "/data/c.xlsx"]) == {
+            "/data/a.xlsx": True,
+            "/data/c.xlsx": False,
+        }
+        assert self.storage.has_file("data/nested/b.csv")
+
+    def test_file_versions(self):
+        """
+        Verify the version of a file changes when it is replaced
+        """
+        before = self.storage.file_versions(["/data/a.xlsx", "/data/c.xlsx"])
+        with open(
+            os.path.join(self.root.name, "data", "a.xlsx"), "w", encoding="utf-8"
+        ) as file:
+            file.write("replaced")
+
+        after = self.storage.file_versions(["/data/a.xlsx"])
+        assert before["/data/c.xlsx"] is None
+        assert before["/data/a.xlsx"] is not None
+        assert before["/data/a.xlsx"] != after["/data/a.xlsx"]
+        assert self.storage.file_versions(["/data/a.xlsx"]) == after
+
+    def test_upload_and_download(self):
+        """
+        Verify files round trip between appdata and the storage directory
+        """
+        dataframe = pd.DataFrame({"Name": ["Test Scholarship"], "Value": [2000]})
+        dataframe.to_excel(
+            os.path.join(get_appdata_path("tests"), "local_storage.xlsx"), index=False
+        )
+
+        assert self.storage.upload("tests/local_storage.xlsx", "/data/uploads")
+        assert self.storage.has_file("/data/uploads/local_storage.xlsx")
+
+        os.remove(os.path.join(get_appdata_path("tests"), "local_storage.xlsx"))
+        rows = read_rows("/data/uploads/local_storage.xlsx", self.storage)
+
+        assert rows.equals(dataframe)
+
+
+if __name__ == "__main__":
+    unittest.main()
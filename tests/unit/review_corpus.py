@@ -0,0 +1,119 @@
+"""
+Loading the reviews of several reviewers at once
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from scholarship_app.managers.review_corpus import (
+    REVIEW_DTYPES,
+    get_parsed_cache,
+    load_review_corpus,
+)
+from scholarship_app.managers.review_log import ReviewLog, local_path, snapshot_path
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.utils.output import get_appdata_path
+
+REVIEWERS = ["review-corpus-tester-a", "review-corpus-tester-b"]
+STALE_REVIEWER = "review-corpus-tester-stale"
+
+
+def reviews(uids: list, rating: str = "Yes", scholarship: str = "Merit"):
+    """
+    Reviews of uids for scholarship
+    """
+    return pd.DataFrame(
+        {
+            "UID": uids,
+            "Scholarship": scholarship,
+            "Rating": rating,
+            "Additional Feedback": "",
+        }
+    )
+
+
+class ReviewCorpusTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.review_corpus
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.logs = {}
+        for hawk_id in REVIEWERS:
+            self.logs[hawk_id] = ReviewLog.create(self.storage(hawk_id))
+
+    def tearDown(self):
+        self.root.cleanup()
+        for hawk_id in REVIEWERS + [STALE_REVIEWER]:
+            shutil.rmtree(get_appdata_path(f"/data/review_log/{hawk_id}"), True)
+            if os.path.exists(local_path(snapshot_path(hawk_id))):
+                os.remove(local_path(snapshot_path(hawk_id)))
+
+    def storage(self, hawk_id: str = REVIEWERS[0]) -> LocalStorage:
+        """
+        Storage directory of the test, used as hawk_id
+        """
+        return LocalStorage(self.root.name, hawk_id)
+
+    def test_load_review_corpus(self):
+        """
+        Verify every listed reviewer's log is loaded as one typed frame, in the order the
+        reviews were left, leaving out review sheets which are not listed
+        """
+        self.logs[REVIEWERS[0]].append(self.storage(REVIEWERS[0]), reviews([1, 2]))
+        self.logs[REVIEWERS[0]].append(self.storage(REVIEWERS[0]), reviews([1], "No"))
+        self.logs[REVIEWERS[1]].append(self.storage(REVIEWERS[1]), reviews([2, 3.5]))
+        stale = ReviewLog(STALE_REVIEWER, reviews([1, 2, 3], "No"))
+        stale.write_snapshot(self.storage(STALE_REVIEWER))
+        os.remove(
+            os.path.join(self.root.name, "data", f"{STALE_REVIEWER}_Reviews.xlsx")
+        )
+
+        corpus = load_review_corpus(self.storage())
+
+        assert corpus.reviews.dtypes.astype(str).to_dict() == REVIEW_DTYPES
+        assert (
+            corpus.reviews["Reviewer"].tolist()
+            == [REVIEWERS[0]] * 3 + [REVIEWERS[1]] * 2
+        )
+        assert corpus.reviews["UID"].tolist() == [1, 2, 1, 2, pd.NA]
+        assert corpus.invalid_uids == {REVIEWERS[0]: 0, REVIEWERS[1]: 1}
+        assert corpus.reviews["Rating"].tolist() == ["Yes", "Yes", "No", "Yes", "Yes"]
+        for hawk_id, reviewer_reviews in corpus.reviewer_reviews().items():
+            review_log = ReviewLog.load(self.storage(hawk_id), hawk_id)
+            assert corpus.generations[hawk_id] == review_log.generation
+            assert corpus.segments[hawk_id] == review_log.segments
+            assert len(reviewer_reviews) == len(review_log.reviews)
+
+        only = load_review_corpus(self.storage(), [REVIEWERS[1], STALE_REVIEWER])
+        assert list(only.generations) == [REVIEWERS[1]]
+        assert len(only.reviews) == 2
+
+    def test_parsed_cache(self):
+        """
+        Verify files are only parsed again once their content changes
+        """
+        self.logs[REVIEWERS[0]].append(self.storage(REVIEWERS[0]), reviews([1, 2]))
+        self.logs[REVIEWERS[1]].append(self.storage(REVIEWERS[1]), reviews([3]))
+        cache = get_parsed_cache()
+        with ThreadPoolExecutor(2) as executor:
+            first = load_review_corpus(self.storage(), executor=executor)
+            hits, misses = cache.hits, cache.misses
+
+            second = load_review_corpus(self.storage(), executor=executor)
+            assert (cache.hits - hits, cache.misses - misses) == (4, 0)
+            assert second.reviews.equals(first.reviews)
+
+            self.logs[REVIEWERS[1]].compact(self.storage(REVIEWERS[1]))
+            hits, misses = cache.hits, cache.misses
+            third = load_review_corpus(self.storage(), executor=executor)
+            assert (cache.hits - hits, cache.misses - misses) == (2, 1)
+            assert third.reviews["UID"].tolist() == [1, 2, 3]
+
+
+if __name__ == "__main__":
+    unittest.main()
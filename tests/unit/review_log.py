@@ -0,0 +1,209 @@
+"""
+Append only review log
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from scholarship_app.components.home.review import submit_recommendations
+from scholarship_app.managers.review_log import (
+    REVIEW_COLUMNS,
+    ReviewLog,
+    segment_folder,
+    snapshot_path,
+)
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.utils.output import get_appdata_path
+
+HAWK_ID = "review-log-tester"
+
+
+def reviews(uids: list[int], scholarship: str = "Merit", rating: str = "Yes"):
+    """
+    Reviews of uids for scholarship
+    """
+    return pd.DataFrame(
+        {
+            "UID": uids,
+            "Scholarship": scholarship,
+            "Rating": rating,
+            "Additional Feedback": "",
+        }
+    )
+
+
+class ReviewLogTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.review_log
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.storage = LocalStorage(self.root.name, HAWK_ID)
+
+    def tearDown(self):
+        self.root.cleanup()
+        shutil.rmtree(get_appdata_path(f"/data/review_log/{HAWK_ID}"))
+        snapshot = os.path.join(get_appdata_path("data"), f"{HAWK_ID}_Reviews.xlsx")
+        if os.path.exists(snapshot):
+            os.remove(snapshot)
+
+    def stored(self, path: str) -> str:
+        """
+        Path of a file in the storage directory
+        """
+        return os.path.join(self.root.name, path.strip("/"))
+
+    def assert_reviews(self, actual: pd.DataFrame, expected: pd.DataFrame):
+        """
+        Asserts the UIDs and ratings of the reviews match, in order
+        """
+        assert actual["UID"].tolist() == expected["UID"].tolist()
+        assert actual["Rating"].tolist() == expected["Rating"].tolist()
+
+    def test_create_and_load(self):
+        """
+        Verify a new log is an empty snapshot, and a missing snapshot is reported
+        """
+        with self.assertRaises(FileNotFoundError):
+            ReviewLog.load(self.storage)
+
+        ReviewLog.create(self.storage)
+        review_log = ReviewLog.load(self.storage)
+
+        assert os.path.isfile(self.stored(snapshot_path(HAWK_ID)))
+        assert review_log.reviews.columns.tolist() == REVIEW_COLUMNS
+        assert len(review_log.reviews) == 0
+        assert (review_log.generation, review_log.segments) == (0, [])
+
+    def test_append(self):
+        """
+        Verify a submit uploads only its reviews, and loading reads them after the snapshot
+        """
+        review_log = ReviewLog.create(self.storage)
+        review_log.append(self.storage, reviews([1, 2]))
+        snapshot = os.path.getmtime(self.stored(snapshot_path(HAWK_ID)))
+        review_log.append(self.storage, reviews([3], rating="No"))
+
+        assert os.path.getmtime(self.stored(snapshot_path(HAWK_ID))) == snapshot
+        assert len(review_log.segments) == 2
+        self.assert_reviews(
+            pd.read_csv(self.stored(review_log.segments[1])), reviews([3], rating="No")
+        )
+
+        loaded = ReviewLog.load(self.storage)
+        expected = pd.concat([reviews([1, 2]), reviews([3], rating="No")])
+        self.assert_reviews(loaded.reviews, expected)
+        self.assert_reviews(review_log.reviews, expected)
+        assert loaded.segments == review_log.segments
+        assert (3, "Merit") in review_log.index
+        assert review_log.index.count("Merit") == loaded.index.count("Merit") == 3
+
+    def test_compact(self):
+        """
+        Verify the segments are compacted into a snapshot of the next generation, after which
+        the old segments are removed
+        """
+        review_log = ReviewLog.create(self.storage)
+        with patch("scholarship_app.managers.review_log.COMPACT_SEGMENTS", 3):
+            for uid in range(1, 5):
+                review_log.append(self.storage, reviews([uid]))
+
+        assert review_log.generation == 1
+        assert len(review_log.segments) == 1
+        assert review_log.segments[0].startswith(segment_folder(HAWK_ID, 1))
+        assert not os.path.exists(self.stored(segment_folder(HAWK_ID, 0)))
+
+        snapshot = pd.read_excel(self.stored(snapshot_path(HAWK_ID)))
+        self.assert_reviews(snapshot, reviews([1, 2, 3]))
+        self.assert_reviews(ReviewLog.load(self.storage).reviews, reviews([1, 2, 3, 4]))
+
+    def test_failed_upload(self):
+        """
+        Verify a segment which is not uploaded is reported, and a snapshot which is not
+        uploaded leaves the log on its generation
+        """
+        review_log = ReviewLog.create(self.storage)
+        review_log.append(self.storage, reviews([1]))
+
+        with patch.object(self.storage, "upload", return_value=False):
+            with self.assertRaises(IOError):
+                review_log.append(self.storage, reviews([2]))
+            assert review_log.compact(self.storage) is False
+            assert (
+                submit_recommendations(
+                    review_log, "Merit", "Yes", "", [3], self.storage
+                )[0]
+                is False
+            )
+
+        assert (review_log.generation, len(review_log.segments)) == (0, 1)
+        self.assert_reviews(review_log.reviews, reviews([1]))
+        self.assert_reviews(ReviewLog.load(self.storage).reviews, reviews([1]))
+
+    def test_concurrent_compaction(self):
+        """
+        Verify segments another session uploads before or while the log is compacted are
+        carried into the next generation
+        """
+        review_log = ReviewLog.create(self.storage)
+        other_session = ReviewLog.load(self.storage)
+        other_session.append(self.storage, reviews([1]))
+        upload = self.storage.upload
+
+        def upload_during_compaction(path: str, location: str) -> bool:
+            if path == snapshot_path(HAWK_ID):
+                other_session.append(self.storage, reviews([2]))
+            return upload(path, location)
+
+        with patch.object(self.storage, "upload", upload_during_compaction):
+            assert review_log.compact(self.storage)
+
+        assert review_log.generation == 1
+        assert review_log.segments[0].startswith(segment_folder(HAWK_ID, 1))
+        self.assert_reviews(review_log.reviews, reviews([1, 2]))
+        self.assert_reviews(ReviewLog.load(self.storage).reviews, reviews([1, 2]))
+
+    def test_legacy_snapshot(self):
+        """
+        Verify a review sheet written before the log is read as generation 0
+        """
+        os.makedirs(self.stored("/data"))
+        reviews([5, 6]).to_excel(self.stored(snapshot_path(HAWK_ID)), index=False)
+        review_log = ReviewLog.load(self.storage)
+        review_log.append(self.storage, reviews([7]))
+
+        assert review_log.generation == 0
+        self.assert_reviews(ReviewLog.load(self.storage).reviews, reviews([5, 6, 7]))
+
+    def test_submit_recommendations(self):
+        """
+        Verify selected students are reviewed once per scholarship
+        """
+        review_log = ReviewLog.create(self.storage)
+        review_log.append(self.storage, reviews([1, 2]))
+
+        assert submit_recommendations(
+            review_log, "Merit", "Yes", "", [3, 2, 1], self.storage
+        ) == (False, "Already reviewed student 2 for this scholarship")
+        assert (
+            submit_recommendations(review_log, "Merit", "Yes", "", [], self.storage)[0]
+            is False
+        )
+
+        success, result = submit_recommendations(
+            review_log, "Need", "Maybe", "Strong essay", [2, 3], self.storage
+        )
+        assert success
+        assert result is review_log.reviews
+        loaded = ReviewLog.load(self.storage).reviews
+        assert loaded.iloc[-2:]["Scholarship"].tolist() == ["Need", "Need"]
+        assert loaded.iloc[-1]["Additional Feedback"] == "Strong essay"
+        assert review_log.reviewed([3], "Need") == 3
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,157 @@
+"""
+Joining the user's reviews onto student data
+"""
+import unittest
+import numpy as np
+import pandas as pd
+from scholarship_app.utils.reviews import (
+    NO_REVIEW,
+    ReviewIndex,
+    vote_getters,
+)
+from tests.benchmark.datasets import (
+    generate_reviews,
+    generate_scholarships,
+    generate_students,
+    reviewer_sheets,
+)
+from tests.reference import (
+    review_column,
+    review_column_scan,
+    same_scores,
+    vote_getters_scan,
+    vote_tally,
+)
+
+
+class ReviewColumnTest(unittest.TestCase):
+    """
+    Unit Tests for src.utils.reviews
+    """
+
+    def test_matches_scan(self):
+        """
+        Verify the index gives the same column as scanning the reviews per student
+        """
+        students = generate_students(300, seed=1)
+        scholarships = generate_scholarships(3)
+        reviews = generate_reviews(900, students, scholarships, seed=2)
+        # Index labels of the students are kept
+        students = students.iloc[::2]
+
+        for scholarship in scholarships + ["Not A Scholarship"]:
+            column = ReviewIndex(reviews).column(students["UID"], scholarship)
+
+            assert column.index.equals(students.index)
+            assert column.tolist() == review_column_scan(students, reviews, scholarship)
+
+    def test_first_review_and_missing_values(self):
+        """
+        Verify repeat reviews use the first one and missing UIDs or ratings are kept as is
+        """
+        students = pd.DataFrame({"UID": [1, 2, 3, np.nan]})
+        reviews = pd.DataFrame(
+            {
+                "UID": [2.0, 2.0, 3.0, np.nan, 1.0],
+                "Scholarship": ["A", "A", "A", "A", "B"],
+                "Rating": ["Yes", "No", np.nan, "Maybe", "Yes"],
+            }
+        )
+
+        column = ReviewIndex(reviews).column(students["UID"], "A")
+
+        assert column.tolist()[:2] == ["N/A", "Yes"]
+        assert pd.isna(column[2])
+        assert column[3] == "N/A"
+        assert review_column_scan(students, reviews, "A")[3] == "N/A"
+
+    def test_index_matches_join(self):
+        """
+        Verify the index, built at once or a few reviews at a time, gives the keyed join's column
+        """
+        students = generate_students(300, seed=1)
+        scholarships = generate_scholarships(3)
+        reviews = generate_reviews(900, students, scholarships, seed=2)
+        reviews.loc[reviews.index[::50], "UID"] = np.nan
+
+        whole = ReviewIndex(reviews)
+        incremental = ReviewIndex()
+        for start in range(0, len(reviews), 7):
+            incremental.add(reviews.iloc[start : start + 7])
+
+        for scholarship in scholarships + ["Not A Scholarship"]:
+            expected = review_column(students["UID"], reviews, scholarship)
+            assert whole.column(students["UID"], scholarship).equals(expected)
+            assert incremental.column(students["UID"], scholarship).equals(expected)
+
+    def test_index_lookups(self):
+        """
+        Verify duplicate checks, ratings and counts are answered from the index
+        """
+        index = ReviewIndex(
+            pd.DataFrame(
+                {
+                    "UID": [2.0, 2.0, 3.0, np.nan, 1.0],
+                    "Scholarship": ["A", "A", "A", "A", "B"],
+                    "Rating": ["Yes", "No", np.nan, "Maybe", "Yes"],
+                }
+            )
+        )
+
+        assert (2, "A") in index
+        assert (1, "A") not in index
+        assert index.rating(2, "A") == "Yes"
+        assert pd.isna(index.rating(3, "A"))
+        assert index.rating(1, "C") == NO_REVIEW
+        assert index.reviewed([5, 3, 2], "A") == 3
+        assert index.reviewed([2, 3], "B") is None
+        assert (index.count("A"), index.count("B"), index.count("C")) == (2, 1, 0)
+
+    def test_vote_getters_match_scan(self):
+        """
+        Verify ranking by the vote tally gives the scores of scanning every reviewer's reviews
+        """
+        students = generate_students(60, seed=3)
+        scholarships = generate_scholarships(2)
+        all_reviews = reviewer_sheets(
+            generate_reviews(400, students, scholarships, seed=4), 3
+        )
+        tally = vote_tally(all_reviews)
+
+        for scholarship in scholarships + ["None"]:
+            expected = vote_getters_scan(students, all_reviews, scholarship)
+            assert same_scores(vote_getters(students, tally, scholarship), expected)
+
+    def test_vote_scores(self):
+        """
+        Verify votes are summed over reviewers, other ratings count as reviewed without a vote,
+        and students without a review or with a negative score are dropped
+        """
+        students = pd.DataFrame({"UID": [1, 2, 3, 4, 5], "Name": list("abcde")})
+        all_reviews = [
+            pd.DataFrame(
+                {
+                    "UID": [1.0, 2.0, 3.0, 4.0, np.nan],
+                    "Scholarship": ["A", "A", "A", "B", "A"],
+                    "Rating": ["Yes", "No", np.nan, "Yes", "Yes"],
+                }
+            ),
+            pd.DataFrame(
+                {
+                    "UID": [1.0, 2.0, 3.0],
+                    "Scholarship": ["A", "A", "A"],
+                    "Rating": ["Yes", "Maybe", "Maybe"],
+                }
+            ),
+        ]
+
+        getters = vote_getters(students, vote_tally(all_reviews), "A")
+
+        assert getters.columns.tolist() == ["Vote Score", "UID", "Name"]
+        assert getters["UID"].tolist() == [1, 3]
+        assert getters["Vote Score"].tolist() == [2, 0]
+        assert len(vote_getters(students, vote_tally([]), "A")) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,152 @@
+"""
+Asyncio sharepoint client against the local sharepoint stand-in
+"""
+import os
+import tempfile
+import unittest
+from scholarship_app.managers.sharepoint.async_client import (
+    AsyncSharepointClient,
+    run_sync,
+)
+from scholarship_app.managers.sharepoint.resilience import (
+    CircuitBreaker,
+    ResilientExecutor,
+    RetryPolicy,
+)
+from scholarship_app.managers.sharepoint.sharepoint_session import create_client
+from tests.stand_in import DOCUMENT_LIBRARY, SharepointStandIn
+
+
+class AsyncSharepointClientTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.sharepoint.async_client
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        # pylint: disable-next=consider-using-with
+        self.out = tempfile.TemporaryDirectory()
+        self.stand_in = SharepointStandIn(self.root.name).start()
+        self.folder = f"{self.stand_in.site_path}/{DOCUMENT_LIBRARY}/data"
+        self.client = AsyncSharepointClient(
+            create_client(self.stand_in.url, "hawkid", "password", True),
+            self.stand_in.url,
+            max_concurrency=4,
+            executor=ResilientExecutor(RetryPolicy(base_delay=0.01), CircuitBreaker()),
+        )
+
+        os.makedirs(self.stand_in.library_path("data", "old reviews"))
+        for path in ("a.xlsx", "b.xlsx", "old reviews/c'1.xlsx"):
+            with open(self.stand_in.library_path("data", path), "wb") as file:
+                file.write(path.encode("utf-8"))
+
+    def tearDown(self):
+        run_sync(self.client.close())
+        self.stand_in.stop()
+        self.root.cleanup()
+        self.out.cleanup()
+
+    def test_list_and_download(self):
+        """
+        Verify folders are listed recursively and every file is downloaded
+        """
+        files = run_sync(self.client.list_files(self.folder))
+        names = sorted(file["Name"] for file in files)
+        assert names == ["a.xlsx", "b.xlsx", "c'1.xlsx"]
+
+        missing = f"{self.folder}/missing.xlsx"
+        results = run_sync(
+            self.client.download_many(
+                [
+                    (
+                        file["ServerRelativeUrl"],
+                        os.path.join(self.out.name, file["Name"]),
+                    )
+                    for file in files
+                ]
+                + [(missing, os.path.join(self.out.name, "missing.xlsx"))]
+            )
+        )
+
+        assert results[:3] == [6, 6, 20]
+        assert isinstance(results[3], FileNotFoundError)
+        with open(os.path.join(self.out.name, "c'1.xlsx"), "rb") as file:
+            assert file.read() == b"old reviews/c'1.xlsx"
+        assert sorted(os.listdir(self.out.name)) == names
+
+    def test_list_folder_page(self):
+        """
+        Verify a folder is listed a page at a time, filtered by the server
+        """
+        folders, files, has_more = run_sync(
+            self.client.list_folder_page(self.folder, top=1)
+        )
+        assert [folder["Name"] for folder in folders] == ["old reviews"]
+        assert [file["Name"] for file in files] == ["a.xlsx"]
+        assert has_more
+
+        folders, files, has_more = run_sync(
+            self.client.list_folder_page(
+                self.folder, "B.XL", skip=0, top=1, include_folders=False
+            )
+        )
+        assert folders == []
+        assert [file["Name"] for file in files] == ["b.xlsx"]
+        assert not has_more
+        assert self.stand_in.request_count() == 3
+
+    def test_files_exist_retries(self):
+        """
+        Verify probes are retried through an outage
+        """
+        self.stand_in.fail_next(2, 503, retry_after=0)
+
+        exists = run_sync(
+            self.client.files_exist(
+                [f"{self.folder}/a.xlsx", f"{self.folder}/missing.xlsx"]
+            )
+        )
+
+        assert exists == {
+            f"{self.folder}/a.xlsx": True,
+            f"{self.folder}/missing.xlsx": False,
+        }
+
+    def test_file_versions(self):
+        """
+        Verify each file has an ETag, which changes when the file is replaced
+        """
+        paths = [f"{self.folder}/a.xlsx", f"{self.folder}/missing.xlsx"]
+        before = run_sync(self.client.file_versions(paths))
+        with open(self.stand_in.library_path("data", "a.xlsx"), "wb") as file:
+            file.write(b"replaced")
+        after = run_sync(self.client.file_versions(paths))
+
+        assert before[paths[1]] is None and after[paths[1]] is None
+        assert before[paths[0]] != after[paths[0]]
+        assert after == run_sync(self.client.file_versions(paths))
+
+    def test_upload_many(self):
+        """
+        Verify small and chunked uploads round trip file content
+        """
+        small = os.path.join(self.out.name, "small.xlsx")
+        large = os.path.join(self.out.name, "large.xlsx")
+        content = os.urandom(2500000)
+        with open(small, "wb") as file:
+            file.write(b"small")
+        with open(large, "wb") as file:
+            file.write(content)
+
+        uploaded = run_sync(
+            self.client.upload_many([(small, self.folder), (large, self.folder)])
+        )
+
+        assert uploaded == [f"{self.folder}/small.xlsx", f"{self.folder}/large.xlsx"]
+        with open(self.stand_in.library_path("data", "large.xlsx"), "rb") as file:
+            assert file.read() == content
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Timing of sharepoint operations
+"""
+import json
+import os
+import tempfile
+import unittest
+from office365.runtime.client_request_exception import ClientRequestException
+from requests import Response
+from scholarship_app.managers.sharepoint.instrumentation import (
+    LatencyHistogram,
+    Measurement,
+    MetricsRegistry,
+    Outcome,
+)
+from scholarship_app.managers.sharepoint.resilience import SharepointUnavailableError
+
+
+class LatencyHistogramTest(unittest.TestCase):
+    """
+    Unit Tests for LatencyHistogram
+    """
+
+    def test_percentiles(self):
+        """
+        Verify percentiles are estimated from the bucket the rank falls in
+        """
+        histogram = LatencyHistogram()
+        for duration in [5] * 90 + [700] * 9 + [45000]:
+            histogram.add(Measurement("download", duration_ms=duration, bytes=10))
+
+        assert histogram.count == 100
+        assert histogram.bytes == 1000
+        assert histogram.percentile(50) == 10
+        assert histogram.percentile(90) == 10
+        assert histogram.percentile(99) == 1000
+        assert histogram.percentile(100) == 45000
+        assert histogram.summary()["outcomes"] == {"ok": 100}
+
+
+class MetricsRegistryTest(unittest.TestCase):
+    """
+    Unit Tests for MetricsRegistry
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.metrics_path = os.path.join(self.root.name, "metrics.jsonl")
+        self.metrics = MetricsRegistry(self.metrics_path)
+
+    def tearDown(self):
+        self.root.cleanup()
+
+    def read_lines(self) -> list[dict]:
+        """
+        Lines written to the metrics file
+        """
+        with open(self.metrics_path, encoding="utf-8") as metrics_file:
+            return [json.loads(line) for line in metrics_file]
+
+    def test_measure_outcomes(self):
+        """
+        Verify operations are timed and their outcome is taken from what they raised
+        """
+        response = Response()
+        response.status_code = 404
+
+        with self.metrics.measure("download") as measurement:
+            measurement.bytes = 2500
+        with self.assertRaises(ClientRequestException):
+            with self.metrics.measure("download"):
+                raise ClientRequestException(response=response)
+        with self.assertRaises(SharepointUnavailableError):
+            with self.metrics.measure("get_files"):
+                raise SharepointUnavailableError()
+        with self.metrics.measure("verify") as measurement:
+            measurement.outcome = Outcome.FAILED
+
+        summaries = self.metrics.summaries()
+        assert summaries["download"]["count"] == 2
+        assert summaries["download"]["bytes"] == 2500
+        assert summaries["download"]["outcomes"] == {"ok": 1, "not_found": 1}
+        assert summaries["get_files"]["outcomes"] == {"unavailable": 1}
+        assert summaries["verify"]["outcomes"] == {"failed": 1}
+
+        lines = self.read_lines()
+        assert [line["operation"] for line in lines] == [
+            "download",
+            "download",
+            "get_files",
+            "verify",
+        ]
+        assert lines[0]["bytes"] == 2500
+        assert lines[1]["outcome"] == "not_found"
+
+    def test_dump_and_reset(self):
+        """
+        Verify histograms are written to the metrics file and reset clears them
+        """
+        with self.metrics.measure("upload"):
+            pass
+
+        self.metrics.dump()
+        self.metrics.reset()
+
+        dumped = self.read_lines()[-1]
+        assert dumped["type"] == "histograms"
+        assert dumped["operations"]["upload"]["count"] == 1
+        assert sum(dumped["operations"]["upload"]["buckets"]) == 1
+        assert self.metrics.summaries() == {}
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,259 @@
+"""
+Retries and circuit breaking of sharepoint requests
+"""
+import os
+import random
+import tempfile
+import unittest
+from office365.runtime.client_request_exception import ClientRequestException
+from requests import Response
+from scholarship_app.managers.sharepoint.request_batch import RequestBatch
+from scholarship_app.managers.sharepoint.resilience import (
+    CircuitBreaker,
+    CircuitState,
+    ErrorKind,
+    ResilientExecutor,
+    RetryPolicy,
+    SharepointUnavailableError,
+    classify_error,
+)
+from scholarship_app.managers.sharepoint.sharepoint_session import create_client
+from tests.stand_in import DOCUMENT_LIBRARY, SharepointStandIn
+
+
+def http_error(status: int, retry_after: str = None) -> ClientRequestException:
+    """
+    Error a request which got a status response raises
+    """
+    response = Response()
+    response.status_code = status
+    if retry_after is not None:
+        response.headers["Retry-After"] = retry_after
+    return ClientRequestException(response=response)
+
+
+class FakeClock:
+    """
+    Clock which only moves when told to
+    """
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def advance(self, seconds: float):
+        """
+        Moves the clock forward by seconds
+        """
+        self.now += seconds
+
+
+class RetryPolicyTest(unittest.TestCase):
+    """
+    Unit Tests for RetryPolicy
+    """
+
+    def test_backoff_bounds(self):
+        """
+        Verify backoff is jittered below the doubling delay and capped
+        """
+        policy = RetryPolicy(max_attempts=10, base_delay=1, max_delay=4)
+        rng = random.Random(1)
+
+        for attempt, bound in ((1, 1), (2, 2), (3, 4), (6, 4)):
+            for _ in range(20):
+                delay = policy.delay(attempt, http_error(503), rng)
+                assert 0 <= delay <= bound
+
+        assert policy.delay(10, http_error(503), rng) is None
+
+    def test_retry_after(self):
+        """
+        Verify Retry-After is waited out unless it is longer than allowed
+        """
+        policy = RetryPolicy(base_delay=0.01, max_retry_after=10)
+        rng = random.Random(1)
+
+        assert policy.delay(1, http_error(429, "3"), rng) == 3
+        assert policy.delay(1, http_error(429, "60"), rng) is None
+
+    def test_classify_error(self):
+        """
+        Verify only throttling, outages and connection failures are transient
+        """
+        assert classify_error(http_error(429)) is ErrorKind.TRANSIENT
+        assert classify_error(http_error(503)) is ErrorKind.TRANSIENT
+        assert classify_error(http_error(404)) is ErrorKind.NOT_FOUND
+        assert classify_error(http_error(401)) is ErrorKind.AUTH
+        assert classify_error(http_error(400)) is ErrorKind.PERMANENT
+        assert classify_error(ValueError("bad")) is ErrorKind.PERMANENT
+
+
+class CircuitBreakerTest(unittest.TestCase):
+    """
+    Unit Tests for CircuitBreaker and ResilientExecutor
+    """
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.breaker = CircuitBreaker(2, 30, self.clock)
+        self.executor = ResilientExecutor(
+            RetryPolicy(max_attempts=1), self.breaker, lambda _: None
+        )
+
+    def fail_transiently(self):
+        """
+        Operation which always fails with a transient error
+        """
+        raise http_error(503)
+
+    def test_open_and_recover(self):
+        """
+        Verify the circuit opens after repeated failures, fails fast, then closes again
+        after a successful trial request
+        """
+        calls = []
+
+        def succeed():
+            calls.append(1)
+            return "ok"
+
+        for _ in range(2):
+            with self.assertRaises(SharepointUnavailableError):
+                self.executor.call(self.fail_transiently)
+        assert self.breaker.state is CircuitState.OPEN
+
+        with self.assertRaises(SharepointUnavailableError):
+            self.executor.call(succeed)
+        assert len(calls) == 0
+
+        self.clock.advance(31)
+        assert self.executor.call(succeed) == "ok"
+        assert self.breaker.state is CircuitState.CLOSED
+
+    def test_failed_trial_reopens(self):
+        """
+        Verify a failed trial request opens the circuit again
+        """
+        for _ in range(2):
+            with self.assertRaises(SharepointUnavailableError):
+                self.executor.call(self.fail_transiently)
+
+        self.clock.advance(31)
+        with self.assertRaises(SharepointUnavailableError):
+            self.executor.call(self.fail_transiently)
+        assert self.breaker.state is CircuitState.OPEN
+        assert not self.breaker.allow()
+
+    def test_permanent_error_not_retried(self):
+        """
+        Verify errors the site answered with are raised without retrying
+        """
+        executor = ResilientExecutor(RetryPolicy(), self.breaker, lambda _: None)
+        calls = []
+
+        def missing():
+            calls.append(1)
+            raise http_error(404)
+
+        with self.assertRaises(ClientRequestException):
+            executor.call(missing)
+        assert len(calls) == 1
+        assert self.breaker.state is CircuitState.CLOSED
+
+    def test_local_error_leaves_breaker(self):
+        """
+        Verify errors raised before a request reaches the site are raised as they are, neither
+        closing an open circuit nor using up its trial request
+        """
+
+        def broken():
+            raise KeyError("ServerRelativeUrl")
+
+        self.breaker.record_failure()
+        with self.assertRaises(KeyError):
+            self.executor.call(broken)
+        self.breaker.record_failure()
+        assert self.breaker.state is CircuitState.OPEN
+
+        self.clock.advance(31)
+        with self.assertRaises(KeyError):
+            self.executor.call(broken)
+        assert self.breaker.state is CircuitState.OPEN
+        assert self.executor.call(lambda: "ok") == "ok"
+        assert self.breaker.state is CircuitState.CLOSED
+
+
+class StandInRetryTest(unittest.TestCase):
+    """
+    Verifies retries against failures injected by the sharepoint stand-in
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.stand_in = SharepointStandIn(self.root.name).start()
+        self.client = create_client(self.stand_in.url, "hawkid", "password", True)
+        self.executor = ResilientExecutor(
+            RetryPolicy(base_delay=0.01), CircuitBreaker(), rng=random.Random(1)
+        )
+
+        os.makedirs(self.stand_in.library_path("reviews"))
+        with open(self.stand_in.library_path("reviews", "a.xlsx"), "wb") as file:
+            file.write(b"review")
+
+    def tearDown(self):
+        self.stand_in.stop()
+        self.root.cleanup()
+
+    def test_batch_retried(self):
+        """
+        Verify a batch which hits an outage is resent in full
+        """
+        site = self.stand_in.site_path
+        self.stand_in.fail_next(2, 503, retry_after=0)
+
+        batch = RequestBatch(self.client, self.executor)
+        web = batch.load_web()
+        found = batch.probe_file(f"{site}/{DOCUMENT_LIBRARY}/reviews/a.xlsx")
+        missing = batch.probe_file(f"{site}/{DOCUMENT_LIBRARY}/reviews/b.xlsx")
+        batch.execute()
+
+        assert web.url == self.stand_in.url
+        assert found.exists is True
+        assert missing.exists is False
+
+    def test_gives_up(self):
+        """
+        Verify an outage which outlasts the retries is reported as unavailable
+        """
+        self.stand_in.fail_next(5, 503)
+
+        with self.assertRaises(SharepointUnavailableError):
+            self.executor.call(
+                lambda: self.client.web.get().execute_query(), self.client.clear
+            )
+        assert self.stand_in.request_count() == 5
+
+    def test_missing_file(self):
+        """
+        Verify a missing file is not retried
+        """
+        path = f"{self.stand_in.site_path}/{DOCUMENT_LIBRARY}/reviews/b.xlsx"
+
+        with self.assertRaises(ClientRequestException) as context:
+            self.executor.call(
+                lambda: self.client.web.get_file_by_server_relative_path(path)
+                .get()
+                .execute_query(),
+                self.client.clear,
+            )
+
+        assert classify_error(context.exception) is ErrorKind.NOT_FOUND
+        assert self.stand_in.request_count() == 1
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+"""
+Sharepoint requests against the local sharepoint stand-in
+"""
+import io
+import os
+import tempfile
+import unittest
+from office365.runtime.client_request_exception import ClientRequestException
+from scholarship_app.managers.sharepoint.request_batch import RequestBatch
+from scholarship_app.managers.sharepoint.sharepoint_session import create_client
+from tests.stand_in import DOCUMENT_LIBRARY, SharepointStandIn
+
+
+class SharepointStandInTest(unittest.TestCase):
+    """
+    Verifies the sharepoint client and request batching work against the stand-in
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.stand_in = SharepointStandIn(self.root.name).start()
+        self.client = create_client(self.stand_in.url, "hawkid", "password", True)
+        self.site = self.stand_in.site_path
+
+        os.makedirs(self.stand_in.library_path("reviews"))
+        with open(self.stand_in.library_path("reviews", "a.xlsx"), "wb") as file:
+            file.write(b"review")
+
+    def tearDown(self):
+        self.stand_in.stop()
+        self.root.cleanup()
+
+    def test_batch_is_single_request(self):
+        """
+        Verify queued metadata requests are sent in a single batch
+        """
+        batch = RequestBatch(self.client)
+        web = batch.load_web()
+        found = batch.probe_file(f"{self.site}/{DOCUMENT_LIBRARY}/reviews/a.xlsx")
+        missing = batch.probe_file(f"{self.site}/{DOCUMENT_LIBRARY}/reviews/b.xlsx")
+        batch.ensure_folder_path(f"{DOCUMENT_LIBRARY}/new/folder")
+        batch.execute()
+
+        assert web.url == self.stand_in.url
+        assert found.exists is True
+        assert missing.exists is False
+        assert os.path.isdir(self.stand_in.library_path("new", "folder"))
+        # form digest + batch
+        assert self.stand_in.request_count() == 2
+
+    def test_single_probe_is_not_batched(self):
+        """
+        Verify a lone missing file probe is sent directly and reported as missing
+        """
+        batch = RequestBatch(self.client)
+        missing = batch.probe_file(f"{self.site}/{DOCUMENT_LIBRARY}/reviews/b.xlsx")
+        batch.execute()
+
+        assert missing.exists is False
+        assert self.stand_in.request_count() == 1
+
+    def test_upload_and_download(self):
+        """
+        Verify upload sessions and downloads round trip file content
+        """
+        content = os.urandom(2500)
+        local_path = os.path.join(self.root.name, "upload.xlsx")
+        with open(local_path, "wb") as file:
+            file.write(content)
+
+        folder = self.client.web.get_folder_by_server_relative_url(
+            f"{self.site}/{DOCUMENT_LIBRARY}/reviews"
+        )
+        with open(local_path, "rb") as file:
+            folder.files.create_upload_session(file, 1000).execute_query()
+
+        downloaded = io.BytesIO()
+        self.client.web.get_file_by_server_relative_path(
+            f"{self.site}/{DOCUMENT_LIBRARY}/reviews/upload.xlsx"
+        ).download(downloaded).execute_query()
+
+        assert downloaded.getvalue() == content
+
+    def test_recycle_folder(self):
+        """
+        Verify recycling a folder removes it with its files, and a missing folder is not found
+        """
+        folder = f"{self.site}/{DOCUMENT_LIBRARY}/reviews"
+        self.client.web.get_folder_by_server_relative_path(
+            folder
+        ).recycle().execute_query()
+
+        assert not os.path.exists(self.stand_in.library_path("reviews"))
+        with self.assertRaises(ClientRequestException) as context:
+            self.client.web.get_folder_by_server_relative_path(
+                folder
+            ).recycle().execute_query()
+        assert context.exception.response.status_code == 404
+
+    def test_injected_failure(self):
+        """
+        Verify injected failures are returned to the client
+        """
+        self.stand_in.fail_next(status=429, retry_after=1)
+
+        with self.assertRaises(ClientRequestException) as context:
+            self.client.web.get().execute_query()
+
+        assert context.exception.response.status_code == 429
+        assert context.exception.response.headers["Retry-After"] == "1"
+
+
+if __name__ == "__main__":
+    unittest.main()
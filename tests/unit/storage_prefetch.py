@@ -0,0 +1,89 @@
+"""
+Background prefetching of home page datasets
+"""
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.managers.storage.prefetch import Dataset, PrefetchCache
+
+
+class PrefetchCacheTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.storage.prefetch
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.storage = LocalStorage(self.root.name, "tester")
+        # Clock which only moves when told to
+        self.clock = mock.Mock(return_value=0.0)
+        self.loads = []
+        self.release = threading.Event()
+
+        def load_scholarships(storage):
+            self.release.wait(5)
+            self.loads.append((storage.get_hawk_id(), Dataset.SCHOLARSHIPS))
+            return ["scholarship"]
+
+        def load_user_reviews(storage):
+            self.loads.append((storage.get_hawk_id(), Dataset.USER_REVIEWS))
+            raise FileNotFoundError("no reviews")
+
+        self.cache = PrefetchCache(
+            loaders={
+                Dataset.SCHOLARSHIPS: load_scholarships,
+                Dataset.USER_REVIEWS: load_user_reviews,
+            },
+            clock=self.clock,
+        )
+
+    def tearDown(self):
+        self.release.set()
+        self.root.cleanup()
+
+    def test_take_waits_for_prefetch(self):
+        """
+        Verify a dataset still loading is waited for and only loaded once
+        """
+        self.cache.prefetch(self.storage, (Dataset.SCHOLARSHIPS,))
+        self.cache.prefetch(self.storage, (Dataset.SCHOLARSHIPS,))
+        threading.Timer(0.05, self.release.set).start()
+
+        assert self.cache.take(self.storage, Dataset.SCHOLARSHIPS) == ["scholarship"]
+        assert self.loads == [("tester", Dataset.SCHOLARSHIPS)]
+
+        # Taken datasets are removed, the next take loads it again
+        assert self.cache.take(self.storage, Dataset.SCHOLARSHIPS) == ["scholarship"]
+        assert len(self.loads) == 2
+
+    def test_missing_file_raised(self):
+        """
+        Verify a missing file found while prefetching is raised without loading again
+        """
+        self.cache.prefetch(self.storage, (Dataset.USER_REVIEWS,))
+
+        with self.assertRaises(FileNotFoundError):
+            self.cache.take(self.storage, Dataset.USER_REVIEWS)
+        assert len(self.loads) == 1
+
+    def test_stale_and_other_users(self):
+        """
+        Verify datasets are not shared between users and are discarded once stale
+        """
+        self.release.set()
+        self.cache.prefetch(self.storage, (Dataset.SCHOLARSHIPS,))
+
+        other_user = LocalStorage(self.root.name, "other")
+        assert self.cache.take(other_user, Dataset.SCHOLARSHIPS, lambda: "own") == "own"
+
+        self.clock.return_value = self.cache.ttl + 1
+        assert (
+            self.cache.take(self.storage, Dataset.SCHOLARSHIPS, lambda: "new") == "new"
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
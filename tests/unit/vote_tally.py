@@ -0,0 +1,168 @@
+"""
+Vote tally kept up to date a reviewer at a time
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+import pandas as pd
+from scholarship_app.managers.review_corpus import load_review_corpus
+from scholarship_app.managers.review_log import ReviewLog, local_path, snapshot_path
+from scholarship_app.managers.storage.local_storage import LocalStorage
+from scholarship_app.managers.vote_tally import VoteTally, synced_tally, tally_path
+from scholarship_app.utils.output import get_appdata_path
+from tests.reference import same_tally, vote_tally
+
+REVIEWERS = ["vote-tally-tester-a", "vote-tally-tester-b"]
+
+
+def reviews(uids: list[int], rating: str = "Yes", scholarship: str = "Merit"):
+    """
+    Reviews of uids for scholarship
+    """
+    return pd.DataFrame(
+        {
+            "UID": uids,
+            "Scholarship": scholarship,
+            "Rating": rating,
+            "Additional Feedback": "",
+        }
+    )
+
+
+class VoteTallyTest(unittest.TestCase):
+    """
+    Unit Tests for src.managers.vote_tally
+    """
+
+    def setUp(self):
+        # pylint: disable-next=consider-using-with
+        self.root = tempfile.TemporaryDirectory()
+        self.logs = {}
+        for hawk_id in REVIEWERS:
+            self.logs[hawk_id] = ReviewLog.create(self.storage(hawk_id))
+
+    def tearDown(self):
+        self.root.cleanup()
+        for hawk_id in REVIEWERS:
+            shutil.rmtree(get_appdata_path(f"/data/review_log/{hawk_id}"), True)
+            if os.path.exists(local_path(snapshot_path(hawk_id))):
+                os.remove(local_path(snapshot_path(hawk_id)))
+        if os.path.exists(tally_path(self.root.name)):
+            os.remove(tally_path(self.root.name))
+
+    def storage(self, hawk_id: str = REVIEWERS[0]) -> LocalStorage:
+        """
+        Storage directory of the test, used as hawk_id
+        """
+        return LocalStorage(self.root.name, hawk_id)
+
+    def append(self, hawk_id: str, new_reviews: pd.DataFrame):
+        """
+        Submits new_reviews as hawk_id
+        """
+        self.logs[hawk_id].append(self.storage(hawk_id), new_reviews)
+
+    def assert_matches_reviews(self, tally: VoteTally):
+        """
+        Asserts the tally has the scores of counting every reviewer's reviews at once
+        """
+        expected = vote_tally([review_log.reviews for review_log in self.logs.values()])
+        assert same_tally(tally.scores, expected)
+
+    def test_sync(self):
+        """
+        Verify a new tally counts every reviewer, and syncing again reads nothing
+        """
+        self.append(REVIEWERS[0], reviews([1, 2, 3]))
+        self.append(REVIEWERS[1], reviews([2, 3], "No"))
+        self.append(REVIEWERS[1], reviews([3, 4], "Maybe", "Need"))
+
+        tally = VoteTally()
+        assert tally.sync(self.storage())
+        self.assert_matches_reviews(tally)
+        assert tally.counts.loc[(3, "Merit")].tolist() == [1, 1, 0, 2, 0]
+
+        with patch("scholarship_app.managers.vote_tally.load_review_corpus") as load:
+            assert not tally.sync(self.storage())
+            load.assert_not_called()
+
+    def test_sync_new_segments(self):
+        """
+        Verify only the new segments of a reviewer are read when their snapshot is unchanged
+        """
+        self.append(REVIEWERS[0], reviews([1, 2]))
+        tally = VoteTally()
+        tally.sync(self.storage())
+
+        self.append(REVIEWERS[0], reviews([1], "No"))
+        self.append(REVIEWERS[1], reviews([5]))
+        with patch(
+            "scholarship_app.managers.vote_tally.load_review_corpus",
+            wraps=load_review_corpus,
+        ) as load:
+            assert tally.sync(self.storage())
+            load.assert_not_called()
+
+        self.assert_matches_reviews(tally)
+        assert (
+            tally.reviewers[REVIEWERS[0]].segments == self.logs[REVIEWERS[0]].segments
+        )
+
+    def test_sync_replaced_snapshot(self):
+        """
+        Verify a reviewer whose snapshot was compacted, or removed, has their counts replaced
+        """
+        self.append(REVIEWERS[0], reviews([1, 2]))
+        self.append(REVIEWERS[1], reviews([2]))
+        tally = VoteTally()
+        tally.sync(self.storage())
+
+        self.logs[REVIEWERS[0]].compact(self.storage(REVIEWERS[0]))
+        self.append(REVIEWERS[0], reviews([2], "No"))
+        assert tally.sync(self.storage())
+        self.assert_matches_reviews(tally)
+        assert tally.reviewers[REVIEWERS[0]].generation == 1
+
+        os.remove(os.path.join(self.root.name, "data", f"{REVIEWERS[1]}_Reviews.xlsx"))
+        del self.logs[REVIEWERS[1]]
+        assert tally.sync(self.storage())
+        self.assert_matches_reviews(tally)
+        assert list(tally.reviewers) == [REVIEWERS[0]]
+
+    def test_invalid_uids(self):
+        """
+        Verify reviews whose UID is not a whole number are counted as invalid, in whole logs
+        and new segments, and left out of the scores
+        """
+        self.append(REVIEWERS[0], reviews([1, 2.5]))
+        tally = VoteTally()
+        tally.sync(self.storage())
+        assert tally.invalid_uids == 1
+
+        self.append(REVIEWERS[0], reviews(["abc", 1]))
+        tally.sync(self.storage())
+        assert tally.invalid_uids == 2
+        assert tally.counts.index.tolist() == [(1, "Merit")]
+        assert tally.counts.loc[(1, "Merit"), "Reviews"] == 2
+
+    def test_save_and_load(self):
+        """
+        Verify a saved tally is read back for the same storage location only
+        """
+        assert len(VoteTally.load(self.root.name).scores) == 0
+
+        self.append(REVIEWERS[0], reviews([1, 2]))
+        synced_tally(self.storage())
+        self.append(REVIEWERS[1], reviews([2]))
+
+        loaded = VoteTally.load(self.root.name)
+        assert loaded.scores.tolist() == [1, 1]
+        self.assert_matches_reviews(synced_tally(self.storage()))
+        self.assert_matches_reviews(VoteTally.load(self.root.name))
+        assert len(VoteTally.load(os.path.join(self.root.name, "other")).scores) == 0
+
+
+if __name__ == "__main__":
+    unittest.main()